@@ -0,0 +1,109 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Compares the cold start of a modular input of a built add-on without
+bytecode, as it is started the first time after the add-on is installed,
+with the start of the same input compiled by `ucc-gen build --compile`.
+
+Every start is a new interpreter importing the input module from the `bin`
+folder of a copy of the add-on, which imports its libraries from `lib`.
+
+Usage: python scripts/benchmark_cold_start.py output/Splunk_TA_UCCExample \
+    example_input_one [--python python3] [--repeat 10]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+from splunk_add_on_ucc_framework import bytecode_compiler
+from splunk_add_on_ucc_framework import output_tree as output_tree_lib
+
+
+def _measure_start(python: str, bin_dir: str, input_name: str) -> float:
+    start = time.perf_counter()
+    # `-B` keeps the copy without bytecode, so every start compiles the
+    # modules again.
+    subprocess.run(
+        [python, "-B", "-c", f"import {input_name}"], cwd=bin_dir, check=True
+    )
+    return time.perf_counter() - start
+
+
+def _remove_bytecode(addon_dir: str) -> None:
+    for root, dirs, _ in os.walk(addon_dir):
+        if "__pycache__" in dirs:
+            shutil.rmtree(os.path.join(root, "__pycache__"))
+            dirs.remove("__pycache__")
+
+
+def _print_times(name: str, times: List[float]) -> None:
+    print(
+        f"{name:<12} {min(times) * 1e3:>10.1f}ms "
+        f"{statistics.median(times) * 1e3:>10.1f}ms"
+    )
+
+
+def run(addon_dir: str, input_name: str, python: str, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        addon_copy = os.path.join(temp_dir, os.path.basename(addon_dir))
+        shutil.copytree(addon_dir, addon_copy)
+        _remove_bytecode(addon_copy)
+        bin_dir = os.path.join(addon_copy, "bin")
+        print(f"{'bytecode':<12} {'best':>12} {'median':>12}")
+        _print_times(
+            "none",
+            [_measure_start(python, bin_dir, input_name) for _ in range(repeat)],
+        )
+        files = bytecode_compiler.get_python_files(
+            addon_copy, output_tree_lib.OutputTree()
+        )
+        start = time.perf_counter()
+        result = bytecode_compiler.compile_bytecode(addon_copy, files, python)
+        print(
+            f"Compiled {result.compiled} files in "
+            f"{(time.perf_counter() - start) * 1e3:.1f}ms, "
+            f"{len(result.failed)} could not be compiled"
+        )
+        _print_times(
+            "compiled",
+            [_measure_start(python, bin_dir, input_name) for _ in range(repeat)],
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("addon_dir", help="Output folder of the built add-on.")
+    parser.add_argument("input_name", help="Name of the modular input.")
+    parser.add_argument(
+        "--python",
+        default=sys.executable,
+        help="Python binary the add-on is run and compiled with.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="Number of starts to measure."
+    )
+    args = parser.parse_args()
+    run(args.addon_dir, args.input_name, args.python, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Compares parsing and dumping of JSON and YAML globalConfig files of
+increasing size.
+
+Usage: python scripts/benchmark_global_config.py [--sizes 10 100 1000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from splunk_add_on_ucc_framework import global_config as global_config_lib
+from splunk_add_on_ucc_framework import utils
+
+
+def _make_entities(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "type": "text",
+            "label": f"Field {i}",
+            "field": f"field_{i}",
+            "help": f"Help text of the field number {i}.",
+            "required": False,
+            "validators": [
+                {
+                    "type": "string",
+                    "errorMsg": "Length should be between 1 and 100",
+                    "minLength": 1,
+                    "maxLength": 100,
+                }
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def make_global_config(services: int) -> Dict[str, Any]:
+    """Returns globalConfig with `services` inputs, 10 entities each."""
+    return {
+        "meta": {
+            "name": "Splunk_TA_benchmark",
+            "restRoot": "splunk_ta_benchmark",
+            "version": "1.0.0",
+            "displayName": "Benchmark Add-on",
+            "schemaVersion": "0.0.3",
+        },
+        "pages": {
+            "configuration": {
+                "title": "Configuration",
+                "tabs": [
+                    {
+                        "name": "logging",
+                        "title": "Logging",
+                        "entity": _make_entities(1),
+                    }
+                ],
+            },
+            "inputs": {
+                "title": "Inputs",
+                "table": {"header": [], "moreInfo": [], "actions": ["edit"]},
+                "services": [
+                    {
+                        "name": f"input_{i}",
+                        "title": f"Input {i}",
+                        "entity": _make_entities(10),
+                    }
+                    for i in range(services)
+                ],
+            },
+        },
+    }
+
+
+def _measure(func: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _parse(path: str, is_yaml: bool) -> None:
+    global_config_lib.GlobalConfig().parse(path, is_yaml)
+
+
+def run(sizes: List[int]) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        # Parsed configs are cached in the temporary folder.
+        os.environ["XDG_CACHE_HOME"] = os.path.join(directory, "cache")
+        print(
+            f"{'services':>8} {'lines':>8} {'json parse':>11} {'json dump':>10} "
+            f"{'yaml parse':>11} {'yaml cached':>12} {'yaml dump':>10}"
+        )
+        for size in sizes:
+            config = make_global_config(size)
+            json_path = os.path.join(directory, f"globalConfig_{size}.json")
+            yaml_path = os.path.join(directory, f"globalConfig_{size}.yaml")
+            json_dump = _measure(lambda: utils.dump_json_config(config, json_path))
+            yaml_dump = _measure(lambda: utils.dump_yaml_config(config, yaml_path))
+            with open(yaml_path) as f:
+                lines = sum(1 for _ in f)
+            json_parse = _measure(lambda: _parse(json_path, False))
+
+            def parse_yaml_without_cache() -> None:
+                cache_path = global_config_lib._get_parsed_config_cache_path(yaml_path)
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
+                _parse(yaml_path, True)
+
+            yaml_parse = _measure(parse_yaml_without_cache)
+            yaml_cached = _measure(lambda: _parse(yaml_path, True))
+            print(
+                f"{size:>8} {lines:>8} {json_parse:>10.3f}s {json_dump:>9.3f}s "
+                f"{yaml_parse:>10.3f}s {yaml_cached:>11.3f}s {yaml_dump:>9.3f}s"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000],
+        help="Numbers of inputs in the benchmarked globalConfig files.",
+    )
+    args = parser.parse_args()
+    run(args.sizes)
+
+
+if __name__ == "__main__":
+    main()
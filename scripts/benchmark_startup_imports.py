@@ -0,0 +1,102 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Measures the time `ucc-gen` spends importing its own modules on startup of
+the `--help` of every command and of `ucc-gen validate`.
+
+Every run is a new interpreter started with `-X importtime`, only the
+top-level imports of `splunk_add_on_ucc_framework` modules are counted,
+their time includes the time of the modules they import.
+
+Usage: python scripts/benchmark_startup_imports.py \
+    [--addon tests/testdata/test_addons/package_global_config_configuration] \
+    [--repeat 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import List, Optional
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _measure_imports(args: List[str], cwd: Optional[str]) -> int:
+    code = f"from splunk_add_on_ucc_framework import main\nmain.main({args!r})"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        cwd=cwd or REPOSITORY_ROOT,
+        env={**os.environ, "PYTHONPATH": REPOSITORY_ROOT},
+        check=True,
+    )
+    import_time_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        # Nested imports are indented by more than one space.
+        if name.startswith(" splunk_add_on_ucc_framework"):
+            import_time_us += int(cumulative)
+    return import_time_us
+
+
+def _print_times(name: str, times: List[int]) -> None:
+    print(
+        f"{name:<20} {min(times) / 1e3:>10.1f}ms "
+        f"{statistics.median(times) / 1e3:>10.1f}ms"
+    )
+
+
+def run(addon_dir: str, repeat: int) -> None:
+    commands = [
+        (["--help"], None),
+        (["build", "--help"], None),
+        (["init", "--help"], None),
+        (["validate"], addon_dir),
+    ]
+    print(f"{'command':<20} {'best':>12} {'median':>12}")
+    for args, cwd in commands:
+        _print_times(
+            " ".join(args), [_measure_imports(args, cwd) for _ in range(repeat)]
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--addon",
+        default=os.path.join(
+            REPOSITORY_ROOT,
+            "tests",
+            "testdata",
+            "test_addons",
+            "package_global_config_configuration",
+        ),
+        help="Folder of the add-on `ucc-gen validate` is run in.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="Number of runs to measure."
+    )
+    args = parser.parse_args()
+    run(os.path.abspath(args.addon), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
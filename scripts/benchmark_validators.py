@@ -0,0 +1,105 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Compares the checks of email, ipv4, date and url fields generated REST
+handlers run with the regular expressions previously used for them, on
+valid and on adversarial values.
+
+Usage: python scripts/benchmark_validators.py [--max-url-length 22]
+"""
+import argparse
+import re
+import time
+from typing import Any, Callable, List, Tuple
+
+from splunk_add_on_ucc_framework.commands.rest_builder import parse_validators
+
+# Regular expressions REST handlers previously validated the fields with.
+PATTERNS = {
+    "email": (
+        r"^[a-zA-Z0-9.!#$%&'*+\/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}"
+        r"[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$"
+    ),
+    "ipv4": r"^(?:(?:[0-1]?\d{1,2}|2[0-4]\d|25[0-5])(?:\.|$)){4}$",
+    "date": (
+        r"^\s*((?:[+-]\d{6}|\d{4})-(?:\d\d-\d\d|W\d\d-\d|W\d\d|\d\d\d|\d\d))"
+        r"(?:(T| )(\d\d(?::\d\d(?::\d\d(?:[.,]\d+)?)?)?)([\+\-]\d\d(?::?\d\d)?|\s*Z)?)?$"
+    ),
+    "url": (
+        r"^(?:(?:https?|ftp|opc\.tcp):\/\/)?(?:\S+(?::\S*)?@)?"
+        r"(?:(?:[1-9]\d?|1\d\d|2[01]\d|22[0-3])"
+        r"(?:\.(?:1?\d{1,2}|2[0-4]\d|25[0-5])){2}"
+        r"(?:\.(?:[1-9]\d?|1\d\d|2[0-4]\d|25[0-4]))|"
+        r"(?:(?:[a-z\u00a1-\uffff0-9]+-?_?)*[a-z\u00a1-\uffff0-9]+)"
+        r"(?:\.(?:[a-z\u00a1-\uffff0-9]+-?)*[a-z\u00a1-\uffff0-9]+)*"
+        r"(?:\.(?:[a-z\u00a1-\uffff]{2,}))?)(?::\d{2,5})?(?:\/[^\s]*)?$"
+    ),
+}
+
+
+def _measure(func: Callable[[], Any], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _get_cases(max_url_length: int) -> List[Tuple[str, str, Callable, str]]:
+    cases = [
+        ("email", "valid", parse_validators.is_email, "user.name@example.com"),
+        ("email", "adversarial", parse_validators.is_email, "a@" + "a." * 5000),
+        ("ipv4", "valid", parse_validators.is_ipv4, "192.168.0.1"),
+        ("ipv4", "adversarial", parse_validators.is_ipv4, "1." * 5000),
+        ("date", "valid", parse_validators.is_date, "2020-01-01T10:20:30.123+01:00"),
+        ("date", "adversarial", parse_validators.is_date, " " * 5000 + "2020-01-01!"),
+        ("url", "valid", parse_validators.is_url, "https://user@example.com:8089/a"),
+    ]
+    # The time the URL pattern takes doubles with every character.
+    for length in range(16, max_url_length + 1, 2):
+        cases.append(
+            ("url", "adversarial", parse_validators.is_url, "a" * length + "!")
+        )
+    return cases
+
+
+def run(max_url_length: int) -> None:
+    print(f"{'type':<6} {'value':<12} {'length':>7} {'regex':>12} {'check':>12}")
+    for check_type, kind, check, value in _get_cases(max_url_length):
+        regex = re.compile(PATTERNS[check_type])
+        regex_time = _measure(lambda: regex.match(value))
+        check_time = _measure(lambda: check(value))
+        print(
+            f"{check_type:<6} {kind:<12} {len(value):>7} "
+            f"{regex_time * 1e6:>10.1f}us {check_time * 1e6:>10.1f}us"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--max-url-length",
+        type=int,
+        default=22,
+        help="Length of the longest adversarial URL.",
+    )
+    args = parser.parse_args()
+    run(args.max_url_length)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,11 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import io
 import time
 from typing import Sequence
 
 import addonfactory_splunk_conf_parser_lib as conf_parser
 from splunk_add_on_ucc_framework import app_manifest as app_manifest_lib
+from splunk_add_on_ucc_framework import file_writer
 
 APP_CONF_FILE_NAME = "app.conf"
 
@@ -29,6 +31,9 @@ class AppConf:
     def read(self, path: str) -> None:
         self._app_conf.read(path)
 
+    def read_string(self, content: str) -> None:
+        self._app_conf.read_string(content)
+
     def update(
         self,
         version: str,
@@ -65,5 +70,9 @@ class AppConf:
             self._app_conf["triggers"][f"reload.{conf_file_name}"] = "simple"
 
     def write(self, path: str) -> None:
-        with open(path, "w") as fd:
-            self._app_conf.write(fd)
+        file_writer.write_file(path, str(self))
+
+    def __str__(self) -> str:
+        content = io.StringIO()
+        self._app_conf.write(content)
+        return content.getvalue()
@@ -0,0 +1,224 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import collections
+import concurrent.futures
+import io
+import logging
+import os
+import stat
+import struct
+import tarfile
+import zlib
+from typing import BinaryIO, Deque, Dict, Optional, Set, Tuple, cast
+
+from splunk_add_on_ucc_framework import output_tree as output_tree_lib
+
+logger = logging.getLogger("ucc_gen")
+
+# Size of the chunks which are compressed independently (and in parallel if
+# more than 1 thread is used).
+CHUNK_SIZE = 1024 * 1024
+COMPRESSION_LEVEL = 9
+DIRECTORY_MODE = 0o755
+FILE_MODE = 0o644
+EXECUTABLE_FILE_MODE = 0o755
+
+
+def get_archive_mtime() -> int:
+    """
+    Returns modification time used for every archive member. It can be set
+    with `SOURCE_DATE_EPOCH` environment variable, see
+    https://reproducible-builds.org/docs/source-date-epoch/.
+    """
+    try:
+        return int(os.environ.get("SOURCE_DATE_EPOCH", 0))
+    except ValueError:
+        return 0
+
+
+def _compress_chunk(chunk: bytes, last: bool) -> bytes:
+    compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, -zlib.MAX_WBITS)
+    # Full flush ends the chunk on a byte boundary without finishing the
+    # deflate stream, so compressed chunks can be concatenated.
+    return compressor.compress(chunk) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_FULL_FLUSH
+    )
+
+
+class ChunkedGzipWriter(io.RawIOBase):
+    """
+    Writes gzip stream to `fileobj` compressing chunks of the data
+    independently. Chunks are compressed in parallel if `threads` is greater
+    than 1, the output does not depend on the number of threads.
+    """
+
+    def __init__(self, fileobj: BinaryIO, threads: int = 1, mtime: int = 0):
+        super().__init__()
+        self._fileobj = fileobj
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        if threads > 1:
+            self._executor = concurrent.futures.ThreadPoolExecutor(threads)
+        self._max_pending = threads * 2
+        self._pending: Deque[concurrent.futures.Future] = collections.deque()
+        self._buffer = bytearray()
+        self._crc = 0
+        self._size = 0
+        # gzip header: magic, deflate, no flags, mtime, no extra flags,
+        # unknown OS.
+        self._fileobj.write(
+            b"\x1f\x8b\x08\x00" + struct.pack("<I", mtime & 0xFFFFFFFF) + b"\x00\xff"
+        )
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        self._buffer.extend(data)
+        while len(self._buffer) >= CHUNK_SIZE:
+            chunk = bytes(self._buffer[:CHUNK_SIZE])
+            del self._buffer[:CHUNK_SIZE]
+            self._compress(chunk, last=False)
+        return len(data)
+
+    def _compress(self, chunk: bytes, last: bool) -> None:
+        if self._executor is None:
+            self._fileobj.write(_compress_chunk(chunk, last))
+            return
+        self._pending.append(self._executor.submit(_compress_chunk, chunk, last))
+        while len(self._pending) > self._max_pending:
+            self._fileobj.write(self._pending.popleft().result())
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._compress(bytes(self._buffer), last=True)
+            self._buffer.clear()
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().result())
+            self._fileobj.write(
+                struct.pack("<II", self._crc & 0xFFFFFFFF, self._size & 0xFFFFFFFF)
+            )
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+            super().close()
+
+
+def _get_tar_info(
+    name: str, mode: int, size: int, mtime: int, member_type: bytes = tarfile.REGTYPE
+) -> tarfile.TarInfo:
+    tar_info = tarfile.TarInfo(name)
+    tar_info.type = member_type
+    tar_info.mode = mode
+    tar_info.size = size
+    tar_info.mtime = mtime
+    tar_info.uid = tar_info.gid = 0
+    tar_info.uname = tar_info.gname = ""
+    return tar_info
+
+
+def _get_file_mode(path: str) -> int:
+    if os.stat(path).st_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH):
+        return EXECUTABLE_FILE_MODE
+    return FILE_MODE
+
+
+def _collect_directory(
+    directory: str,
+) -> Tuple[Dict[str, output_tree_lib.OutputFile], Set[str]]:
+    files = {}
+    directories = set()
+    for root, _, file_names in os.walk(directory):
+        relative_root = os.path.relpath(root, directory)
+        if relative_root != os.curdir:
+            directories.add(relative_root)
+        for file_name in file_names:
+            path = os.path.normpath(os.path.join(relative_root, file_name))
+            files[path] = output_tree_lib.OutputFile(
+                source=os.path.join(root, file_name)
+            )
+    return files, directories
+
+
+def write_archive(
+    archive_path: str,
+    ta_name: str,
+    output_tree: output_tree_lib.OutputTree,
+    addon_output_dir: str,
+    threads: int = 1,
+) -> None:
+    """
+    Writes gzip compressed tarball with the add-on. Files from the output
+    tree are read directly from their sources or memory, files which exist
+    in the add-on output folder override them. Members are sorted and have
+    the same owner, modification time and normalized permissions, so the
+    archive only depends on the add-on content.
+
+    Args:
+        archive_path: Path to the archive, usually `.tar.gz` or `.spl` file.
+        ta_name: Add-on name, the top-level folder in the archive.
+        output_tree: Output tree of the add-on.
+        addon_output_dir: Output folder of the add-on with generated files.
+        threads: Number of threads used to compress the archive.
+    """
+    files = {path: output_tree.get(path) for path in output_tree.files}
+    directories = set(output_tree.directories)
+    if os.path.isdir(addon_output_dir):
+        output_files, output_directories = _collect_directory(addon_output_dir)
+        files.update(output_files)
+        directories.update(output_directories)
+    members: Dict[str, Optional[output_tree_lib.OutputFile]] = {
+        path: None for path in directories
+    }
+    members.update(files)
+    mtime = get_archive_mtime()
+    archive_directory = os.path.dirname(os.path.abspath(archive_path))
+    os.makedirs(archive_directory, exist_ok=True)
+    with open(archive_path, "wb") as archive_file:
+        with ChunkedGzipWriter(archive_file, threads, mtime) as gzip_file:
+            with tarfile.open(
+                fileobj=cast(BinaryIO, gzip_file),
+                mode="w|",
+                format=tarfile.PAX_FORMAT,
+            ) as tar:
+                tar.addfile(
+                    _get_tar_info(ta_name, DIRECTORY_MODE, 0, mtime, tarfile.DIRTYPE)
+                )
+                for path in sorted(members, key=lambda p: p.split(os.sep)):
+                    name = "/".join([ta_name] + path.split(os.sep))
+                    output_file = members[path]
+                    if output_file is None:
+                        tar.addfile(
+                            _get_tar_info(
+                                name, DIRECTORY_MODE, 0, mtime, tarfile.DIRTYPE
+                            )
+                        )
+                    elif output_file.source is not None:
+                        size = os.path.getsize(output_file.source)
+                        mode = _get_file_mode(output_file.source)
+                        with open(output_file.source, "rb") as f:
+                            tar.addfile(_get_tar_info(name, mode, size, mtime), f)
+                    else:
+                        content = (output_file.content or "").encode()
+                        tar.addfile(
+                            _get_tar_info(name, FILE_MODE, len(content), mtime),
+                            io.BytesIO(content),
+                        )
+    logger.info(f"Wrote {len(files)} files to {archive_path}")
@@ -0,0 +1,290 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import hashlib
+import json
+import os
+from typing import Collection, Dict, Iterable, List, Mapping, Optional, Set
+
+from splunk_add_on_ucc_framework import file_writer
+
+BUILD_MANIFEST_FILE_NAME = ".ucc-build-manifest.json"
+
+STAGE_LIBRARIES = "libraries"
+STAGE_REST = "rest"
+STAGE_MODULAR_INPUTS = "inputs"
+STAGE_ALERTS = "alerts"
+STAGE_SERVER_CONF = "server_conf"
+STAGE_OPENAPI = "openapi"
+# Output tree, additional packaging and bytecode of the add-on, they are
+# rerun if anything changed.
+STAGE_ADDON = "addon"
+
+# Stages which write generated files to the output. Their files are kept
+# and the stage is not rerun if its inputs did not change, the files still
+# have the content the stage generated and the same files are overridden by
+# the package.
+GENERATION_STAGES = (
+    STAGE_REST,
+    STAGE_MODULAR_INPUTS,
+    STAGE_ALERTS,
+    STAGE_SERVER_CONF,
+    STAGE_OPENAPI,
+)
+
+# Build stages and the inputs they depend on. A stage has to be rerun when
+# any of its inputs differs from the one recorded in the previous build.
+STAGE_INPUTS = {
+    STAGE_LIBRARIES: (
+        "ucc_gen_version",
+        "python_binary_name",
+        "requirements",
+        "strip_libraries",
+        # Bytecode is written next to the libraries, they are reinstalled so
+        # bytecode of the previous build is not kept.
+        "compile_bytecode",
+    ),
+    STAGE_REST: ("ucc_gen_version", "addon_version", "global_config"),
+    STAGE_MODULAR_INPUTS: ("ucc_gen_version", "addon_version", "global_config"),
+    STAGE_ALERTS: ("ucc_gen_version", "addon_version", "global_config"),
+    # Default server.conf is only created if the package does not have one.
+    STAGE_SERVER_CONF: ("ucc_gen_version", "global_config", "package"),
+    # OpenAPI file describes the add-on from app.manifest of the package.
+    STAGE_OPENAPI: ("ucc_gen_version", "addon_version", "global_config", "package"),
+    STAGE_ADDON: (
+        "ucc_gen_version",
+        "addon_version",
+        "global_config",
+        "package",
+        "ucc_ignore",
+        "licenses",
+        "additional_packaging",
+        "compile_bytecode",
+    ),
+}
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _update_with_file(hasher, path: str) -> None:
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+
+
+def hash_file(path: str) -> Optional[str]:
+    """Returns sha256 of the file content or None if file does not exist."""
+    if not os.path.isfile(path):
+        return None
+    hasher = hashlib.sha256()
+    _update_with_file(hasher, path)
+    return hasher.hexdigest()
+
+
+def hash_directory(path: str) -> Optional[str]:
+    """
+    Returns sha256 of the directory tree (relative file paths and their
+    content) or None if directory does not exist.
+    """
+    if not os.path.isdir(path):
+        return None
+    hasher = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            relative_path = os.path.relpath(file_path, path).replace(os.sep, "/")
+            hasher.update(relative_path.encode("utf-8"))
+            hasher.update(b"\0")
+            _update_with_file(hasher, file_path)
+            hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def to_manifest_path(path: str, output_directory: str) -> str:
+    """Returns `path` relative to the output directory as it is recorded."""
+    return os.path.relpath(path, output_directory).replace(os.sep, "/")
+
+
+def from_manifest_path(path: str, output_directory: str) -> str:
+    return os.path.join(output_directory, *path.split("/"))
+
+
+def list_output_files(output_directory: str, ta_name: str) -> List[str]:
+    """
+    Returns paths of the files of the add-on in the output directory except
+    the installed libraries in its `lib` folder.
+    """
+    addon_output_dir = os.path.join(output_directory, ta_name)
+    files = []
+    for root, dirs, file_names in os.walk(addon_output_dir):
+        if root == addon_output_dir and "lib" in dirs:
+            dirs.remove("lib")
+        for file_name in file_names:
+            files.append(
+                to_manifest_path(os.path.join(root, file_name), output_directory)
+            )
+    return sorted(files)
+
+
+class BuildManifest:
+    """
+    Records the inputs of a build, files generated by its stages and every
+    file it left in the output, so the next build can find out which stages
+    need to be rerun and which files are not produced anymore. Paths are
+    relative to the output directory.
+    """
+
+    def __init__(
+        self,
+        inputs: Optional[Dict[str, Optional[str]]] = None,
+        outputs: Optional[Mapping[str, Mapping[str, Optional[str]]]] = None,
+        files: Optional[Iterable[str]] = None,
+    ):
+        self._inputs = dict(inputs) if inputs else {}
+        self._outputs = (
+            {stage: dict(files) for stage, files in outputs.items()} if outputs else {}
+        )
+        self._files = sorted(files) if files else []
+
+    @property
+    def inputs(self) -> Dict[str, Optional[str]]:
+        return self._inputs
+
+    @property
+    def outputs(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        sha256 of the files generated by the stages by stage name, None for
+        the files which are overridden by the package.
+        """
+        return self._outputs
+
+    @property
+    def files(self) -> List[str]:
+        return self._files
+
+    def record_outputs(
+        self,
+        outputs: Mapping[str, Mapping[str, Optional[str]]],
+        files: Iterable[str],
+    ) -> None:
+        self._outputs = {stage: dict(files) for stage, files in outputs.items()}
+        self._files = sorted(files)
+
+    @classmethod
+    def from_build_inputs(
+        cls,
+        ucc_gen_version: str,
+        addon_version: str,
+        python_binary_name: str,
+        source: str,
+        config_path: Optional[str],
+        strip_libraries: bool = False,
+        compile_optimization: Optional[int] = None,
+    ) -> "BuildManifest":
+        addon_root = os.path.abspath(os.path.join(source, os.pardir))
+        return cls(
+            {
+                "ucc_gen_version": ucc_gen_version,
+                "addon_version": addon_version,
+                "python_binary_name": python_binary_name,
+                "global_config": hash_file(config_path) if config_path else None,
+                "package": hash_directory(source),
+                "requirements": hash_file(
+                    os.path.join(source, "lib", "requirements.txt")
+                ),
+                "ucc_ignore": hash_file(os.path.join(addon_root, ".uccignore")),
+                "licenses": hash_directory(os.path.join(addon_root, "LICENSES")),
+                "additional_packaging": hash_file(
+                    os.path.join(addon_root, "additional_packaging.py")
+                ),
+                "strip_libraries": str(strip_libraries).lower(),
+                # Optimization level of the bytecode or "false" if the add-on
+                # is not compiled.
+                "compile_bytecode": (
+                    "false"
+                    if compile_optimization is None
+                    else str(compile_optimization)
+                ),
+            }
+        )
+
+    def read(self, path: str) -> None:
+        with open(path) as f:
+            content = json.load(f)
+        self._inputs = content["inputs"]
+        self._outputs = content["outputs"]
+        self._files = content["files"]
+
+    def write(self, path: str) -> None:
+        content = json.dumps(
+            {"inputs": self._inputs, "outputs": self._outputs, "files": self._files},
+            indent=4,
+            sort_keys=True,
+        )
+        file_writer.write_file(path, content + "\n")
+
+    def stale_stages(self, previous: Optional["BuildManifest"]) -> Set[str]:
+        """
+        Returns names of the stages which inputs are different from the
+        ones recorded in the `previous` manifest.
+        """
+        if previous is None:
+            return set(STAGE_INPUTS.keys())
+        stale = set()
+        for stage, input_names in STAGE_INPUTS.items():
+            for input_name in input_names:
+                if input_name not in previous.inputs or previous.inputs[
+                    input_name
+                ] != self._inputs.get(input_name):
+                    stale.add(stage)
+                    break
+        return stale
+
+    def get_intact_outputs(
+        self,
+        stage: str,
+        output_directory: str,
+        overridden_files: Collection[str] = (),
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Returns the files generated by the stage if all of them still have
+        the content the stage generated and the files which were overridden
+        are in `overridden_files`, None otherwise.
+        """
+        if stage not in self._outputs:
+            return None
+        outputs = self._outputs[stage]
+        for path, digest in outputs.items():
+            if digest is None:
+                if path not in overridden_files:
+                    return None
+            elif path in overridden_files or digest != hash_file(
+                from_manifest_path(path, output_directory)
+            ):
+                return None
+        return dict(outputs)
+
+
+def read_build_manifest(path: str) -> Optional[BuildManifest]:
+    """Returns previously recorded manifest or None if it can't be used."""
+    if not os.path.isfile(path):
+        return None
+    manifest = BuildManifest()
+    try:
+        manifest.read(path)
+    except (ValueError, KeyError, TypeError):
+        return None
+    return manifest
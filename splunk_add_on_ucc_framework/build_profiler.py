@@ -0,0 +1,188 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# Returns the number of files and bytes written so far.
+WriteCounter = Callable[[], Tuple[int, int]]
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    # `resource` module is not available on Windows.
+    resource = None  # type: ignore
+
+BUILD_PROFILE_FILE_NAME = "build_profile.json"
+BUILD_PROFILE_TRACE_FILE_NAME = "build_profile.trace.json"
+
+
+def _get_children_cpu_time() -> float:
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _get_max_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class BuildProfiler:
+    """
+    Records wall time, CPU time, Python memory peak and the number of files
+    and bytes written by the write counters for every build stage, and the
+    peak resident set size of the whole build.
+
+    Nothing is recorded if profiler is not enabled.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self._enabled = enabled
+        self._stages: List[Dict[str, Any]] = []
+        self._write_counters: List[WriteCounter] = []
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def stages(self) -> List[Dict[str, Any]]:
+        return list(self._stages)
+
+    def add_write_counter(self, counter: WriteCounter) -> None:
+        """
+        Files and bytes `counter` counts while a stage runs are added to the
+        files and bytes written by that stage.
+        """
+        self._write_counters.append(counter)
+
+    def _count_written(self) -> Tuple[int, int]:
+        counts = [counter() for counter in self._write_counters]
+        return sum(files for files, _ in counts), sum(size for _, size in counts)
+
+    def start(self) -> None:
+        if self._enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._start = time.perf_counter()
+
+    def stop(self) -> None:
+        if self._enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def profile(self, name: str) -> Iterator[None]:
+        if not self._enabled:
+            yield
+            return
+        files_before, bytes_before = self._count_written()
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        children_cpu_start = _get_children_cpu_time()
+        try:
+            yield
+        finally:
+            wall_time = time.perf_counter() - start
+            cpu_time = (time.process_time() - cpu_start) + (
+                _get_children_cpu_time() - children_cpu_start
+            )
+            _, python_memory_peak = tracemalloc.get_traced_memory()
+            files_after, bytes_after = self._count_written()
+            with self._lock:
+                self._stages.append(
+                    {
+                        "name": name,
+                        "start": start - self._start,
+                        "wall_time": wall_time,
+                        "cpu_time": cpu_time,
+                        "python_memory_peak": python_memory_peak,
+                        "files_written": files_after - files_before,
+                        "bytes_written": bytes_after - bytes_before,
+                        "thread_id": threading.get_ident(),
+                    }
+                )
+
+    def wrap(self, name: str, func: Callable[[], None]) -> Callable[[], None]:
+        """Returns function which profiles `func` when called."""
+
+        def wrapper() -> None:
+            with self.profile(name):
+                func()
+
+        return wrapper
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "total_wall_time": time.perf_counter() - self._start,
+                    "max_rss": _get_max_rss_bytes(),
+                    "stages": self._stages,
+                },
+                f,
+                indent=4,
+            )
+            f.write("\n")
+
+    def write_chrome_trace(self, path: str) -> None:
+        """
+        Writes stages in Chrome trace event format which can be opened in
+        chrome://tracing or https://ui.perfetto.dev.
+        """
+        pid = os.getpid()
+        events = []
+        for stage in self._stages:
+            events.append(
+                {
+                    "name": stage["name"],
+                    "cat": "build",
+                    "ph": "X",
+                    "ts": round(stage["start"] * 1_000_000),
+                    "dur": round(stage["wall_time"] * 1_000_000),
+                    "pid": pid,
+                    "tid": stage["thread_id"],
+                    "args": {
+                        "cpu_time": stage["cpu_time"],
+                        "python_memory_peak": stage["python_memory_peak"],
+                        "files_written": stage["files_written"],
+                        "bytes_written": stage["bytes_written"],
+                    },
+                }
+            )
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "traceEvents": events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"max_rss": _get_max_rss_bytes()},
+                },
+                f,
+                indent=4,
+            )
+            f.write("\n")
@@ -0,0 +1,172 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Ahead-of-time compilation of the Python files of the add-on to bytecode.
+
+Bytecode is compiled by the interpreter the add-on is built for, so the
+`__pycache__` files have its magic number and cache tag. They are written
+with checked hash based invalidation: the interpreter compares the hash of
+the source with the one stored in the `.pyc` file instead of the source
+modification time, so the bytecode is still used after the add-on is
+extracted or copied, and the same sources always give the same `.pyc` files.
+"""
+import json
+import logging
+import os
+import shlex
+import subprocess
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Sequence
+
+from splunk_add_on_ucc_framework import output_tree as output_tree_lib
+
+logger = logging.getLogger("ucc_gen")
+
+# Folders of the add-on which Python files are compiled.
+COMPILED_DIRECTORIES = ("bin", "lib")
+OPTIMIZATION_LEVELS = (0, 1, 2)
+
+# Run by the target interpreter, reads [optimization, [[source, dest,
+# display name], ...]] from stdin. The bytecode of `source` is written to
+# `__pycache__` next to `dest`, files which bytecode is already up to date
+# are not written again. The display name is stored in the bytecode instead
+# of the build machine path, the interpreter replaces it with the real path
+# when the module is imported.
+_COMPILE_SCRIPT = """
+import importlib.util
+import json
+import py_compile
+import sys
+
+optimization, files = json.load(sys.stdin)
+header_prefix = importlib.util.MAGIC_NUMBER + (3).to_bytes(4, "little")
+compiled = skipped = 0
+failed = []
+for source, dest, display_name in files:
+    cfile = importlib.util.cache_from_source(dest, optimization=optimization or "")
+    try:
+        with open(source, "rb") as f:
+            source_hash = importlib.util.source_hash(f.read())
+        with open(cfile, "rb") as f:
+            is_up_to_date = f.read(16) == header_prefix + source_hash
+    except OSError:
+        is_up_to_date = False
+    if is_up_to_date:
+        skipped += 1
+        continue
+    try:
+        py_compile.compile(
+            source,
+            cfile=cfile,
+            dfile=display_name,
+            doraise=True,
+            optimize=optimization,
+            invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+        )
+    except Exception as e:
+        failed.append([display_name, str(e).strip()])
+    else:
+        compiled += 1
+json.dump({"compiled": compiled, "skipped": skipped, "failed": failed}, sys.stdout)
+"""
+
+
+class CouldNotCompileBytecode(Exception):
+    pass
+
+
+@dataclass
+class CompileResult:
+    compiled: int = 0
+    skipped: int = 0
+    # Display names of the files which could not be compiled and the errors.
+    failed: List[List[str]] = field(default_factory=list)
+
+
+def get_python_files(
+    addon_output_dir: str,
+    output_tree: output_tree_lib.OutputTree,
+    directories: Sequence[str] = COMPILED_DIRECTORIES,
+) -> Dict[str, str]:
+    """
+    Returns the source of every Python file under `directories` of the
+    add-on keyed by its path relative to the add-on output folder. Files of
+    the output tree are read from their sources, files which exist in the
+    add-on output folder override them, the same way they do in the archive.
+    """
+    files: Dict[str, str] = {}
+    for path in output_tree.files:
+        output_file = output_tree.get(path)
+        if (
+            path.endswith(".py")
+            and path.split(os.sep, 1)[0] in directories
+            and output_file is not None
+            and output_file.source is not None
+        ):
+            files[path] = output_file.source
+    for directory in directories:
+        for root, dirs, file_names in os.walk(
+            os.path.join(addon_output_dir, directory)
+        ):
+            dirs[:] = [d for d in dirs if d != "__pycache__"]
+            for file_name in file_names:
+                if file_name.endswith(".py"):
+                    source = os.path.join(root, file_name)
+                    files[os.path.relpath(source, addon_output_dir)] = source
+    return files
+
+
+def compile_bytecode(
+    addon_output_dir: str,
+    files: Mapping[str, str],
+    python_binary_name: str,
+    optimization: int = 0,
+) -> CompileResult:
+    """
+    Compiles `files` (see `get_python_files`) with `python_binary_name` and
+    writes their bytecode to `__pycache__` folders of the add-on output
+    folder. Files which can't be compiled, for example Python 2 only modules
+    of a library, are reported in the result and left to the interpreter.
+    """
+    if optimization not in OPTIMIZATION_LEVELS:
+        raise ValueError(f"Optimization level should be one of {OPTIMIZATION_LEVELS}")
+    compile_input = [
+        optimization,
+        [
+            [
+                source,
+                os.path.join(addon_output_dir, path),
+                path.replace(os.sep, "/"),
+            ]
+            for path, source in sorted(files.items())
+        ],
+    ]
+    command_desc = f"compile bytecode with {python_binary_name}"
+    try:
+        process = subprocess.run(
+            shlex.split(python_binary_name) + ["-c", _COMPILE_SCRIPT],
+            input=json.dumps(compile_input).encode("utf-8"),
+            stdout=subprocess.PIPE,
+        )
+    except OSError as e:
+        logger.error(f"Execution ({command_desc}) failed due to {e}")
+        raise CouldNotCompileBytecode from e
+    if process.returncode != 0:
+        logger.error(
+            f"Command ({command_desc}) returned {process.returncode} status code"
+        )
+        raise CouldNotCompileBytecode
+    return CompileResult(**json.loads(process.stdout))
@@ -14,29 +14,39 @@
 # limitations under the License.
 #
 import configparser
+import functools
+import io
 import json
 import logging
 import os
 import shutil
 import sys
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Sequence, Set
 
-from jinja2 import Environment, FileSystemLoader
 from openapi3 import OpenAPI
 
 from splunk_add_on_ucc_framework import (
     __version__,
     exceptions,
+    file_writer,
     global_config_update,
     global_config_validator,
+    stage_scheduler,
     utils,
 )
 from splunk_add_on_ucc_framework import app_conf as app_conf_lib
+from splunk_add_on_ucc_framework import archive as archive_lib
+from splunk_add_on_ucc_framework import build_manifest as build_manifest_lib
+from splunk_add_on_ucc_framework import build_profiler
+from splunk_add_on_ucc_framework import bytecode_compiler
 from splunk_add_on_ucc_framework import meta_conf as meta_conf_lib
 from splunk_add_on_ucc_framework import server_conf as server_conf_lib
 from splunk_add_on_ucc_framework import app_manifest as app_manifest_lib
 from splunk_add_on_ucc_framework import global_config as global_config_lib
+from splunk_add_on_ucc_framework import materializer as materializer_lib
 from splunk_add_on_ucc_framework import normalize
+from splunk_add_on_ucc_framework import output_tree as output_tree_lib
+from splunk_add_on_ucc_framework import template_env
 from splunk_add_on_ucc_framework.commands.modular_alert_builder import (
     generate_alerts,
 )
@@ -47,6 +57,7 @@ from splunk_add_on_ucc_framework.commands.rest_builder import (
 from splunk_add_on_ucc_framework.commands.rest_builder.builder import RestBuilder
 from splunk_add_on_ucc_framework.install_python_libraries import (
     SplunktaucclibNotFound,
+    get_lib_cache_dir,
     install_python_libraries,
 )
 from splunk_add_on_ucc_framework.commands.openapi_generator import (
@@ -57,133 +68,56 @@ from splunk_add_on_ucc_framework.commands.openapi_generator import (
 logger = logging.getLogger("ucc_gen")
 
 PARENT_DIR = ".."
+OPENAPI_FILE_PATH = os.path.join("static", "openapi.json")
 internal_root_dir = os.path.dirname(os.path.dirname(__file__))
-# nosemgrep: splunk.autoescape-disabled, python.jinja2.security.audit.autoescape-disabled.autoescape-disabled
-j2_env = Environment(
-    loader=FileSystemLoader(os.path.join(internal_root_dir, "templates"))
-)
-
-
-def _recursive_overwrite(src, dest, ignore_list=None):
-    """
-    Method to copy from src to dest recursively.
-
-    Args:
-        src (str): Source of copy
-        dest (str): Destination to copy
-        ignore_list (list): List of files/folder to ignore while copying
-    """
 
-    if os.path.isdir(src):
-        if not os.path.isdir(dest):
-            os.makedirs(dest)
-        files = os.listdir(src)
-        for f in files:
-            if not ignore_list or not os.path.join(dest, f) in ignore_list:
-                _recursive_overwrite(
-                    os.path.join(src, f), os.path.join(dest, f), ignore_list
-                )
-            else:
-                logger.info(f"Excluding : {os.path.join(dest, f)}")
-    else:
-        if os.path.exists(dest):
-            os.remove(dest)
-        shutil.copy(src, dest)
 
-
-def _replace_token(ta_name, outputdir):
+def _replace_token(ta_name, output_tree):
     """
     Replace token with addon name in inputs.xml, configuration.xml, redirect.xml.
     Replace token with addon version in redirect.xml.
 
     Args:
         ta_name (str): Name of TA.
-        outputdir (str): output directory.
+        output_tree (OutputTree): Output tree of the add-on.
     """
 
     # replace token in template
     logger.info("Replace tokens in views")
     views = ["inputs.xml", "configuration.xml", "redirect.xml"]
     for view in views:
-        template_dir = os.path.join(
-            outputdir, ta_name, "default", "data", "ui", "views"
+        tokens = {"${package.name}": ta_name}
+        if view == "redirect.xml":
+            tokens["${ta.name}"] = ta_name.lower()
+        output_tree.replace_tokens(
+            os.path.join("default", "data", "ui", "views", view), tokens
         )
-        with open(os.path.join(template_dir, view)) as f:
-            s = f.read()
-
-        # Safely write the changed content, if found in the file
-        with open(os.path.join(template_dir, view), "w") as f:
-            s = s.replace("${package.name}", ta_name)
-            if view == "redirect.xml":
-                s = s.replace("${ta.name}", ta_name.lower())
-            f.write(s)
-
-
-def _generate_rest(
-    ta_name,
-    scheme: global_config_builder_schema.GlobalConfigBuilderSchema,
-    outputdir,
-):
-    """
-    Build REST for Add-on.
-
-    Args:
-        ta_name (str): Name of TA.
-        scheme (GlobalConfigBuilderSchema): REST schema.
-        outputdir (str): output directory.
-    """
-    builder_obj = RestBuilder(scheme, os.path.join(outputdir, ta_name))
-    builder_obj.build()
-    post_process = global_config_post_processor.GlobalConfigPostProcessor()
-    post_process(builder_obj, scheme)
-    return builder_obj
-
 
-def _is_oauth_configured(ta_tabs):
-    """
-    Check if oauth is configured in globalConfig file.
-
-    Args:
-        ta_tabs (list): List of tabs mentioned in globalConfig file.
 
-    Returns:
-        bool: True if oauth is configured, False otherwise.
-    """
-
-    for tab in ta_tabs:
-        if tab["name"] == "account":
-            for elements in tab["entity"]:
-                if elements["type"] == "oauth":
-                    return True
-            break
-    return False
-
-
-def _replace_oauth_html_template_token(ta_name, ta_version, outputdir):
+def _replace_oauth_html_template_token(ta_name, ta_version, output_tree):
     """
     Replace tokens with addon name and version in redirect.html.
 
     Args:
         ta_name (str): Name of TA.
         ta_version (str): Version of TA.
-        outputdir (str): output directory.
+        output_tree (OutputTree): Output tree of the add-on.
     """
-
-    html_template_path = os.path.join(outputdir, ta_name, "appserver", "templates")
-    with open(os.path.join(html_template_path, "redirect.html")) as f:
-        s = f.read()
-
-    # Safely write the changed content, if found in the file
-    with open(os.path.join(html_template_path, "redirect.html"), "w") as f:
-        # replace addon name in html template
-        s = s.replace("${ta.name}", ta_name.lower())
-        # replace addon version in html template
-        s = s.replace("${ta.version}", ta_version)
-        f.write(s)
+    output_tree.replace_tokens(
+        os.path.join("appserver", "templates", "redirect.html"),
+        {
+            # replace addon name in html template
+            "${ta.name}": ta_name.lower(),
+            # replace addon version in html template
+            "${ta.version}": ta_version,
+        },
+    )
 
 
 def _modify_and_replace_token_for_oauth_templates(
-    ta_name: str, global_config: global_config_lib.GlobalConfig, outputdir: str
+    ta_name: str,
+    global_config: global_config_lib.GlobalConfig,
+    output_tree: output_tree_lib.OutputTree,
 ):
     """
     Rename templates with respect to addon name if OAuth is configured.
@@ -191,53 +125,45 @@ def _modify_and_replace_token_for_oauth_templates(
     Args:
         ta_name: Add-on name.
         global_config: Object representing globalConfig.
-        outputdir: output directory.
+        output_tree: Output tree of the add-on.
     """
-    redirect_xml_src = os.path.join(
-        outputdir, ta_name, "default", "data", "ui", "views", "redirect.xml"
-    )
+    redirect_xml_src = os.path.join("default", "data", "ui", "views", "redirect.xml")
     redirect_js_src = os.path.join(
-        outputdir, ta_name, "appserver", "static", "js", "build", "redirect_page.js"
-    )
-    redirect_html_src = os.path.join(
-        outputdir, ta_name, "appserver", "templates", "redirect.html"
+        "appserver", "static", "js", "build", "redirect_page.js"
     )
+    redirect_html_src = os.path.join("appserver", "templates", "redirect.html")
 
-    if _is_oauth_configured(global_config.tabs):
-        _replace_oauth_html_template_token(ta_name, global_config.version, outputdir)
+    if global_config.has_oauth():
+        _replace_oauth_html_template_token(ta_name, global_config.version, output_tree)
 
-        redirect_js_dest = (
-            os.path.join(outputdir, ta_name, "appserver", "static", "js", "build", "")
-            + ta_name.lower()
-            + "_redirect_page."
-            + global_config.version
-            + ".js"
+        redirect_js_dest = os.path.join(
+            "appserver",
+            "static",
+            "js",
+            "build",
+            ta_name.lower() + "_redirect_page." + global_config.version + ".js",
         )
         redirect_html_dest = os.path.join(
-            outputdir,
-            ta_name,
             "appserver",
             "templates",
             ta_name.lower() + "_redirect.html",
         )
         redirect_xml_dest = os.path.join(
-            outputdir,
-            ta_name,
             "default",
             "data",
             "ui",
             "views",
             ta_name.lower() + "_redirect.xml",
         )
-        os.rename(redirect_js_src, redirect_js_dest)
-        os.rename(redirect_html_src, redirect_html_dest)
-        os.rename(redirect_xml_src, redirect_xml_dest)
+        output_tree.rename(redirect_js_src, redirect_js_dest)
+        output_tree.rename(redirect_html_src, redirect_html_dest)
+        output_tree.rename(redirect_xml_src, redirect_xml_dest)
 
     # if oauth is not configured remove the extra template
     else:
-        os.remove(redirect_xml_src)
-        os.remove(redirect_html_src)
-        os.remove(redirect_js_src)
+        output_tree.remove(redirect_xml_src)
+        output_tree.remove(redirect_html_src)
+        output_tree.remove(redirect_js_src)
 
 
 def _add_modular_input(
@@ -251,6 +177,7 @@ def _add_modular_input(
         global_config: Object representing globalConfig.
         outputdir: output directory.
     """
+    config = configparser.ConfigParser()
     for service in global_config.inputs:
         input_name = service.get("name")
         class_name = input_name.upper()
@@ -266,29 +193,32 @@ def _add_modular_input(
         entity = [x for x in entity if x.get("field") not in field_allow_list]
         import_declare = "import import_declare_test"
 
-        content = j2_env.get_template(template).render(
-            import_declare=import_declare,
-            input_name=input_name,
-            class_name=class_name,
-            description=description,
-            entity=entity,
+        content = (
+            template_env.get_environment()
+            .get_template(template)
+            .render(
+                import_declare=import_declare,
+                input_name=input_name,
+                class_name=class_name,
+                description=description,
+                entity=entity,
+            )
         )
         input_file_name = os.path.join(outputdir, ta_name, "bin", input_name + ".py")
-        with open(input_file_name, "w") as input_file:
-            input_file.write(content)
-
-        input_default = os.path.join(outputdir, ta_name, "default", "inputs.conf")
-        config = configparser.ConfigParser()
-        if os.path.exists(input_default):
-            config.read(input_default)
+        file_writer.write_file(input_file_name, content)
 
         if config.has_section(input_name):
             config[input_name]["python.version"] = "python3"
         else:
             config[input_name] = {"python.version": "python3"}
 
-        with open(input_default, "w") as configfile:
-            config.write(configfile)
+    # inputs.conf of the previous build is not read, every input is added to
+    # the file again.
+    if config.sections():
+        input_default = os.path.join(outputdir, ta_name, "default", "inputs.conf")
+        config_content = io.StringIO()
+        config.write(config_content)
+        file_writer.write_file(input_default, config_content.getvalue())
 
 
 def _make_modular_alerts(
@@ -314,44 +244,44 @@ def _make_modular_alerts(
         generate_alerts(internal_root_dir, outputdir, envs)
 
 
-def _get_ignore_list(ta_name, path):
+def _get_ignore_list(path):
     """
     Return path of files/folders to be removed.
 
     Args:
-        ta_name (str): Name of TA.
         path (str): Path of '.uccignore'.
 
     Returns:
-        list: List of paths to be removed from output directory.
+        list: List of paths relative to the add-on output folder to be removed.
     """
     if not os.path.exists(path):
         return []
     else:
         with open(path) as ignore_file:
             ignore_list = ignore_file.readlines()
-        ignore_list = [
-            (os.path.join("output", ta_name, _get_os_path(path))).strip()
-            for path in ignore_list
-        ]
+        ignore_list = [_get_os_path(path).strip() for path in ignore_list]
         return ignore_list
 
 
-def _remove_listed_files(ignore_list):
+def _remove_listed_files(ignore_list, output_tree, addon_output_dir):
     """
-    Return path of files/folders to removed in output folder.
+    Remove files/folders from the output tree and generated files/folders
+    from the output folder.
 
     Args:
         ignore_list (list): List of files/folder to removed in output directory.
-
+        output_tree (OutputTree): Output tree of the add-on.
+        addon_output_dir (str): Output folder of the add-on.
     """
     for path in ignore_list:
-        if os.path.exists(path):
-            if os.path.isfile(path):
-                os.remove(path)
-            elif os.path.isdir(path):
-                shutil.rmtree(path, ignore_errors=True)
-        else:
+        removed = output_tree.remove(path)
+        output_path = os.path.join(addon_output_dir, path)
+        if os.path.exists(output_path):
+            if os.path.isfile(output_path):
+                os.remove(output_path)
+            elif os.path.isdir(output_path):
+                shutil.rmtree(output_path, ignore_errors=True)
+        elif not removed:
             logger.info(
                 "While ignoring the files mentioned in .uccignore {} was not found".format(
                     path
@@ -359,39 +289,29 @@ def _remove_listed_files(ignore_list):
             )
 
 
-def _handle_no_inputs(ta_name, outputdir):
+def _handle_no_inputs(output_tree):
     """
     Handle for configuration without input page.
 
     Args:
-        ta_name (str): Name of TA.
-        outputdir (str): output directory.
+        output_tree (OutputTree): Output tree of the add-on.
     """
-    default_xml_file = os.path.join(
-        outputdir, ta_name, "default", "data", "ui", "nav", "default.xml"
-    )
+    default_xml_file = os.path.join("default", "data", "ui", "nav", "default.xml")
     default_no_input_xml_file = os.path.join(
-        outputdir, ta_name, "default", "data", "ui", "nav", "default_no_input.xml"
+        "default", "data", "ui", "nav", "default_no_input.xml"
     )
-    os.remove(default_xml_file)
-    os.rename(
+    output_tree.remove(default_xml_file)
+    output_tree.rename(
         default_no_input_xml_file,
         default_xml_file,
     )
     file_remove_list = [
-        os.path.join(
-            outputdir, ta_name, "default", "data", "ui", "views", "inputs.xml"
-        ),
-        os.path.join(outputdir, ta_name, "appserver", "static", "css", "inputs.css"),
-        os.path.join(
-            outputdir, ta_name, "appserver", "static", "css", "createInput.css"
-        ),
+        os.path.join("default", "data", "ui", "views", "inputs.xml"),
+        os.path.join("appserver", "static", "css", "inputs.css"),
+        os.path.join("appserver", "static", "css", "createInput.css"),
     ]
     for fl in file_remove_list:
-        try:
-            os.remove(fl)
-        except OSError:
-            pass
+        output_tree.remove(fl)
 
 
 def _get_os_path(path):
@@ -413,6 +333,214 @@ def _get_os_path(path):
     return path.strip(os.sep)
 
 
+def _clean_output_directory(output_directory: str) -> None:
+    """
+    Removes everything from the output directory, used when the build is
+    not incremental or the previous build did not record the files it left
+    there.
+
+    Args:
+        output_directory: Output directory.
+    """
+    shutil.rmtree(output_directory, ignore_errors=True)
+    os.makedirs(output_directory)
+
+
+def _get_stale_stages(
+    output_directory: str,
+    ta_name: str,
+    current_manifest: build_manifest_lib.BuildManifest,
+    previous_manifest: Optional[build_manifest_lib.BuildManifest],
+) -> Set[str]:
+    """
+    Returns build stages which need to be rerun comparing to the previous
+    build recorded in the output directory.
+
+    Args:
+        output_directory: Output directory.
+        ta_name: Add-on name.
+        current_manifest: Manifest with the inputs of the current build.
+        previous_manifest: Manifest of the previous build.
+    """
+    if not os.path.isdir(os.path.join(output_directory, ta_name)):
+        return set(build_manifest_lib.STAGE_INPUTS.keys())
+    stale_stages = current_manifest.stale_stages(previous_manifest)
+    if current_manifest.inputs.get("requirements") is not None and not os.path.isdir(
+        os.path.join(output_directory, ta_name, "lib")
+    ):
+        stale_stages.add(build_manifest_lib.STAGE_LIBRARIES)
+    return stale_stages
+
+
+def _get_reused_outputs(
+    output_directory: str,
+    stale_stages: Set[str],
+    previous_manifest: build_manifest_lib.BuildManifest,
+    overridden_paths: Sequence[str],
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Returns files of the previous build generated by the stages which do not
+    need to be rerun by stage name.
+
+    Args:
+        output_directory: Output directory.
+        stale_stages: Build stages which need to be rerun.
+        previous_manifest: Manifest of the previous build.
+        overridden_paths: Generated files which are overridden by the package.
+    """
+    overridden_files = {
+        build_manifest_lib.to_manifest_path(path, output_directory)
+        for path in overridden_paths
+    }
+    reused_outputs = {}
+    for stage in build_manifest_lib.GENERATION_STAGES:
+        if stage in stale_stages:
+            continue
+        outputs = previous_manifest.get_intact_outputs(
+            stage, output_directory, overridden_files
+        )
+        if outputs is not None:
+            reused_outputs[stage] = outputs
+    return reused_outputs
+
+
+def _run_generation_stage(
+    stage: str,
+    stage_func: Callable[[], None],
+    output_directory: str,
+    stage_outputs: Dict[str, Dict[str, Optional[str]]],
+) -> None:
+    """
+    Runs the stage and records the files it generated in `stage_outputs`.
+
+    Args:
+        stage: Stage name.
+        stage_func: Function of the stage.
+        output_directory: Output directory.
+        stage_outputs: Files generated by the stages by stage name.
+    """
+    with file_writer.get_writer().record_outputs() as outputs:
+        stage_func()
+    stage_outputs[stage] = {
+        build_manifest_lib.to_manifest_path(path, output_directory): digest
+        for path, digest in outputs.items()
+    }
+
+
+def _reuse_generation_stage(
+    stage: str,
+    outputs: Dict[str, Optional[str]],
+    stage_outputs: Dict[str, Dict[str, Optional[str]]],
+) -> None:
+    """
+    Keeps the files the stage generated in the previous build.
+
+    Args:
+        stage: Stage name.
+        outputs: Files generated by the stage in the previous build.
+        stage_outputs: Files generated by the stages by stage name.
+    """
+    stage_outputs[stage] = outputs
+    logger.info(f"Stage {stage} is up to date, kept {len(outputs)} generated files")
+
+
+def _get_generation_stage(
+    stage: str,
+    stage_func: Callable[[], None],
+    output_directory: str,
+    reused_outputs: Dict[str, Dict[str, Optional[str]]],
+    stage_outputs: Dict[str, Dict[str, Optional[str]]],
+) -> Callable[[], None]:
+    if stage in reused_outputs:
+        return functools.partial(
+            _reuse_generation_stage, stage, reused_outputs[stage], stage_outputs
+        )
+    return functools.partial(
+        _run_generation_stage, stage, stage_func, output_directory, stage_outputs
+    )
+
+
+def _is_bytecode_kept(path: str, produced_files: Set[str], optimization: int) -> bool:
+    # Bytecode `dir/__pycache__/module.<tag>[.opt-N].pyc` is kept if it is
+    # compiled with the current optimization level from a produced file.
+    parts = path.rsplit("/", 2)
+    if len(parts) != 3 or parts[1] != "__pycache__":
+        return False
+    module_name, _, suffix = parts[2].partition(".")
+    if optimization:
+        is_optimization_kept = f".opt-{optimization}." in suffix
+    else:
+        is_optimization_kept = ".opt-" not in suffix
+    return is_optimization_kept and f"{parts[0]}/{module_name}.py" in produced_files
+
+
+def _remove_stale_files(
+    output_directory: str,
+    previous_files: Sequence[str],
+    output_tree: Optional[output_tree_lib.OutputTree],
+    ta_name: str,
+    stage_outputs: Dict[str, Dict[str, Optional[str]]],
+    expected_files: Sequence[str],
+    compile_optimization: Optional[int],
+) -> None:
+    """
+    Removes files which the previous build left in the output and which are
+    not produced anymore. Bytecode is kept for the produced Python files if
+    the add-on is compiled with the same interpreter and optimization level.
+
+    Args:
+        output_directory: Output directory.
+        previous_files: Files the previous build left in the output.
+        output_tree: Output tree of the add-on if it is written to the output.
+        ta_name: Add-on name.
+        stage_outputs: Files generated by the stages by stage name.
+        expected_files: Files which are generated by the later stages.
+        compile_optimization: Optimization level of the bytecode which is
+            kept or None if bytecode is not kept.
+    """
+    output_directory = os.path.abspath(output_directory)
+    produced_files = set(expected_files)
+    produced_directories = {os.path.join(output_directory, ta_name)}
+    if output_tree is not None:
+        for path in output_tree.files:
+            produced_files.add(
+                build_manifest_lib.to_manifest_path(
+                    os.path.join(output_directory, ta_name, path), output_directory
+                )
+            )
+        for directory in output_tree.directories:
+            produced_directories.add(os.path.join(output_directory, ta_name, directory))
+    for path in file_writer.get_writer().written_paths:
+        if path.startswith(output_directory + os.sep):
+            produced_files.add(
+                build_manifest_lib.to_manifest_path(path, output_directory)
+            )
+    for outputs in stage_outputs.values():
+        produced_files.update(outputs)
+    removed = 0
+    for path in previous_files:
+        if path in produced_files or (
+            compile_optimization is not None
+            and _is_bytecode_kept(path, produced_files, compile_optimization)
+        ):
+            continue
+        file_path = build_manifest_lib.from_manifest_path(path, output_directory)
+        if not os.path.isfile(file_path) and not os.path.islink(file_path):
+            continue
+        os.remove(file_path)
+        removed += 1
+        directory = os.path.dirname(file_path)
+        while (
+            directory != output_directory
+            and directory not in produced_directories
+            and os.path.isdir(directory)
+            and not os.listdir(directory)
+        ):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+    logger.info(f"Removed {removed} files which are not produced anymore")
+
+
 def _get_addon_version(addon_version: Optional[str]) -> str:
     if not addon_version:
         try:
@@ -434,24 +562,384 @@ def _get_addon_version(addon_version: Optional[str]) -> str:
     return addon_version.strip()
 
 
-def generate(
+def _add_ucc_template(
+    ta_name: str,
+    config_path: str,
+    global_config_file: str,
+    global_config: global_config_lib.GlobalConfig,
+    output_tree: output_tree_lib.OutputTree,
+    outputdir: str,
+) -> None:
+    """
+    Adds UCC template directory and globalConfig file to the output tree and
+    creates template folders in the output, so generated files can be
+    written there.
+
+    Args:
+        ta_name: Add-on name.
+        config_path: Path to the globalConfig file.
+        global_config_file: Name of the globalConfig file in the output.
+        global_config: Object representing globalConfig.
+        output_tree: Output tree of the add-on.
+        outputdir: Output directory.
+    """
+    output_tree.add_directory(os.path.join(internal_root_dir, "package"))
+    logger.info("Added UCC template directory")
+    with open(config_path) as global_config_fd:
+        output_tree.add_content(
+            os.path.join("appserver", "static", "js", "build", global_config_file),
+            global_config_fd.read(),
+        )
+    logger.info("Added globalConfig to output")
+    _replace_token(ta_name, output_tree)
+    _modify_and_replace_token_for_oauth_templates(ta_name, global_config, output_tree)
+    if global_config.has_inputs():
+        output_tree.remove(
+            os.path.join("default", "data", "ui", "nav", "default_no_input.xml")
+        )
+    else:
+        _handle_no_inputs(output_tree)
+    output_tree.make_directories(os.path.join(outputdir, ta_name))
+
+
+def _install_libraries(
     source: str,
-    config_path: Optional[str] = None,
-    addon_version: Optional[str] = None,
-    output_directory: Optional[str] = None,
-    python_binary_name: str = "python3",
-):
-    logger.info(f"ucc-gen version {__version__} is used")
-    logger.info(f"Python binary name to use: {python_binary_name}")
-    if output_directory is None:
-        output_directory = os.path.join(os.getcwd(), "output")
-    addon_version = _get_addon_version(addon_version)
-    logger.info(f"Add-on will be built with version '{addon_version}'")
-    if not os.path.exists(source):
-        raise NotADirectoryError(f"{os.path.abspath(source)} not found.")
-    shutil.rmtree(os.path.join(output_directory), ignore_errors=True)
-    os.makedirs(os.path.join(output_directory))
-    logger.info(f"Cleaned out directory {output_directory}")
+    ucc_lib_target: str,
+    python_binary_name: str,
+    includes_ui: bool,
+    lib_cache_dir: Optional[str],
+    wheelhouse: Optional[str],
+    strip_libraries: bool,
+) -> None:
+    """
+    Installs add-on requirements into the `lib` folder of the add-on.
+
+    Args:
+        source: Folder containing the app.manifest and app source.
+        ucc_lib_target: `lib` folder of the add-on in the output.
+        python_binary_name: Python binary name to use to install requirements.
+        includes_ui: Whether add-on has UI.
+        lib_cache_dir: Cache of the installed libraries, libraries are not
+            cached if it is None.
+        wheelhouse: Folder with wheels to install requirements from without
+            accessing package index.
+        strip_libraries: Whether files which are not needed to run the
+            libraries are removed.
+    """
+    # Libraries installed by the previous build are not reused.
+    shutil.rmtree(ucc_lib_target, ignore_errors=True)
+    try:
+        install_python_libraries(
+            source,
+            ucc_lib_target,
+            python_binary_name,
+            includes_ui=includes_ui,
+            lib_cache_dir=lib_cache_dir,
+            wheelhouse=wheelhouse,
+            strip=strip_libraries,
+        )
+    except SplunktaucclibNotFound as e:
+        logger.error(str(e))
+        sys.exit(1)
+    logger.info(f"Installed add-on requirements into {ucc_lib_target} from {source}")
+
+
+def _create_server_conf(
+    ta_name: str, source: str, conf_file_names: Sequence[str], outputdir: str
+) -> None:
+    """
+    Creates default server.conf if there is no server.conf in the source
+    package.
+
+    Args:
+        ta_name: Add-on name.
+        source: Folder containing the app.manifest and app source.
+        conf_file_names: Names of the conf files managed by the add-on.
+        outputdir: Output directory.
+    """
+    source_server_conf_path = os.path.join(source, "default", "server.conf")
+    # For now, only create server.conf only if no server.conf is present in
+    # the source package.
+    if not os.path.isfile(source_server_conf_path):
+        server_conf = server_conf_lib.ServerConf()
+        server_conf.create_default(conf_file_names)
+        output_server_conf_path = os.path.join(
+            outputdir,
+            ta_name,
+            "default",
+            server_conf_lib.SERVER_CONF_FILE_NAME,
+        )
+        server_conf.write(output_server_conf_path)
+        logger.info(
+            f"Created default {server_conf_lib.SERVER_CONF_FILE_NAME} file in the output folder"
+        )
+
+
+def _add_package(
+    ta_name: str,
+    source: str,
+    output_tree: output_tree_lib.OutputTree,
+    outputdir: str,
+) -> None:
+    """
+    Removes files listed in `.uccignore` and adds the source package over
+    the output tree.
+
+    Args:
+        ta_name: Add-on name.
+        source: Folder containing the app.manifest and app source.
+        output_tree: Output tree of the add-on.
+        outputdir: Output directory.
+    """
+    ignore_list = _get_ignore_list(
+        os.path.abspath(os.path.join(source, PARENT_DIR, ".uccignore"))
+    )
+    _remove_listed_files(ignore_list, output_tree, os.path.join(outputdir, ta_name))
+    if ignore_list:
+        logger.info(f"Removed {ignore_list} files")
+    output_tree.add_directory(source)
+    logger.info("Added package directory")
+
+
+def _get_package_files(source: str) -> List[str]:
+    """
+    Returns paths of the files of the package relative to it.
+
+    Args:
+        source: Folder containing the app.manifest and app source.
+    """
+    package_files = []
+    for root, _, file_names in os.walk(source):
+        for file_name in file_names:
+            package_files.append(os.path.relpath(os.path.join(root, file_name), source))
+    return package_files
+
+
+def _create_default_meta_conf(output_tree: output_tree_lib.OutputTree) -> None:
+    """
+    Creates default.meta if the add-on does not have one.
+
+    Args:
+        output_tree: Output tree of the add-on.
+    """
+    default_meta_conf_path = os.path.join(
+        "metadata", meta_conf_lib.DEFAULT_META_FILE_NAME
+    )
+    if default_meta_conf_path not in output_tree:
+        meta_conf = meta_conf_lib.MetaConf()
+        meta_conf.create_default()
+        output_tree.add_content(default_meta_conf_path, str(meta_conf))
+        logger.info(
+            f"Created default {meta_conf_lib.DEFAULT_META_FILE_NAME} file in the output folder"
+        )
+
+
+def _write_version_file(
+    addon_version: str, output_tree: output_tree_lib.OutputTree
+) -> None:
+    """
+    Writes VERSION file of the add-on.
+
+    Args:
+        addon_version: Add-on version.
+        output_tree: Output tree of the add-on.
+    """
+    output_tree.add_content("VERSION", f"{addon_version}\n{addon_version}")
+    logger.info("Updated VERSION file")
+
+
+def _write_app_manifest(
+    app_manifest: app_manifest_lib.AppManifest,
+    output_tree: output_tree_lib.OutputTree,
+) -> None:
+    """
+    Writes app.manifest with the updated version to the output.
+
+    Args:
+        app_manifest: Object representing app.manifest.
+        output_tree: Output tree of the add-on.
+    """
+    output_tree.add_content(app_manifest_lib.APP_MANIFEST_FILE_NAME, str(app_manifest))
+    logger.info(
+        f"Updated {app_manifest_lib.APP_MANIFEST_FILE_NAME} file in the output folder"
+    )
+
+
+def _update_app_conf(
+    addon_version: str,
+    app_manifest: app_manifest_lib.AppManifest,
+    conf_file_names: Sequence[str],
+    output_tree: output_tree_lib.OutputTree,
+) -> None:
+    """
+    Updates app.conf in the output.
+
+    Args:
+        addon_version: Add-on version.
+        app_manifest: Object representing app.manifest.
+        conf_file_names: Names of the conf files managed by the add-on.
+        output_tree: Output tree of the add-on.
+    """
+    app_conf = app_conf_lib.AppConf()
+    app_conf_path = os.path.join("default", app_conf_lib.APP_CONF_FILE_NAME)
+    if app_conf_path in output_tree:
+        app_conf.read_string(output_tree.read(app_conf_path))
+    app_conf.update(addon_version, app_manifest, conf_file_names)
+    output_tree.add_content(app_conf_path, str(app_conf))
+    logger.info(f"Updated {app_conf_lib.APP_CONF_FILE_NAME} file in the output folder")
+
+
+def _add_licenses(source: str, output_tree: output_tree_lib.OutputTree) -> None:
+    """
+    Adds LICENSES directory to the output tree if it exists.
+
+    Args:
+        source: Folder containing the app.manifest and app source.
+        output_tree: Output tree of the add-on.
+    """
+    license_dir = os.path.abspath(os.path.join(source, PARENT_DIR, "LICENSES"))
+    if os.path.exists(license_dir):
+        logger.info("Copy LICENSES directory")
+        output_tree.add_directory(license_dir, "LICENSES")
+
+
+def _write_output_tree(
+    ta_name: str,
+    output_tree: output_tree_lib.OutputTree,
+    outputdir: str,
+    materializer: materializer_lib.Materializer,
+) -> None:
+    """
+    Writes all files of the output tree to the output.
+
+    Args:
+        ta_name: Add-on name.
+        output_tree: Output tree of the add-on.
+        outputdir: Output directory.
+        materializer: How files are materialized in the output.
+    """
+    output_tree.write(os.path.join(outputdir, ta_name), materializer)
+    logger.info(f"Wrote {len(output_tree.files)} files to the output folder")
+
+
+def _remove_overridden_files(
+    ta_name: str, output_tree: output_tree_lib.OutputTree, outputdir: str
+) -> None:
+    """
+    Removes generated files which are overridden by the output tree from the
+    output, used when the output tree is not written to the output.
+
+    Args:
+        ta_name: Add-on name.
+        output_tree: Output tree of the add-on.
+        outputdir: Output directory.
+    """
+    for path in output_tree.files:
+        output_path = os.path.join(outputdir, ta_name, path)
+        if os.path.isfile(output_path):
+            os.remove(output_path)
+
+
+def _has_additional_packaging(source: str) -> bool:
+    return os.path.exists(
+        os.path.abspath(os.path.join(source, PARENT_DIR, "additional_packaging.py"))
+    )
+
+
+def _run_additional_packaging(ta_name: str, source: str) -> None:
+    """
+    Runs `additional_packaging` function from `additional_packaging.py` file
+    if it exists.
+
+    Args:
+        ta_name: Add-on name.
+        source: Folder containing the app.manifest and app source.
+    """
+    if _has_additional_packaging(source):
+        sys.path.insert(0, os.path.abspath(os.path.join(source, PARENT_DIR)))
+        from additional_packaging import additional_packaging
+
+        additional_packaging(ta_name)
+
+
+def _compile_bytecode(
+    ta_name: str,
+    output_tree: output_tree_lib.OutputTree,
+    outputdir: str,
+    python_binary_name: str,
+    optimization: int,
+) -> None:
+    """
+    Compiles Python files of `bin` and `lib` folders of the add-on to
+    bytecode with the interpreter the add-on is built for.
+
+    Args:
+        ta_name: Add-on name.
+        output_tree: Files of the add-on which are not written to the output.
+        outputdir: Output directory.
+        python_binary_name: Python binary name to compile bytecode with.
+        optimization: Optimization level of the bytecode.
+    """
+    addon_output_dir = os.path.join(outputdir, ta_name)
+    files = bytecode_compiler.get_python_files(addon_output_dir, output_tree)
+    try:
+        result = bytecode_compiler.compile_bytecode(
+            addon_output_dir, files, python_binary_name, optimization
+        )
+    except bytecode_compiler.CouldNotCompileBytecode:
+        logger.error(f"Could not compile bytecode with {python_binary_name}")
+        sys.exit(1)
+    for path, error in result.failed:
+        logger.debug(f"Could not compile {path}: {error}")
+    if result.failed:
+        logger.warning(
+            f"{len(result.failed)} Python files could not be compiled, they are "
+            f"compiled when imported"
+        )
+    logger.info(
+        f"Compiled {result.compiled} Python files to bytecode (optimization "
+        f"level {optimization}), {result.skipped} files were already up to date"
+    )
+
+
+def _generate_openapi(
+    ta_name: str,
+    global_config: global_config_lib.GlobalConfig,
+    app_manifest: app_manifest_lib.AppManifest,
+    outputdir: str,
+) -> None:
+    """
+    Generates OpenAPI file for the add-on.
+
+    Args:
+        ta_name: Add-on name.
+        global_config: Object representing globalConfig.
+        app_manifest: Object representing app.manifest.
+        outputdir: Output directory.
+    """
+    logger.info("Generating OpenAPI file")
+    open_api_object = ucc_to_oas.transform(global_config, app_manifest)
+    open_api = OpenAPI(open_api_object.json)
+
+    output_openapi_path = os.path.abspath(
+        os.path.join(outputdir, ta_name, OPENAPI_FILE_PATH)
+    )
+    output_openapi_folder = os.path.dirname(output_openapi_path)
+    if not os.path.isdir(output_openapi_folder):
+        os.makedirs(os.path.join(output_openapi_folder))
+        logger.info(f"Creating {output_openapi_folder} folder")
+    file_writer.write_file(
+        output_openapi_path, json.dumps(open_api.raw_element, indent=4)
+    )
+
+
+def _read_app_manifest(source: str) -> app_manifest_lib.AppManifest:
+    """
+    Reads app.manifest of the add-on, exits if it has invalid format.
+
+    Args:
+        source: Folder containing the app.manifest and app source.
+    """
     app_manifest_path = os.path.abspath(
         os.path.join(source, app_manifest_lib.APP_MANIFEST_FILE_NAME),
     )
@@ -467,201 +955,530 @@ def generate(
             f'Lines with comments are supported if they start with "#".\n'
         )
         sys.exit(1)
-    ta_name = app_manifest.get_addon_name()
-    if not config_path:
-        is_global_config_yaml = False
-        config_path = os.path.abspath(os.path.join(source, "..", "globalConfig.json"))
-        if not os.path.isfile(config_path):
-            config_path = os.path.abspath(
-                os.path.join(source, "..", "globalConfig.yaml")
-            )
-            is_global_config_yaml = True
-    else:
-        is_global_config_yaml = True if config_path.endswith(".yaml") else False
+    return app_manifest
 
-    if os.path.isfile(config_path):
-        logger.info(f"Using globalConfig file located @ {config_path}")
-        global_config = global_config_lib.GlobalConfig()
-        global_config.parse(config_path, is_global_config_yaml)
-        try:
-            validator = global_config_validator.GlobalConfigValidator(
-                internal_root_dir, global_config
+
+def _validate_global_config(global_config: global_config_lib.GlobalConfig) -> None:
+    """
+    Validates globalConfig file, exits if it is not valid.
+
+    Args:
+        global_config: Object representing globalConfig.
+    """
+    try:
+        validator = global_config_validator.GlobalConfigValidator(
+            internal_root_dir, global_config
+        )
+        validator.validate()
+        for warning in validator.warnings:
+            logger.warning(f"globalConfig file: {warning}")
+        logger.info("globalConfig file is valid")
+    except global_config_validator.GlobalConfigValidatorException as e:
+        if len(e.errors) > 1:
+            logger.error(
+                f"globalConfig file is not valid, found {len(e.errors)} errors:\n"
+                + "\n".join(f"  {error}" for error in e.errors)
             )
-            validator.validate()
-            logger.info("globalConfig file is valid")
-        except global_config_validator.GlobalConfigValidatorException as e:
+        else:
             logger.error(f"globalConfig file is not valid. Error: {e}")
-            sys.exit(1)
-        global_config.update_addon_version(addon_version)
-        global_config.dump(global_config.original_path)
+        sys.exit(1)
+
+
+def _update_global_config(
+    global_config: global_config_lib.GlobalConfig, addon_version: str
+) -> None:
+    """
+    Sets add-on version and updates globalConfig to the latest schema version,
+    the globalConfig file is saved only if it changed.
+
+    Args:
+        global_config: Object representing globalConfig.
+        addon_version: Add-on version.
+    """
+    global_config.update_addon_version(addon_version)
+    global_config_update.handle_global_config_update(global_config)
+    if global_config.save():
         logger.info(
-            f"Updated and saved add-on version in the globalConfig file to {addon_version}"
+            f"Saved globalConfig file with add-on version {addon_version} and "
+            f"schema version {global_config.schema_version}"
         )
-        global_config_update.handle_global_config_update(global_config)
-        scheme = global_config_builder_schema.GlobalConfigBuilderSchema(
-            global_config, j2_env
+
+
+def _get_conf_file_names(
+    scheme: global_config_builder_schema.GlobalConfigBuilderSchema,
+) -> List[str]:
+    conf_file_names = []
+    conf_file_names.extend(list(scheme.settings_conf_file_names))
+    conf_file_names.extend(list(scheme.configs_conf_file_names))
+    conf_file_names.extend(list(scheme.oauth_conf_file_names))
+    return conf_file_names
+
+
+def generate(
+    source: str,
+    config_path: Optional[str] = None,
+    addon_version: Optional[str] = None,
+    output_directory: Optional[str] = None,
+    python_binary_name: str = "python3",
+    incremental: bool = False,
+    jobs: int = 1,
+    profile: bool = False,
+    materializer: str = materializer_lib.MATERIALIZER_REFLINK,
+    archive: Optional[str] = None,
+    archive_threads: int = 1,
+    lib_cache: bool = True,
+    wheelhouse: Optional[str] = None,
+    strip_libraries: bool = False,
+    compile_bytecode: bool = False,
+    compile_optimization: int = 0,
+):
+    if output_directory is None:
+        output_directory = os.path.join(os.getcwd(), "output")
+    profiler = build_profiler.BuildProfiler(enabled=profile)
+    profiler.start()
+    try:
+        _generate(
+            profiler=profiler,
+            output_directory=output_directory,
+            source=source,
+            config_path=config_path,
+            addon_version=addon_version,
+            python_binary_name=python_binary_name,
+            incremental=incremental,
+            jobs=jobs,
+            materializer=materializer,
+            archive=archive,
+            archive_threads=archive_threads,
+            lib_cache=lib_cache,
+            wheelhouse=wheelhouse,
+            strip_libraries=strip_libraries,
+            compile_bytecode=compile_bytecode,
+            compile_optimization=compile_optimization,
         )
-        _recursive_overwrite(
-            os.path.join(internal_root_dir, "package"),
-            os.path.join(output_directory, ta_name),
+    finally:
+        profiler.stop()
+    if profiler.enabled:
+        profile_path = os.path.join(
+            output_directory, build_profiler.BUILD_PROFILE_FILE_NAME
         )
-        logger.info("Copied UCC template directory")
-        global_config_file = (
-            "globalConfig.yaml" if is_global_config_yaml else "globalConfig.json"
+        trace_path = os.path.join(
+            output_directory, build_profiler.BUILD_PROFILE_TRACE_FILE_NAME
         )
-        output_global_config_path = os.path.join(
-            output_directory,
-            ta_name,
-            "appserver",
-            "static",
-            "js",
-            "build",
-            global_config_file,
+        profiler.write_json(profile_path)
+        profiler.write_chrome_trace(trace_path)
+        logger.info(f"Build profile is saved to {profile_path} and {trace_path}")
+
+
+def _generate(
+    profiler: build_profiler.BuildProfiler,
+    source: str,
+    output_directory: str,
+    config_path: Optional[str],
+    addon_version: Optional[str],
+    python_binary_name: str,
+    incremental: bool,
+    jobs: int,
+    materializer: str,
+    archive: Optional[str],
+    archive_threads: int,
+    lib_cache: bool,
+    wheelhouse: Optional[str],
+    strip_libraries: bool,
+    compile_bytecode: bool,
+    compile_optimization: int,
+):
+    logger.info(f"ucc-gen version {__version__} is used")
+    logger.info(f"Python binary name to use: {python_binary_name}")
+    file_writer.get_writer().reset()
+    if profiler.enabled and jobs > 1:
+        # Files written by a stage can only be attributed to it if no other
+        # stage runs at the same time.
+        logger.info("Build stages are run one by one while profiling")
+        jobs = 1
+    if archive and incremental:
+        logger.error("Incremental build can't be used together with the archive")
+        sys.exit(1)
+    addon_version = _get_addon_version(addon_version)
+    logger.info(f"Add-on will be built with version '{addon_version}'")
+    if not os.path.exists(source):
+        raise NotADirectoryError(f"{os.path.abspath(source)} not found.")
+    app_manifest = _read_app_manifest(source)
+    ta_name = app_manifest.get_addon_name()
+    config_path, is_global_config_yaml = global_config_lib.get_global_config_path(
+        source, config_path
+    )
+
+    manifest_path = os.path.join(
+        output_directory, build_manifest_lib.BUILD_MANIFEST_FILE_NAME
+    )
+    # Only the incremental build updates the files of the previous build in
+    # place, otherwise the output directory is cleaned.
+    previous_manifest = (
+        build_manifest_lib.read_build_manifest(manifest_path) if incremental else None
+    )
+    overridden_paths = [
+        os.path.join(output_directory, ta_name, path)
+        for path in _get_package_files(source)
+    ]
+    stale_stages = set(build_manifest_lib.STAGE_INPUTS.keys())
+    reused_outputs: Dict[str, Dict[str, Optional[str]]] = {}
+    if previous_manifest is not None:
+        current_build_manifest = build_manifest_lib.BuildManifest.from_build_inputs(
+            ucc_gen_version=__version__,
+            addon_version=addon_version,
+            python_binary_name=python_binary_name,
+            source=source,
+            config_path=config_path,
+            strip_libraries=strip_libraries,
+            compile_optimization=compile_optimization if compile_bytecode else None,
         )
-        shutil.copyfile(
-            config_path,
-            output_global_config_path,
+        stale_stages = _get_stale_stages(
+            output_directory, ta_name, current_build_manifest, previous_manifest
         )
-        logger.info("Copied globalConfig to output")
-        ucc_lib_target = os.path.join(output_directory, ta_name, "lib")
-        try:
-            install_python_libraries(
-                source, ucc_lib_target, python_binary_name, includes_ui=True
+        if not stale_stages:
+            logger.info(
+                f"Output directory {output_directory} is up to date, nothing to build"
             )
-        except SplunktaucclibNotFound as e:
-            logger.error(str(e))
-            sys.exit(1)
-        logger.info(
-            f"Installed add-on requirements into {ucc_lib_target} from {source}"
+            return
+        reused_outputs = _get_reused_outputs(
+            output_directory, stale_stages, previous_manifest, overridden_paths
         )
-        _replace_token(ta_name, output_directory)
-        _generate_rest(ta_name, scheme, output_directory)
-        _modify_and_replace_token_for_oauth_templates(
-            ta_name,
-            global_config,
-            output_directory,
+    keep_libraries = build_manifest_lib.STAGE_LIBRARIES not in stale_stages
+    if previous_manifest is None:
+        with profiler.profile("clean"):
+            _clean_output_directory(output_directory)
+        logger.info(f"Cleaned out directory {output_directory}")
+    else:
+        # Files of the previous build are updated in place, the manifest is
+        # written again only if the build succeeds.
+        os.remove(manifest_path)
+    stage_outputs: Dict[str, Dict[str, Optional[str]]] = {}
+    # Generated files are not written if the package overrides them, so they
+    # are not replaced twice on every build.
+    file_writer.get_writer().set_overridden_paths(overridden_paths)
+
+    scheduler = stage_scheduler.StageScheduler(
+        jobs, stage_wrapper=profiler.wrap if profiler.enabled else None
+    )
+    file_materializer = materializer_lib.get_materializer(materializer)
+    writer = file_writer.get_writer()
+    profiler.add_write_counter(lambda: (writer.files_written, writer.bytes_written))
+    profiler.add_write_counter(
+        lambda: (file_materializer.materialized, file_materializer.bytes_materialized)
+    )
+    output_tree = output_tree_lib.OutputTree()
+    ucc_lib_target = os.path.join(output_directory, ta_name, "lib")
+    lib_cache_dir = get_lib_cache_dir() if lib_cache else None
+    if keep_libraries:
+        logger.info(f"Add-on requirements did not change, keeping {ucc_lib_target}")
+    if os.path.isfile(config_path):
+        logger.info(f"Using globalConfig file located @ {config_path}")
+        global_config = global_config_lib.GlobalConfig()
+        global_config.parse(config_path, is_global_config_yaml)
+        with profiler.profile("validation"):
+            _validate_global_config(global_config)
+        with profiler.profile("config_update"):
+            _update_global_config(global_config, addon_version)
+        with profiler.profile("rest_schema"):
+            scheme = global_config_builder_schema.GlobalConfigBuilderSchema(
+                global_config, template_env.get_environment()
+            )
+            rest_builder = RestBuilder(
+                scheme,
+                os.path.join(output_directory, ta_name),
+                post_processors=(
+                    global_config_post_processor.GlobalConfigPostProcessor(),
+                ),
+            )
+        global_config_file = (
+            "globalConfig.yaml" if is_global_config_yaml else "globalConfig.json"
         )
-        if global_config.has_inputs():
-            default_no_input_xml_file = os.path.join(
-                output_directory,
+        conf_file_names = _get_conf_file_names(scheme)
+
+        # Template, package and every file derived from them are kept in the
+        # output tree and written once all generated files are in place, so
+        # the package overrides generated files as it always did. Every
+        # generation stage writes to its own files, the dependencies make
+        # sure the folders a stage works with are already created.
+        scheduler.add_stage(
+            "template",
+            functools.partial(
+                _add_ucc_template,
                 ta_name,
-                "default",
-                "data",
-                "ui",
-                "nav",
-                "default_no_input.xml",
-            )
-            os.remove(default_no_input_xml_file)
-            _add_modular_input(ta_name, global_config, output_directory)
-        else:
-            _handle_no_inputs(ta_name, output_directory)
-        _make_modular_alerts(ta_name, global_config, output_directory)
-
-        conf_file_names = []
-        conf_file_names.extend(list(scheme.settings_conf_file_names))
-        conf_file_names.extend(list(scheme.configs_conf_file_names))
-        conf_file_names.extend(list(scheme.oauth_conf_file_names))
-
-        source_server_conf_path = os.path.join(source, "default", "server.conf")
-        # For now, only create server.conf only if no server.conf is present in
-        # the source package.
-        if not os.path.isfile(source_server_conf_path):
-            server_conf = server_conf_lib.ServerConf()
-            server_conf.create_default(conf_file_names)
-            output_server_conf_path = os.path.join(
+                config_path,
+                global_config_file,
+                global_config,
+                output_tree,
                 output_directory,
-                ta_name,
-                "default",
-                server_conf_lib.SERVER_CONF_FILE_NAME,
+            ),
+        )
+        if not keep_libraries:
+            scheduler.add_stage(
+                "libraries",
+                functools.partial(
+                    _install_libraries,
+                    source,
+                    ucc_lib_target,
+                    python_binary_name,
+                    True,
+                    lib_cache_dir,
+                    wheelhouse,
+                    strip_libraries,
+                ),
             )
-            server_conf.write(output_server_conf_path)
-            logger.info(
-                f"Created default {server_conf_lib.SERVER_CONF_FILE_NAME} file in the output folder"
+        scheduler.add_stage(
+            build_manifest_lib.STAGE_REST,
+            _get_generation_stage(
+                build_manifest_lib.STAGE_REST,
+                rest_builder.build,
+                output_directory,
+                reused_outputs,
+                stage_outputs,
+            ),
+            depends_on=("template",),
+        )
+        if global_config.has_inputs():
+            scheduler.add_stage(
+                build_manifest_lib.STAGE_MODULAR_INPUTS,
+                _get_generation_stage(
+                    build_manifest_lib.STAGE_MODULAR_INPUTS,
+                    functools.partial(
+                        _add_modular_input, ta_name, global_config, output_directory
+                    ),
+                    output_directory,
+                    reused_outputs,
+                    stage_outputs,
+                ),
+                depends_on=(build_manifest_lib.STAGE_REST,),
             )
+        scheduler.add_stage(
+            build_manifest_lib.STAGE_ALERTS,
+            _get_generation_stage(
+                build_manifest_lib.STAGE_ALERTS,
+                functools.partial(
+                    _make_modular_alerts, ta_name, global_config, output_directory
+                ),
+                output_directory,
+                reused_outputs,
+                stage_outputs,
+            ),
+            depends_on=(build_manifest_lib.STAGE_REST,),
+        )
+        scheduler.add_stage(
+            build_manifest_lib.STAGE_SERVER_CONF,
+            _get_generation_stage(
+                build_manifest_lib.STAGE_SERVER_CONF,
+                functools.partial(
+                    _create_server_conf,
+                    ta_name,
+                    source,
+                    conf_file_names,
+                    output_directory,
+                ),
+                output_directory,
+                reused_outputs,
+                stage_outputs,
+            ),
+            depends_on=("template",),
+        )
     else:
         global_config = None
         conf_file_names = []
         logger.warning(
             "Skipped generating UI components as globalConfig file does not exist"
         )
-        ucc_lib_target = os.path.join(output_directory, ta_name, "lib")
-        install_python_libraries(source, ucc_lib_target, python_binary_name)
-        logger.info(
-            f"Installed add-on requirements into {ucc_lib_target} from {source}"
-        )
+        if not keep_libraries:
+            scheduler.add_stage(
+                "libraries",
+                functools.partial(
+                    _install_libraries,
+                    source,
+                    ucc_lib_target,
+                    python_binary_name,
+                    False,
+                    lib_cache_dir,
+                    wheelhouse,
+                    strip_libraries,
+                ),
+            )
 
-    ignore_list = _get_ignore_list(
-        ta_name, os.path.abspath(os.path.join(source, PARENT_DIR, ".uccignore"))
+    scheduler.add_stage(
+        "package",
+        functools.partial(_add_package, ta_name, source, output_tree, output_directory),
+        depends_on=[stage.name for stage in scheduler.stages],
     )
-    _remove_listed_files(ignore_list)
-    if ignore_list:
-        logger.info(f"Removed {ignore_list} files")
-    _recursive_overwrite(source, os.path.join(output_directory, ta_name))
-    logger.info("Copied package directory")
-
-    default_meta_conf_path = os.path.join(
-        output_directory, ta_name, "metadata", meta_conf_lib.DEFAULT_META_FILE_NAME
+    scheduler.add_stage(
+        "meta_conf",
+        functools.partial(_create_default_meta_conf, output_tree),
+        depends_on=("package",),
+    )
+    scheduler.add_stage(
+        "version",
+        functools.partial(_write_version_file, addon_version, output_tree),
+        depends_on=("package",),
     )
-    if not os.path.exists(default_meta_conf_path):
-        os.makedirs(os.path.join(output_directory, ta_name, "metadata"), exist_ok=True)
-        meta_conf = meta_conf_lib.MetaConf()
-        meta_conf.create_default()
-        meta_conf.write(default_meta_conf_path)
-        logger.info(
-            f"Created default {meta_conf_lib.DEFAULT_META_FILE_NAME} file in the output folder"
-        )
-
-    with open(os.path.join(output_directory, ta_name, "VERSION"), "w") as version_file:
-        version_file.write(addon_version)
-        version_file.write("\n")
-        version_file.write(addon_version)
-        logger.info("Updated VERSION file")
-
     app_manifest.update_addon_version(addon_version)
-    output_manifest_path = os.path.abspath(
-        os.path.join(output_directory, ta_name, app_manifest_lib.APP_MANIFEST_FILE_NAME)
+    scheduler.add_stage(
+        "app_manifest",
+        functools.partial(_write_app_manifest, app_manifest, output_tree),
+        depends_on=("package",),
     )
-    with open(output_manifest_path, "w") as manifest_file:
-        manifest_file.write(str(app_manifest))
-        logger.info(
-            f"Updated {app_manifest_lib.APP_MANIFEST_FILE_NAME} file in the output folder"
+    scheduler.add_stage(
+        "app_conf",
+        functools.partial(
+            _update_app_conf,
+            addon_version,
+            app_manifest,
+            conf_file_names,
+            output_tree,
+        ),
+        depends_on=("package",),
+    )
+    scheduler.add_stage(
+        "licenses",
+        functools.partial(_add_licenses, source, output_tree),
+        depends_on=("package",),
+    )
+    # Files of the output tree are streamed to the archive directly from
+    # their sources unless `additional_packaging` needs them in the output.
+    write_output_tree = not archive or _has_additional_packaging(source)
+    if write_output_tree:
+        write_stage = functools.partial(
+            _write_output_tree,
+            ta_name,
+            output_tree,
+            output_directory,
+            file_materializer,
         )
-
-    app_conf = app_conf_lib.AppConf()
-    output_app_conf_path = os.path.join(
-        output_directory, ta_name, "default", app_conf_lib.APP_CONF_FILE_NAME
+    else:
+        write_stage = functools.partial(
+            _remove_overridden_files, ta_name, output_tree, output_directory
+        )
+    scheduler.add_stage(
+        "write",
+        write_stage,
+        depends_on=("meta_conf", "version", "app_manifest", "app_conf", "licenses"),
     )
-    app_conf.read(output_app_conf_path)
-    app_conf.update(addon_version, app_manifest, conf_file_names)
-    app_conf.write(output_app_conf_path)
-    logger.info(f"Updated {app_conf_lib.APP_CONF_FILE_NAME} file in the output folder")
-
-    license_dir = os.path.abspath(os.path.join(source, PARENT_DIR, "LICENSES"))
-    if os.path.exists(license_dir):
-        logger.info("Copy LICENSES directory")
-        _recursive_overwrite(
-            license_dir, os.path.join(output_directory, ta_name, "LICENSES")
+    # Files created by `additional_packaging` are not known, they are removed
+    # and created by it again.
+    expected_files = []
+    if global_config:
+        expected_files.append(
+            build_manifest_lib.to_manifest_path(
+                os.path.join(output_directory, ta_name, OPENAPI_FILE_PATH),
+                output_directory,
+            )
         )
+    # Bytecode compiled by another interpreter is not kept.
+    is_bytecode_kept = (
+        compile_bytecode
+        and previous_manifest is not None
+        and previous_manifest.inputs.get("python_binary_name") == python_binary_name
+    )
+    scheduler.add_stage(
+        "remove_stale",
+        functools.partial(
+            _remove_stale_files,
+            output_directory,
+            previous_manifest.files if previous_manifest else [],
+            output_tree if write_output_tree else None,
+            ta_name,
+            stage_outputs,
+            expected_files,
+            compile_optimization if is_bytecode_kept else None,
+        ),
+        depends_on=("write",),
+    )
+    # `additional_packaging` may change any file of the add-on, so it runs
+    # after everything except OpenAPI file is generated, as it was always
+    # done.
+    scheduler.add_stage(
+        "additional_packaging",
+        functools.partial(_run_additional_packaging, ta_name, source),
+        depends_on=("remove_stale",),
+    )
+    if compile_bytecode:
+        scheduler.add_stage(
+            "compile",
+            functools.partial(
+                _compile_bytecode,
+                ta_name,
+                # Files of the output tree are compiled from their sources if
+                # the output tree is only written to the archive.
+                output_tree_lib.OutputTree() if write_output_tree else output_tree,
+                output_directory,
+                python_binary_name,
+                compile_optimization,
+            ),
+            depends_on=("additional_packaging",),
+        )
+    if global_config:
+        scheduler.add_stage(
+            build_manifest_lib.STAGE_OPENAPI,
+            _get_generation_stage(
+                build_manifest_lib.STAGE_OPENAPI,
+                functools.partial(
+                    _generate_openapi,
+                    ta_name,
+                    global_config,
+                    app_manifest,
+                    output_directory,
+                ),
+                output_directory,
+                reused_outputs,
+                stage_outputs,
+            ),
+            depends_on=("additional_packaging",),
+        )
+    scheduler.run()
+    if write_output_tree:
+        logger.info(
+            f"Materialized {file_materializer.materialized} files, "
+            f"{file_materializer.skipped} files were already up to date"
+        )
+    logger.info(
+        f"Wrote {writer.files_written} generated files "
+        f"({writer.bytes_written} bytes), {writer.files_skipped} files were "
+        f"already up to date"
+    )
 
-    if os.path.exists(
-        os.path.abspath(os.path.join(source, PARENT_DIR, "additional_packaging.py"))
-    ):
-        sys.path.insert(0, os.path.abspath(os.path.join(source, PARENT_DIR)))
-        from additional_packaging import additional_packaging
-
-        additional_packaging(ta_name)
+    if archive:
+        with profiler.profile("archive"):
+            archive_lib.write_archive(
+                archive,
+                ta_name,
+                # Everything is already in the output folder if the output
+                # tree was written.
+                output_tree_lib.OutputTree() if write_output_tree else output_tree,
+                os.path.join(output_directory, ta_name),
+                archive_threads,
+            )
 
-    if global_config:
-        logger.info("Generating OpenAPI file")
-        open_api_object = ucc_to_oas.transform(global_config, app_manifest)
-        open_api = OpenAPI(open_api_object.json)
-
-        output_openapi_folder = os.path.abspath(
-            os.path.join(output_directory, ta_name, "static")
-        )
-        output_openapi_path = os.path.join(output_openapi_folder, "openapi.json")
-        if not os.path.isdir(output_openapi_folder):
-            os.makedirs(os.path.join(output_openapi_folder))
-            logger.info(f"Creating {output_openapi_folder} folder")
-        with open(output_openapi_path, "w") as openapi_file:
-            json.dump(open_api.raw_element, openapi_file, indent=4)
+    # Output folder does not contain the whole add-on if the output tree was
+    # only written to the archive, so it can't be used by incremental build.
+    if write_output_tree:
+        # globalConfig file is updated during the build, so the inputs are
+        # collected once again to record the state the next build will see.
+        build_manifest = build_manifest_lib.BuildManifest.from_build_inputs(
+            ucc_gen_version=__version__,
+            addon_version=addon_version,
+            python_binary_name=python_binary_name,
+            source=source,
+            config_path=config_path,
+            strip_libraries=strip_libraries,
+            compile_optimization=compile_optimization if compile_bytecode else None,
+        )
+        # Files of the package in `lib` folder are recorded together with
+        # the other files, installed libraries are replaced as a whole.
+        lib_files = [
+            build_manifest_lib.to_manifest_path(
+                os.path.join(output_directory, ta_name, path), output_directory
+            )
+            for path in output_tree.files
+            if path.startswith("lib" + os.sep)
+        ]
+        build_manifest.record_outputs(
+            stage_outputs,
+            build_manifest_lib.list_output_files(output_directory, ta_name) + lib_files,
+        )
+        build_manifest.write(manifest_path)
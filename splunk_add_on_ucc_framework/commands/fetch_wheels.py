@@ -0,0 +1,47 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import os
+import sys
+
+from splunk_add_on_ucc_framework.install_python_libraries import (
+    CouldNotInstallRequirements,
+    download_wheels,
+)
+
+logger = logging.getLogger("ucc_gen")
+
+
+def fetch_wheels(
+    source: str,
+    wheelhouse: str,
+    python_binary_name: str = "python3",
+):
+    requirements_file_path = os.path.join(source, "lib", "requirements.txt")
+    if not os.path.isfile(requirements_file_path):
+        logger.error(f"Could not find requirements file @ {requirements_file_path}")
+        sys.exit(1)
+    os.makedirs(wheelhouse, exist_ok=True)
+    logger.info(f"Fetching wheels for {requirements_file_path} into {wheelhouse}")
+    try:
+        download_wheels(requirements_file_path, wheelhouse, python_binary_name)
+    except CouldNotInstallRequirements:
+        logger.error(f"Could not fetch wheels for {requirements_file_path}")
+        sys.exit(1)
+    logger.info(
+        f"Fetched wheels into {wheelhouse}, use `ucc-gen build --wheelhouse "
+        f"{wheelhouse}` to build the add-on without accessing package index"
+    )
@@ -15,8 +15,8 @@
 #
 import logging
 import os
-import shutil
 
+from splunk_add_on_ucc_framework import file_writer
 from splunk_add_on_ucc_framework.commands.modular_alert_builder.alert_actions_conf_gen import (
     generate_alert_actions_conf,
 )
@@ -35,10 +35,13 @@ def _copy_alert_icon_to_output(
     output_directory: str,
     addon_name: str,
 ):
-    shutil.copy(
-        os.path.join(internal_root_dir, "static", "alerticon.png"),
-        os.path.join(output_directory, addon_name, "appserver", "static"),
-    )
+    with open(os.path.join(internal_root_dir, "static", "alerticon.png"), "rb") as f:
+        file_writer.write_file(
+            os.path.join(
+                output_directory, addon_name, "appserver", "static", "alerticon.png"
+            ),
+            f.read(),
+        )
 
 
 def generate_alerts(internal_source_dir: str, output_dir: str, envs):
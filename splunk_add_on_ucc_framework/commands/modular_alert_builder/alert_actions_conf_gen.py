@@ -21,8 +21,7 @@ import os
 from os import linesep
 from os import path as op
 
-from jinja2 import Environment, FileSystemLoader
-
+from splunk_add_on_ucc_framework import template_env
 from splunk_add_on_ucc_framework.commands.modular_alert_builder import (
     alert_actions_exceptions as aae,
 )
@@ -53,15 +52,7 @@ class AlertActionsConfBase:
         self._all_settings = input_setting
         self._alert_settings = input_setting[ac.MODULAR_ALERTS]
         self._package_path = package_path
-        # nosemgrep: splunk.autoescape-disabled, python.jinja2.security.audit.autoescape-disabled.autoescape-disabled
-        self._templates = Environment(
-            loader=FileSystemLoader(
-                op.join(op.dirname(op.realpath(__file__)), "arf_template")
-            ),
-            trim_blocks=True,
-            lstrip_blocks=True,
-            keep_trailing_newline=True,
-        )
+        self._templates = template_env.get_alert_environment()
 
     def get_local_conf_file_path(self, conf_name=None, create_dir_path=True):
         if not self._package_path:
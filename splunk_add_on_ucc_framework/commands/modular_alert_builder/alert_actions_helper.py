@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import io
 import logging
 import os.path as op
 import sys
@@ -20,6 +21,7 @@ from os import makedirs, remove
 
 import addonfactory_splunk_conf_parser_lib as conf_parser
 
+from splunk_add_on_ucc_framework import file_writer
 from splunk_add_on_ucc_framework.commands.modular_alert_builder.alert_actions_merge import (
     merge_conf_file,
 )
@@ -42,7 +44,9 @@ def write_file(file_name, file_path, content, merge="stanza_overwrite"):
 
     if file_path:
         new_file = None
-        if op.exists(file_path) and do_merge:
+        # Only files written during this build are merged, files of the
+        # previous build are overwritten.
+        if do_merge and file_writer.get_writer().is_written(file_path):
             new_file = op.join(op.dirname(file_path), "new_" + file_name)
         if new_file:
             try:
@@ -55,14 +59,14 @@ def write_file(file_name, file_path, content, merge="stanza_overwrite"):
         else:
             if not op.exists(op.dirname(file_path)):
                 makedirs(op.dirname(file_path))
-            with open(file_path, "w+") as fhandler:
-                fhandler.write(content)
             if do_merge:
                 # need to process the file with conf parser
                 parser = conf_parser.TABConfigParser()
-                parser.read(file_path)
-                with open(file_path, "w") as df:
-                    parser.write(df)
+                parser.read_string(content)
+                conf_content = io.StringIO()
+                parser.write(conf_content)
+                content = conf_content.getvalue()
+            file_writer.write_file(file_path, content)
     else:
         sys.stdout.write(f"\n##################File {file_name}##################\n")
         sys.stdout.write(content)
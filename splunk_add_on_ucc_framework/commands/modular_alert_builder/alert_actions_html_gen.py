@@ -19,8 +19,7 @@ from os import linesep
 from os import path as op
 from re import search
 
-from jinja2 import Environment, FileSystemLoader
-
+from splunk_add_on_ucc_framework import template_env
 from splunk_add_on_ucc_framework.commands.modular_alert_builder import (
     alert_actions_exceptions as aae,
 )
@@ -42,22 +41,7 @@ class AlertHtmlBase:
         self._all_setting = input_setting
         self._package_path = package_path
         self._current_alert = None
-        # nosemgrep: splunk.autoescape-disabled, python.jinja2.security.audit.autoescape-disabled.autoescape-disabled
-        self._templates = Environment(
-            loader=FileSystemLoader(
-                [
-                    op.join(
-                        op.dirname(op.realpath(__file__)),
-                        "arf_template",
-                        "default_html_theme",
-                    ),
-                    op.join(op.dirname(op.realpath(__file__)), "arf_template"),
-                ]
-            ),
-            trim_blocks=True,
-            lstrip_blocks=True,
-            keep_trailing_newline=True,
-        )
+        self._templates = template_env.get_alert_environment()
 
     def get_alert_html_name(self):
         return self._current_alert[ac.SHORT_NAME] + ".html"
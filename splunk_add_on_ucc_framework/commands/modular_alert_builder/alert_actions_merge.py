@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import io
 import logging
 import os
 import os.path as op
@@ -21,6 +22,7 @@ from shutil import copy
 
 import addonfactory_splunk_conf_parser_lib as conf_parser
 
+from splunk_add_on_ucc_framework import file_writer
 from splunk_add_on_ucc_framework.commands.modular_alert_builder import (
     alert_actions_exceptions as aae,
 )
@@ -63,8 +65,9 @@ def remove_alert_from_conf_file(alert, conf_file):
             )
             parser.remove_section(stanza)
 
-    with open(conf_file, "w") as cf:
-        parser.write(cf)
+    content = io.StringIO()
+    parser.write(content)
+    file_writer.write_file(conf_file, content.getvalue())
 
 
 def merge_conf_file(src_file, dst_file, merge_mode="stanza_overwrite"):
@@ -106,8 +109,9 @@ def merge_conf_file(src_file, dst_file, merge_mode="stanza_overwrite"):
         # overwrite the whole file
         parser.read(src_file)
 
-    with open(dst_file, "w") as df:
-        parser.write(df)
+    content = io.StringIO()
+    parser.write(content)
+    file_writer.write_file(dst_file, content.getvalue())
 
 
 def merge(src, dst, no_deny_list=True):
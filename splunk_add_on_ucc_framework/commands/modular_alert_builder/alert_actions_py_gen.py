@@ -17,8 +17,7 @@ import logging
 import re
 from os import path as op
 
-from jinja2 import Environment, FileSystemLoader
-
+from splunk_add_on_ucc_framework import template_env
 from splunk_add_on_ucc_framework.commands.modular_alert_builder import (
     alert_actions_exceptions as aae,
 )
@@ -43,15 +42,7 @@ class AlertActionsPyBase:
         self._alert_actions_setting = input_setting[ac.MODULAR_ALERTS]
         self._ta_name = self._all_setting.get(ac.SHORT_NAME)
         self._lib_dir = self.get_python_lib_dir_name(self._ta_name)
-        # nosemgrep: splunk.autoescape-disabled, python.jinja2.security.audit.autoescape-disabled.autoescape-disabled
-        self._templates = Environment(
-            loader=FileSystemLoader(
-                op.join(op.dirname(op.realpath(__file__)), "arf_template")
-            ),
-            trim_blocks=True,
-            lstrip_blocks=True,
-            keep_trailing_newline=True,
-        )
+        self._templates = template_env.get_alert_environment()
 
     def get_python_lib_dir_name(self, app_name):
         space_replace = re.compile(r"[^\w]+")
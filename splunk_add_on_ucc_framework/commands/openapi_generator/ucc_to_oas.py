@@ -13,7 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-import copy
 from enum import Flag, auto
 from functools import lru_cache
 from typing import List, Tuple, Dict, Any, Optional
@@ -22,10 +21,7 @@ from splunk_add_on_ucc_framework import app_manifest as app_manifest_lib
 from splunk_add_on_ucc_framework.commands.openapi_generator.oas import (
     OpenAPIObject,
 )
-from splunk_add_on_ucc_framework.commands.openapi_generator import oas, json_to_object
-from splunk_add_on_ucc_framework.commands.openapi_generator.json_to_object import (
-    DataClasses,
-)
+from splunk_add_on_ucc_framework.commands.openapi_generator import oas
 
 
 class GloblaConfigPages(Flag):
@@ -131,25 +127,23 @@ def __get_schema_object(
 
 
 def __add_schemas_object(
-    open_api_object: OpenAPIObject, global_config: DataClasses
+    open_api_object: OpenAPIObject, global_config: global_config_lib.GlobalConfig
 ) -> OpenAPIObject:
     if open_api_object.components is not None:
         open_api_object.components.schemas = {}
-        for tab in global_config.pages.configuration.tabs:  # type: ignore[attr-defined]
+        for tab in global_config.configuration_tabs:
             schema_name, schema_object = __get_schema_object(
-                name=tab.name, entities=tab.entity
+                name=tab.name, entities=tab.entities
             )
             open_api_object.components.schemas[schema_name] = schema_object
             schema_name, schema_object = __get_schema_object(
-                name=tab.name, entities=tab.entity, without=["name"]
+                name=tab.name, entities=tab.entities, without=["name"]
             )
             open_api_object.components.schemas[schema_name] = schema_object
-        if hasattr(global_config.pages, "inputs") and hasattr(  # type: ignore[attr-defined]
-            global_config.pages.inputs, "services"  # type: ignore[attr-defined]
-        ):
+        if global_config.services:
             additional_input_entities = [
-                json_to_object.DataClasses(
-                    json={
+                global_config_lib.Entity(
+                    {
                         "field": "disabled",
                         "type": "singleSelect",
                         "options": {
@@ -161,21 +155,22 @@ def __add_schemas_object(
                     }
                 )
             ]
-            for service in global_config.pages.inputs.services:  # type: ignore[attr-defined]
+            for service in global_config.services:
+                entities = service.entities + additional_input_entities
                 schema_name, schema_object = __get_schema_object(
                     name=service.name,
-                    entities=service.entity + additional_input_entities,
+                    entities=entities,
                 )
                 open_api_object.components.schemas[schema_name] = schema_object
                 schema_name, schema_object = __get_schema_object(
                     name=service.name,
-                    entities=service.entity + additional_input_entities,
+                    entities=entities,
                     without=["name"],
                 )
                 open_api_object.components.schemas[schema_name] = schema_object
                 schema_name, schema_object = __get_schema_object(
                     name=service.name,
-                    entities=service.entity + additional_input_entities,
+                    entities=entities,
                     without=["disabled"],
                 )
                 open_api_object.components.schemas[schema_name] = schema_object
@@ -349,29 +344,26 @@ def __assign_ta_paths(
 
 
 def __add_paths(
-    open_api_object: OpenAPIObject, global_config: DataClasses
+    open_api_object: OpenAPIObject, global_config: global_config_lib.GlobalConfig
 ) -> OpenAPIObject:
-    for tab in global_config.pages.configuration.tabs:  # type: ignore[attr-defined]
+    for tab in global_config.configuration_tabs:
         open_api_object = __assign_ta_paths(
             open_api_object=open_api_object,
-            path=f"/{global_config.meta.restRoot}_{tab.name}"  # type: ignore[attr-defined]
-            if hasattr(tab, "table")
-            else f"/{global_config.meta.restRoot}_settings/{tab.name}",  # type: ignore[attr-defined]
+            path=f"/{global_config.namespace}_{tab.name}"
+            if tab.is_table
+            else f"/{global_config.namespace}_settings/{tab.name}",
             path_name=tab.name,
-            actions=tab.table.actions
-            if hasattr(tab, "table") and hasattr(tab.table, "actions")
-            else None,
+            actions=tab.table.get("actions") if tab.is_table else None,
             page=GloblaConfigPages.CONFIGURATION,
         )
-    if hasattr(global_config.pages, "inputs") and hasattr(  # type: ignore[attr-defined]
-        global_config.pages.inputs, "services"  # type: ignore[attr-defined]
-    ):
-        for service in global_config.pages.inputs.services:  # type: ignore[attr-defined]
+    if global_config.services:
+        inputs_actions = global_config.content["pages"]["inputs"]["table"]["actions"]
+        for service in global_config.services:
             open_api_object = __assign_ta_paths(
                 open_api_object=open_api_object,
-                path=f"/{global_config.meta.restRoot}_{service.name}",  # type: ignore[attr-defined]
+                path=f"/{global_config.namespace}_{service.name}",
                 path_name=service.name,
-                actions=global_config.pages.inputs.table.actions,  # type: ignore[attr-defined]
+                actions=inputs_actions,
                 page=GloblaConfigPages.INPUTS,
             )
     return open_api_object
@@ -381,9 +373,6 @@ def transform(
     global_config: global_config_lib.GlobalConfig,
     app_manifest: app_manifest_lib.AppManifest,
 ) -> OpenAPIObject:
-    content_copy = copy.deepcopy(global_config.content)
-    global_config_dot_notation = json_to_object.DataClasses(json=content_copy)
-
     open_api_object = __create_min_required(global_config)
     open_api_object = __add_info_object_details(
         open_api_object,
@@ -394,6 +383,6 @@ def transform(
     open_api_object.components = oas.ComponentsObject()
     open_api_object = __add_security_scheme_object(open_api_object)
     open_api_object.security = [{"BasicAuth": []}]
-    open_api_object = __add_schemas_object(open_api_object, global_config_dot_notation)
-    open_api_object = __add_paths(open_api_object, global_config_dot_notation)
+    open_api_object = __add_schemas_object(open_api_object, global_config)
+    open_api_object = __add_paths(open_api_object, global_config)
     return open_api_object
@@ -15,7 +15,9 @@
 #
 import os
 import os.path as op
+from typing import Callable, Sequence
 
+from splunk_add_on_ucc_framework import file_writer
 from splunk_add_on_ucc_framework.commands.rest_builder import (
     global_config_builder_schema,
 )
@@ -47,11 +49,21 @@ class _RestBuilderOutput:
             self._content[full_name] = []
         self._content[full_name].append(content)
 
+    def prepend(self, subpath, file_name, content):
+        """Adds `content` to the beginning of the file which was already put."""
+        full_name = op.join(self._root_path, subpath, file_name)
+        contents = self._content[full_name]
+        contents[0] = content + contents[0]
+
     def save(self):
+        bin_path = op.join(self._root_path, self.bin)
         for full_name, contents in list(self._content.items()):
-            full_content = "\n\n".join(contents)
-            with open(full_name, "w") as f:
-                f.writelines(full_content)
+            # Files under bin folder are executable.
+            file_writer.write_file(
+                full_name,
+                "\n\n".join(contents),
+                executable=op.dirname(full_name) == bin_path,
+            )
 
 
 class RestBuilder:
@@ -60,6 +72,7 @@ class RestBuilder:
         schema: global_config_builder_schema.GlobalConfigBuilderSchema,
         output_path: str,
         *args,
+        post_processors: Sequence[Callable[["RestBuilder", object], None]] = (),
         **kwargs
     ):
         """
@@ -68,10 +81,13 @@ class RestBuilder:
         :param schema: RestSchema
         :param output_path:
         :param args:
+        :param post_processors: callables run with the builder and the schema
+            once all files are generated in memory, before they are saved
         :param kwargs:
         """
         self._schema = schema
         self._output_path = output_path
+        self._post_processors = post_processors
         self._args = args
         self._kwargs = kwargs
         self.output = _RestBuilderOutput(
@@ -125,4 +141,12 @@ class RestBuilder:
             "web.conf",
             WebConf.build(self._schema.endpoints),
         )
+        if self._schema.validators:
+            self.output.put(
+                self.output.bin,
+                self._schema.validators.module_name + ".py",
+                self._schema.validators.generate(),
+            )
+        for post_processor in self._post_processors:
+            post_processor(self, self._schema)
         self.output.save()
@@ -18,6 +18,7 @@ from io import StringIO
 __all__ = [
     "RestEntityBuilder",
     "RestEndpointBuilder",
+    "get_validators_module_name",
     "quote_string",
     "indent",
 ]
@@ -50,6 +51,10 @@ field.RestField(
     def name(self):
         return self._name
 
+    @property
+    def has_validators(self) -> bool:
+        return any(field.has_validator for field in self._fields)
+
     @property
     def name_spec(self):
         raise NotImplementedError()
@@ -156,10 +161,20 @@ class RestEndpointBuilder:
         ]
         return "\n\n".join(specs)
 
+    def generate_validators_import(self) -> str:
+        """Imports the shared validators if fields of the endpoint use them."""
+        if any(entity.has_validators for entity in self._entities):
+            return f"import {get_validators_module_name(self._namespace)}\n"
+        return ""
+
     def generate_rh(self) -> str:
         raise NotImplementedError()
 
 
+def get_validators_module_name(namespace: str) -> str:
+    return f"{namespace}_validators"
+
+
 def quote_string(value) -> str:
     """
     Quote a string
@@ -38,6 +38,10 @@ class RestFieldBuilder:
         self._default = default
         self._validator = validator
 
+    @property
+    def has_validator(self) -> bool:
+        return self._validator is not None
+
     def generate_spec(self) -> str:
         return self._kv_template.format(
             name=self._name,
@@ -47,7 +47,7 @@ from splunktaucclib.rest_handler.endpoint import (
 from splunktaucclib.rest_handler import admin_external, util
 from {handler_module} import {handler_class}
 import logging
-
+{validators_import}
 util.remove_http_proxy_env_vars()
 
 {entities}
@@ -77,6 +77,7 @@ if __name__ == '__main__':
         models_lines = ", \n".join(models)
         return self._rh_template.format(
             handler_module=self.rh_module,
+            validators_import=self.generate_validators_import(),
             handler_class=self.rh_class,
             entities="\n".join(entities),
             models=indent(models_lines, 2),
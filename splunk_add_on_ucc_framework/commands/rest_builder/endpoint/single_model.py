@@ -49,7 +49,7 @@ from splunktaucclib.rest_handler.endpoint import (
 from splunktaucclib.rest_handler import admin_external, util
 from {handler_module} import {handler_class}
 import logging
-
+{validators_import}
 util.remove_http_proxy_env_vars()
 
 {entity}
@@ -76,6 +76,7 @@ if __name__ == '__main__':
         entity = self._entities[0]
         return self._rh_template.format(
             handler_module=self.rh_module,
+            validators_import=self.generate_validators_import(),
             handler_class=self.rh_class,
             entity=entity.generate_rh(),
             conf_name=self.conf_name,
@@ -46,7 +46,7 @@ from splunk_add_on_ucc_framework.commands.rest_builder.endpoint.single_model imp
     SingleModelEntityBuilder,
 )
 from splunk_add_on_ucc_framework.commands.rest_builder.validator_builder import (
-    ValidatorBuilder,
+    SharedValidators,
 )
 
 REST_HANDLER_DEFAULT_MODULE = "splunktaucclib.rest_handler.admin_external"
@@ -65,6 +65,7 @@ class GlobalConfigBuilderSchema:
         self._configs_conf_file_names: Set[str] = set()
         self._oauth_conf_file_names: Set[str] = set()
         self._endpoints: Dict[str, RestEndpointBuilder] = {}
+        self._validators = SharedValidators(self.global_config.namespace)
         self._parse_builder_schema()
 
     @property
@@ -87,6 +88,10 @@ class GlobalConfigBuilderSchema:
     def oauth_conf_file_names(self):
         return self._oauth_conf_file_names
 
+    @property
+    def validators(self) -> SharedValidators:
+        return self._validators
+
     @property
     def endpoints(self) -> List[RestEndpointBuilder]:
         return list(self._endpoints.values())
@@ -212,7 +217,7 @@ class GlobalConfigBuilderSchema:
             _is_true(content.get("required")),
             _is_true(content.get("encrypted")),
             content.get("defaultValue"),
-            ValidatorBuilder().build(content.get("validators")),
+            self._validators.add(content.get("validators")),
         )
 
     """
@@ -13,13 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-import os
-import os.path as op
-
-
 class GlobalConfigPostProcessor:
     """
-    Post process for REST builder.
+    Post process for REST builder, works with the generated files in memory
+    before the builder saves them.
     """
 
     output_local = "local"
@@ -46,36 +43,28 @@ sys.path = new_paths
         self.schema = None
         self.import_declare_name = "import_declare_test"
 
-    @property
-    def root_path(self):
-        return getattr(self.builder.output, "_path")
-
     def import_declare_py_name(self):
         if self.import_declare_name:
             return self.import_declare_name
         return f"{self.schema.namespace}_import_declare"
 
     def import_declare_py_content(self):
-        import_declare_file = op.join(
-            self.root_path,
-            self.builder.output.bin,
-            self.import_declare_py_name() + ".py",
-        )
         content = self._import_declare_content.format(
             ta_name=self.schema.product,
         )
-        with open(import_declare_file, "w") as f:
-            f.write(content)
+        self.builder.output.put(
+            self.builder.output.bin,
+            self.import_declare_py_name() + ".py",
+            content,
+        )
 
-    def import_declare(self, rh_file):
-        with open(rh_file) as f:
-            cont = f.readlines()
+    def import_declare(self, rh_file_name):
         import_declare = self._import_declare_template.format(
             import_declare_name=self.import_declare_py_name()
         )
-        cont.insert(0, import_declare)
-        with open(rh_file, "w") as f:
-            f.write("".join(cont))
+        self.builder.output.prepend(
+            self.builder.output.bin, rh_file_name, import_declare
+        )
 
     def __call__(self, builder, schema):
         """
@@ -88,19 +77,4 @@ sys.path = new_paths
 
         self.import_declare_py_content()
         for endpoint in schema.endpoints:
-            rh_file = op.join(
-                getattr(builder.output, "_path"),
-                builder.output.bin,
-                endpoint.rh_name + ".py",
-            )
-            self.import_declare(rh_file)
-
-        # add executable permission to files under bin folder
-        def add_executable_attribute(file_path):
-            if op.isfile(file_path):
-                st = os.stat(file_path)
-                os.chmod(file_path, st.st_mode | 0o111)
-
-        bin_path = op.join(getattr(builder.output, "_path"), builder.output.bin)
-        items = os.listdir(bin_path)
-        list(map(add_executable_attribute, items))
+            self.import_declare(endpoint.rh_name + ".py")
@@ -0,0 +1,99 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Checks of the values of `email`, `ipv4`, `date` and `url` fields. They are
+copied to the generated validators module of the add-on and run by splunkd
+for every create and edit request, so they only use the standard library
+and are linear in the length of the value. Only the source of a check is
+copied, so it imports the modules it needs itself.
+"""
+import inspect
+from typing import Callable
+
+
+def is_email(value):
+    local_part, at, domain = value.partition("@")
+    if not local_part or not at:
+        return False
+    alphanumeric = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    if not set(local_part) <= set(alphanumeric + ".!#$%&'*+/=?^_`{|}~-"):
+        return False
+    if not set(domain) <= set(alphanumeric + "-."):
+        return False
+    for label in domain.split("."):
+        if not 0 < len(label) <= 63 or label[0] == "-" or label[-1] == "-":
+            return False
+    return True
+
+
+def is_ipv4(value):
+    import ipaddress
+
+    try:
+        address = ipaddress.IPv4Address(value)
+    except ValueError:
+        return False
+    # Older Python versions accept octets with leading zeros.
+    return str(address) == value
+
+
+def is_date(value):
+    import datetime
+
+    # `fromisoformat` accepts "Z" only since Python 3.11.
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def is_url(value):
+    import ipaddress
+    from urllib import parse
+
+    if any(char.isspace() for char in value):
+        return False
+    scheme, separator, _ = value.partition("://")
+    if not separator or "/" in scheme:
+        # The scheme is optional.
+        value = "//" + value
+    try:
+        url = parse.urlsplit(value)
+        # Raises ValueError if the port is not a number from 0 to 65535.
+        url.port
+    except ValueError:
+        return False
+    if url.scheme not in ("", "http", "https", "ftp", "opc.tcp") or not url.hostname:
+        return False
+    try:
+        ipaddress.ip_address(url.hostname)
+        return True
+    except ValueError:
+        pass
+    for label in url.hostname.split("."):
+        if not label or label[0] in "-_" or label[-1] in "-_":
+            return False
+        if not label.replace("-", "").replace("_", "").isalnum():
+            return False
+    return True
+
+
+def get_check_source(check: Callable[[str], bool]) -> str:
+    """Returns the source code of the check to copy it to the add-on."""
+    return inspect.getsource(check)
@@ -13,13 +13,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from typing import Any, Dict, Optional, Sequence
+import hashlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from splunk_add_on_ucc_framework.commands.rest_builder import parse_validators
 from splunk_add_on_ucc_framework.commands.rest_builder.endpoint.base import (
+    get_validators_module_name,
     indent,
+    quote_string,
 )
 
 
+# Length of the hash of the validator code in the name of a shared validator.
+_VALIDATOR_NAME_HASH_LENGTH = 8
+
+
 def quote_regex(value) -> str:
     return '"""%s"""' % value
 
@@ -36,7 +44,7 @@ class BaseValidator:
     def _format_arguments(self, **kwargs: Dict[str, Any]) -> str:
         args = list(
             map(
-                lambda k_v: f"{k_v[0]}={k_v[1]}, ",
+                lambda k_v: f"{k_v[0]}={k_v[1]},",
                 list(kwargs.items()),
             )
         )
@@ -82,55 +90,94 @@ class RegexValidator(BaseValidator):
         return {"regex": "r" + quote_regex(config.get("pattern"))}
 
 
-class EmailValidator(BaseValidator):
-    def _get_class_name(self) -> str:
-        return "Pattern"
+class ParseValidator(BaseValidator):
+    """
+    Validator which checks the value with a function from `parse_validators`
+    instead of a regular expression. The function and the validator class
+    are defined in the generated validators module, see `SharedValidators`.
+    """
+
+    _definition_template = """{check}
+
+class {class_name}(validator.Validator):
+    def __init__(self):
+        super().__init__()
+        self.put_msg({message})
+
+    def validate(self, value, data):
+        return {check_name}(value)
+"""
+
+    def _get_check(self) -> Callable[[str], bool]:
+        raise NotImplementedError()
+
+    def _get_message(self) -> str:
+        raise NotImplementedError()
 
     def _get_arguments(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        regex = (
-            r"^[a-zA-Z0-9.!#$%&'*+\/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}"
-            r"[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$"
+        return {}
+
+    def build(self, config: Dict[str, Any]) -> str:
+        return f"{self._get_class_name()}()"
+
+    def get_definition(self) -> Tuple[str, str]:
+        """
+        Returns the name of the validator class and the code defining the
+        class and its check, which is added to the validators module.
+        """
+        check = self._get_check()
+        class_name = self._get_class_name()
+        definition = self._definition_template.format(
+            check=parse_validators.get_check_source(check),
+            class_name=class_name,
+            message=quote_string(self._get_message()),
+            check_name=check.__name__,
         )
-        return {"regex": "r" + quote_regex(regex)}
+        return class_name, definition.strip()
 
 
-class Ipv4Validator(BaseValidator):
+class EmailValidator(ParseValidator):
     def _get_class_name(self) -> str:
-        return "Pattern"
+        return "EmailAddress"
 
-    def _get_arguments(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        regex = r"^(?:(?:[0-1]?\d{1,2}|2[0-4]\d|25[0-5])(?:\.|$)){4}$"
-        return {"regex": "r" + quote_regex(regex)}
+    def _get_check(self) -> Callable[[str], bool]:
+        return parse_validators.is_email
+
+    def _get_message(self) -> str:
+        return "Invalid email address"
 
 
-class DateValidator(BaseValidator):
+class Ipv4Validator(ParseValidator):
     def _get_class_name(self) -> str:
-        return "Pattern"
+        return "Ipv4Address"
 
-    def _get_arguments(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        # iso8601 date time format
-        regex = (
-            r"^\s*((?:[+-]\d{6}|\d{4})-(?:\d\d-\d\d|W\d\d-\d|W\d\d|\d\d\d|\d\d))"
-            r"(?:(T| )(\d\d(?::\d\d(?::\d\d(?:[.,]\d+)?)?)?)([\+\-]\d\d(?::?\d\d)?|\s*Z)?)?$"
-        )
-        return {"regex": "r" + quote_regex(regex)}
+    def _get_check(self) -> Callable[[str], bool]:
+        return parse_validators.is_ipv4
 
+    def _get_message(self) -> str:
+        return "Invalid IPv4 address"
 
-class UrlValidator(BaseValidator):
+
+class DateValidator(ParseValidator):
     def _get_class_name(self) -> str:
-        return "Pattern"
+        return "IsoDate"
 
-    def _get_arguments(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        regex = (
-            r"^(?:(?:https?|ftp|opc\.tcp):\/\/)?(?:\S+(?::\S*)?@)?"
-            r"(?:(?:[1-9]\d?|1\d\d|2[01]\d|22[0-3])"
-            r"(?:\.(?:1?\d{1,2}|2[0-4]\d|25[0-5])){2}"
-            r"(?:\.(?:[1-9]\d?|1\d\d|2[0-4]\d|25[0-4]))|"
-            r"(?:(?:[a-z\u00a1-\uffff0-9]+-?_?)*[a-z\u00a1-\uffff0-9]+)"
-            r"(?:\.(?:[a-z\u00a1-\uffff0-9]+-?)*[a-z\u00a1-\uffff0-9]+)*"
-            r"(?:\.(?:[a-z\u00a1-\uffff]{2,}))?)(?::\d{2,5})?(?:\/[^\s]*)?$"
-        )
-        return {"regex": "r" + quote_regex(regex)}
+    def _get_check(self) -> Callable[[str], bool]:
+        return parse_validators.is_date
+
+    def _get_message(self) -> str:
+        return "Invalid ISO 8601 date"
+
+
+class UrlValidator(ParseValidator):
+    def _get_class_name(self) -> str:
+        return "Url"
+
+    def _get_check(self) -> Callable[[str], bool]:
+        return parse_validators.is_url
+
+    def _get_message(self) -> str:
+        return "Invalid URL"
 
 
 class ValidatorBuilder:
@@ -146,16 +193,16 @@ class ValidatorBuilder:
         # validated in the UI
     }
 
-    def _format_multiple_validators(self, validators: Sequence[str]) -> str:
-        validators_str = ", \n".join(validators)
+    def format_multiple_validators(self, validators: Sequence[str]) -> str:
+        validators_str = ",\n".join(validators)
         return """validator.AllOf(\n{validators}\n)""".format(
             validators=indent(validators_str),
         )
 
-    def build(self, configs: Optional[Sequence[Dict[str, Any]]]) -> Optional[str]:
-        if configs is None:
-            return None
-        generated_validators = []
+    def get_validators(
+        self, configs: Sequence[Dict[str, Any]]
+    ) -> List[Tuple[BaseValidator, Dict[str, Any]]]:
+        validators = []
         for config in configs:
             # `config` variable should always have `type` field according to
             # the schema.
@@ -163,9 +210,89 @@ class ValidatorBuilder:
             validator = self._validation_config_map.get(config_type)
             if validator is None:
                 continue
-            generated_validators.append(validator().build(config))
+            validators.append((validator(), config))
+        return validators
+
+    def build_validators(self, configs: Sequence[Dict[str, Any]]) -> List[str]:
+        return [
+            validator.build(config)
+            for validator, config in self.get_validators(configs)
+        ]
+
+    def build(self, configs: Optional[Sequence[Dict[str, Any]]]) -> Optional[str]:
+        if configs is None:
+            return None
+        generated_validators = self.build_validators(configs)
         if not generated_validators:
             return None
         if len(generated_validators) > 1:
-            return self._format_multiple_validators(generated_validators)
+            return self.format_multiple_validators(generated_validators)
         return generated_validators[0]
+
+
+class SharedValidators:
+    """
+    Validators of the fields of all REST handlers. Every distinct validator
+    is generated once, in the `<namespace>_validators` module, and REST
+    handlers reference it by name, so its regular expression is compiled
+    once per process. Names are derived from the code of the validator, so
+    adding or removing a field does not change the other names and the REST
+    handlers which use them.
+
+    Sharing validator objects is safe: a field reads the message a validator
+    puts with `put_msg` right after calling its `validate`, and a REST
+    handler process handles one request at a time. The validators of the
+    REST handlers were module level objects before too.
+    """
+
+    _import = "from splunktaucclib.rest_handler.endpoint import validator"
+
+    def __init__(self, namespace: str):
+        self.module_name = get_validators_module_name(namespace)
+        self._definitions: Dict[str, str] = {}
+        self._validators: Dict[str, str] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._validators)
+
+    def _add(self, validator: str) -> str:
+        if validator not in self._validators:
+            digest = hashlib.sha256(validator.encode("utf-8")).hexdigest()
+            names = set(self._validators.values())
+            length = _VALIDATOR_NAME_HASH_LENGTH
+            # Validators with the same hash prefix get longer names.
+            while f"validator_{digest[:length]}" in names:
+                length += 1
+            self._validators[validator] = f"validator_{digest[:length]}"
+        return self._validators[validator]
+
+    def add(self, configs: Optional[Sequence[Dict[str, Any]]]) -> Optional[str]:
+        """
+        Adds validators of the field to the module, returns the expression
+        the REST handler references them with.
+        """
+        if configs is None:
+            return None
+        builder = ValidatorBuilder()
+        validators = builder.get_validators(configs)
+        for validator, _ in validators:
+            if isinstance(validator, ParseValidator):
+                class_name, definition = validator.get_definition()
+                self._definitions.setdefault(class_name, definition)
+        names = [self._add(validator.build(config)) for validator, config in validators]
+        if not names:
+            return None
+        if len(names) > 1:
+            name = self._add(builder.format_multiple_validators(names))
+        else:
+            name = names[0]
+        return f"{self.module_name}.{name}"
+
+    def generate(self) -> str:
+        validators = [
+            f"{name} = {validator}" for validator, name in self._validators.items()
+        ]
+        # Top-level definitions are separated by two blank lines, as in any
+        # other Python module.
+        blocks = [self._import, *self._definitions.values(), "\n\n".join(validators)]
+        return "\n\n\n".join(blocks) + "\n"
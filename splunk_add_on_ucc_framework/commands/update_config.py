@@ -0,0 +1,51 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import os
+import sys
+from typing import Optional
+
+from splunk_add_on_ucc_framework import global_config as global_config_lib
+from splunk_add_on_ucc_framework import global_config_update
+
+logger = logging.getLogger("ucc_gen")
+
+
+def update_config(
+    source: str,
+    config_path: Optional[str] = None,
+    dry_run: bool = False,
+) -> None:
+    config_path, is_global_config_yaml = global_config_lib.get_global_config_path(
+        source, config_path
+    )
+    if not os.path.isfile(config_path):
+        logger.error(f"Could not find globalConfig file @ {config_path}")
+        sys.exit(1)
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(config_path, is_global_config_yaml)
+    migrations = global_config_update.handle_global_config_update(
+        global_config, dry_run=dry_run
+    )
+    if not migrations:
+        logger.info("globalConfig file is already at the latest schema version")
+    elif dry_run:
+        logger.info(
+            f"{len(migrations)} updates would be applied, {config_path} was not "
+            f"changed"
+        )
+    elif global_config.save():
+        logger.info(f"Saved {config_path}")
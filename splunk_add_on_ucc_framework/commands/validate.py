@@ -0,0 +1,148 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+import logging
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+from splunk_add_on_ucc_framework import app_manifest as app_manifest_lib
+from splunk_add_on_ucc_framework import global_config as global_config_lib
+from splunk_add_on_ucc_framework import global_config_update
+from splunk_add_on_ucc_framework import global_config_validator
+
+logger = logging.getLogger("ucc_gen")
+
+OUTPUT_FORMAT_TEXT = "text"
+OUTPUT_FORMAT_JSON = "json"
+
+internal_root_dir = os.path.dirname(os.path.dirname(__file__))
+
+
+def _get_diagnostic(file_path: str, path: str, message: str) -> Dict[str, str]:
+    return {"file": file_path, "path": path, "message": message}
+
+
+def _get_location(diagnostic: Dict[str, str]) -> str:
+    path = diagnostic["path"]
+    return diagnostic["file"] + (f" @ {path}" if path else "")
+
+
+def _validate_app_manifest(source: str) -> List[Dict[str, str]]:
+    app_manifest_path = os.path.abspath(
+        os.path.join(source, app_manifest_lib.APP_MANIFEST_FILE_NAME)
+    )
+    try:
+        with open(app_manifest_path) as manifest_file:
+            app_manifest_content = manifest_file.read()
+    except OSError as e:
+        return [_get_diagnostic(app_manifest_path, "", f"Could not read file: {e}")]
+    app_manifest = app_manifest_lib.AppManifest()
+    try:
+        app_manifest.read(app_manifest_content)
+        app_manifest.get_addon_name()
+    except app_manifest_lib.AppManifestFormatException:
+        return [
+            _get_diagnostic(
+                app_manifest_path,
+                "",
+                f"Manifest file has invalid format, please refer to "
+                f"{app_manifest_lib.APP_MANIFEST_WEBSITE}",
+            )
+        ]
+    except (KeyError, TypeError):
+        return [
+            _get_diagnostic(app_manifest_path, "/info/id/name", "Missing add-on name")
+        ]
+    return []
+
+
+def get_diagnostics(source: str, config_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Validates app.manifest and globalConfig file of the add-on and returns
+    found errors and warnings together with globalConfig updates which would
+    be applied by the build. Nothing is written.
+
+    Args:
+        source: Folder containing the app.manifest and app source.
+        config_path: Path to the globalConfig file provided by user.
+    """
+    errors = _validate_app_manifest(source)
+    config_path, is_global_config_yaml = global_config_lib.get_global_config_path(
+        source, config_path
+    )
+    warnings: List[Dict[str, str]] = []
+    migrations: List[global_config_update.Migration] = []
+    if os.path.isfile(config_path):
+        global_config = global_config_lib.GlobalConfig()
+        try:
+            global_config.parse(config_path, is_global_config_yaml)
+        except (ValueError, yaml.YAMLError) as e:
+            errors.append(_get_diagnostic(config_path, "", f"Could not parse: {e}"))
+        else:
+            validator = global_config_validator.GlobalConfigValidator(
+                internal_root_dir, global_config
+            )
+            for error in validator.get_errors():
+                errors.append(_get_diagnostic(config_path, error.path, error.message))
+            for warning in validator.warnings:
+                warnings.append(
+                    _get_diagnostic(config_path, warning.path, warning.message)
+                )
+            if not errors:
+                migrations = global_config_update.handle_global_config_update(
+                    global_config, dry_run=True
+                )
+    else:
+        config_path = None
+    return {
+        "valid": not errors,
+        "config": config_path,
+        "errors": errors,
+        "warnings": warnings,
+        "pending_updates": [
+            {
+                "schema_version": migration.schema_version,
+                "description": migration.description,
+            }
+            for migration in migrations
+        ],
+    }
+
+
+def validate(
+    source: str,
+    config_path: Optional[str] = None,
+    output_format: str = OUTPUT_FORMAT_TEXT,
+) -> None:
+    """
+    Validates the add-on without building it, exits with 1 if it is not
+    valid. Diagnostics are printed as JSON if `output_format` is `json`.
+    """
+    diagnostics = get_diagnostics(source, config_path)
+    if output_format == OUTPUT_FORMAT_JSON:
+        print(json.dumps(diagnostics, indent=4))
+    else:
+        for error in diagnostics["errors"]:
+            logger.error(f"{_get_location(error)}: {error['message']}")
+        for warning in diagnostics["warnings"]:
+            logger.warning(f"{_get_location(warning)}: {warning['message']}")
+        if diagnostics["valid"]:
+            logger.info("Add-on is valid")
+    if not diagnostics["valid"]:
+        sys.exit(1)
@@ -0,0 +1,363 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import functools
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from splunk_add_on_ucc_framework import __version__
+from splunk_add_on_ucc_framework import build_manifest as build_manifest_lib
+from splunk_add_on_ucc_framework import global_config as global_config_lib
+from splunk_add_on_ucc_framework import materializer as materializer_lib
+from splunk_add_on_ucc_framework import output_tree as output_tree_lib
+from splunk_add_on_ucc_framework import template_env
+from splunk_add_on_ucc_framework.commands import build
+from splunk_add_on_ucc_framework.commands.rest_builder import (
+    global_config_builder_schema,
+    global_config_post_processor,
+)
+from splunk_add_on_ucc_framework.commands.rest_builder.builder import RestBuilder
+
+logger = logging.getLogger("ucc_gen")
+
+# How often (in seconds) watched files are checked for changes.
+WATCH_INTERVAL = 0.5
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def _add_to_snapshot(path: str, snapshot: Snapshot) -> None:
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    _add_to_snapshot(entry.path, snapshot)
+                else:
+                    entry_stat = entry.stat()
+                    snapshot[entry.path] = (entry_stat.st_mtime_ns, entry_stat.st_size)
+    except NotADirectoryError:
+        path_stat = os.stat(path)
+        snapshot[path] = (path_stat.st_mtime_ns, path_stat.st_size)
+    except FileNotFoundError:
+        pass
+
+
+def take_snapshot(paths: Sequence[str]) -> Snapshot:
+    """
+    Returns modification time and size of every file under `paths`, paths
+    which do not exist are skipped.
+    """
+    snapshot: Snapshot = {}
+    for path in paths:
+        _add_to_snapshot(path, snapshot)
+    return snapshot
+
+
+def get_changed_paths(previous: Snapshot, current: Snapshot) -> Set[str]:
+    """Returns files which were added, removed or changed."""
+    changed = set(previous.keys() ^ current.keys())
+    for path in previous.keys() & current.keys():
+        if previous[path] != current[path]:
+            changed.add(path)
+    return changed
+
+
+def _get_layout_signature(
+    global_config: global_config_lib.GlobalConfig, conf_file_names: List[str]
+) -> str:
+    """
+    Returns signature of the parts of globalConfig every generated file
+    except the REST handlers, their configuration and OpenAPI file depends
+    on. Add-on is fully rebuilt if the signature changes.
+    """
+    layout: Dict[str, Any] = {
+        "conf_file_names": conf_file_names,
+        "inputs": global_config.inputs,
+        "alerts": global_config.alerts,
+        "namespace": global_config.namespace,
+        "version": global_config.version,
+        "oauth": global_config.has_oauth(),
+    }
+    return json.dumps(layout, sort_keys=True)
+
+
+class WatchSession:
+    """
+    Keeps the state of the add-on build between the rebuilds. Changes to the
+    globalConfig file which only affect REST handlers, their configuration
+    and OpenAPI file regenerate only those files, add-on is incrementally
+    rebuilt for any other change.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        config_path: Optional[str] = None,
+        addon_version: Optional[str] = None,
+        output_directory: Optional[str] = None,
+        **build_options: Any,
+    ):
+        self._source = source
+        (
+            self._config_path,
+            self._is_global_config_yaml,
+        ) = global_config_lib.get_global_config_path(source, config_path)
+        # Version is resolved once, so rebuilds do not need to run git.
+        self._addon_version = build._get_addon_version(addon_version)
+        self._output_directory = output_directory or os.path.join(os.getcwd(), "output")
+        self._build_options = build_options
+        self._layout_signature: Optional[str] = None
+        addon_root = os.path.abspath(os.path.join(source, build.PARENT_DIR))
+        self.watched_paths = [
+            os.path.abspath(source),
+            os.path.abspath(self._config_path),
+            os.path.join(addon_root, ".uccignore"),
+            os.path.join(addon_root, "LICENSES"),
+            os.path.join(addon_root, "additional_packaging.py"),
+        ]
+
+    @property
+    def config_path(self) -> str:
+        return self._config_path
+
+    def _load_global_config(
+        self,
+    ) -> Tuple[
+        global_config_lib.GlobalConfig,
+        global_config_builder_schema.GlobalConfigBuilderSchema,
+    ]:
+        global_config = global_config_lib.GlobalConfig()
+        global_config.parse(self._config_path, self._is_global_config_yaml)
+        build._validate_global_config(global_config)
+        build._update_global_config(global_config, self._addon_version)
+        scheme = global_config_builder_schema.GlobalConfigBuilderSchema(
+            global_config, template_env.get_environment()
+        )
+        return global_config, scheme
+
+    def build(self) -> None:
+        """Incrementally rebuilds the whole add-on."""
+        build.generate(
+            source=self._source,
+            config_path=self._config_path,
+            addon_version=self._addon_version,
+            output_directory=self._output_directory,
+            incremental=True,
+            **self._build_options,
+        )
+        self._layout_signature = None
+        if os.path.isfile(self._config_path):
+            global_config = global_config_lib.GlobalConfig()
+            global_config.parse(self._config_path, self._is_global_config_yaml)
+            scheme = global_config_builder_schema.GlobalConfigBuilderSchema(
+                global_config, template_env.get_environment()
+            )
+            self._layout_signature = _get_layout_signature(
+                global_config, build._get_conf_file_names(scheme)
+            )
+
+    def _is_generated_file_kept(self, path: str, ignore_list: Sequence[str]) -> bool:
+        if os.path.isfile(os.path.join(self._source, path)):
+            # The file is overridden by the package.
+            return False
+        for ignored_path in ignore_list:
+            if path == ignored_path or path.startswith(ignored_path + os.sep):
+                return False
+        return True
+
+    def _regenerate_rest_handlers(
+        self,
+        global_config: global_config_lib.GlobalConfig,
+        scheme: global_config_builder_schema.GlobalConfigBuilderSchema,
+    ) -> int:
+        """
+        Regenerates REST handlers, their configuration, globalConfig copy and
+        OpenAPI file. Only files which content changed are written. Returns
+        the number of written files.
+        """
+        app_manifest = build._read_app_manifest(self._source)
+        ta_name = app_manifest.get_addon_name()
+        app_manifest.update_addon_version(self._addon_version)
+        addon_output_dir = os.path.join(self._output_directory, ta_name)
+        ignore_list = build._get_ignore_list(
+            os.path.abspath(os.path.join(self._source, build.PARENT_DIR, ".uccignore"))
+        )
+        materializer = materializer_lib.CopyMaterializer()
+        with tempfile.TemporaryDirectory() as rest_output_dir:
+            rest_builder = RestBuilder(
+                scheme,
+                rest_output_dir,
+                post_processors=(
+                    global_config_post_processor.GlobalConfigPostProcessor(),
+                ),
+            )
+            rest_builder.build()
+            for root, _, file_names in os.walk(rest_output_dir):
+                for file_name in file_names:
+                    src = os.path.join(root, file_name)
+                    path = os.path.relpath(src, rest_output_dir)
+                    if self._is_generated_file_kept(path, ignore_list):
+                        dest = os.path.join(addon_output_dir, path)
+                        os.makedirs(os.path.dirname(dest), exist_ok=True)
+                        materializer.materialize(src, dest)
+        global_config_file = os.path.join(
+            "appserver",
+            "static",
+            "js",
+            "build",
+            os.path.basename(self._config_path),
+        )
+        if self._is_generated_file_kept(global_config_file, ignore_list):
+            with open(self._config_path) as f:
+                materializer.materialize_content(
+                    f.read(), os.path.join(addon_output_dir, global_config_file)
+                )
+        compile_optimization = self._get_compile_optimization()
+        if compile_optimization is not None:
+            # Only the bytecode of changed REST handlers is written again.
+            build._compile_bytecode(
+                ta_name,
+                output_tree_lib.OutputTree(),
+                self._output_directory,
+                self._build_options.get("python_binary_name", "python3"),
+                compile_optimization,
+            )
+        build._generate_openapi(
+            ta_name, global_config, app_manifest, self._output_directory
+        )
+        return materializer.materialized
+
+    def _get_compile_optimization(self) -> Optional[int]:
+        if not self._build_options.get("compile_bytecode", False):
+            return None
+        return self._build_options.get("compile_optimization", 0)
+
+    def _write_build_manifest(self) -> None:
+        manifest_path = os.path.join(
+            self._output_directory, build_manifest_lib.BUILD_MANIFEST_FILE_NAME
+        )
+        previous_manifest = build_manifest_lib.read_build_manifest(manifest_path)
+        if previous_manifest is None:
+            return
+        build_manifest = build_manifest_lib.BuildManifest.from_build_inputs(
+            ucc_gen_version=__version__,
+            addon_version=self._addon_version,
+            python_binary_name=self._build_options.get("python_binary_name", "python3"),
+            source=self._source,
+            config_path=self._config_path,
+            strip_libraries=self._build_options.get("strip_libraries", False),
+            compile_optimization=self._get_compile_optimization(),
+        )
+        # Regenerated files no longer match the recorded outputs of their
+        # stages, so the next build reruns them. New files are recorded, so
+        # the next build removes them if they are not produced anymore.
+        ta_name = build._read_app_manifest(self._source).get_addon_name()
+        build_manifest.record_outputs(
+            previous_manifest.outputs,
+            set(previous_manifest.files)
+            | set(
+                build_manifest_lib.list_output_files(self._output_directory, ta_name)
+            ),
+        )
+        build_manifest.write(manifest_path)
+
+    def rebuild(self, changed_paths: Set[str]) -> None:
+        """
+        Rebuilds the add-on after `changed_paths` were changed. Only REST
+        handlers, their configuration, globalConfig copy and OpenAPI file are
+        regenerated if only the globalConfig file changed and the change does
+        not affect any other generated file.
+        """
+        if (
+            changed_paths != {os.path.abspath(self._config_path)}
+            or self._layout_signature is None
+            or build._has_additional_packaging(self._source)
+        ):
+            self.build()
+            return
+        global_config, scheme = self._load_global_config()
+        layout_signature = _get_layout_signature(
+            global_config, build._get_conf_file_names(scheme)
+        )
+        if layout_signature != self._layout_signature:
+            logger.info("globalConfig change affects the whole add-on")
+            self.build()
+            return
+        written = self._regenerate_rest_handlers(global_config, scheme)
+        self._write_build_manifest()
+        logger.info(f"Regenerated REST handlers, {written} files changed")
+
+
+def _run_build(build_func: Callable[[], None]) -> bool:
+    """
+    Runs the build, returns False if it failed. Failures are logged, so
+    watching can continue until the next change fixes the add-on.
+    """
+    try:
+        build_func()
+    except SystemExit:
+        # Error is already logged by the build.
+        logger.error("Build failed, waiting for changes")
+        return False
+    except Exception:
+        logger.exception("Build failed, waiting for changes")
+        return False
+    return True
+
+
+def watch(
+    source: str,
+    config_path: Optional[str] = None,
+    addon_version: Optional[str] = None,
+    output_directory: Optional[str] = None,
+    interval: float = WATCH_INTERVAL,
+    **build_options: Any,
+) -> None:
+    """
+    Builds the add-on and rebuilds it every time the globalConfig file,
+    package folder, `.uccignore`, `LICENSES` or `additional_packaging.py`
+    change until interrupted. Files are polled for changes every `interval`
+    seconds.
+    """
+    if build_options.get("archive"):
+        logger.error("Watch mode can't be used together with the archive")
+        sys.exit(1)
+    session = WatchSession(
+        source, config_path, addon_version, output_directory, **build_options
+    )
+    _run_build(session.build)
+    snapshot = take_snapshot(session.watched_paths)
+    logger.info(f"Watching for changes of {source} and {session.config_path}")
+    try:
+        while True:
+            time.sleep(interval)
+            current_snapshot = take_snapshot(session.watched_paths)
+            changed_paths = get_changed_paths(snapshot, current_snapshot)
+            if not changed_paths:
+                continue
+            logger.info(f"Detected changes in {sorted(changed_paths)}")
+            start = time.perf_counter()
+            if _run_build(functools.partial(session.rebuild, changed_paths)):
+                logger.info(f"Rebuilt the add-on in {time.perf_counter() - start:.2f}s")
+            # globalConfig file can be saved during the build, so the
+            # snapshot is taken after it.
+            snapshot = take_snapshot(session.watched_paths)
+    except KeyboardInterrupt:
+        logger.info("Stopped watching for changes")
@@ -0,0 +1,197 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import contextlib
+import hashlib
+import os
+import threading
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple, Union
+
+# Permissions new files are created with, the process umask is applied to
+# them by the operating system the same way `open` does.
+NEW_FILE_MODE = 0o666
+EXECUTABLE_FILE_MODE = 0o777
+_TEMP_FILE_ATTEMPTS = 100
+
+
+def _add_execute_bits(mode: int) -> int:
+    # Everyone who can read the file can execute it.
+    return mode | (mode & 0o444) >> 2
+
+
+def _create_temp_file(path: str, mode: int) -> Tuple[int, str]:
+    directory = os.path.dirname(path) or os.curdir
+    prefix = f".{os.path.basename(path)}."
+    for _ in range(_TEMP_FILE_ATTEMPTS):
+        tmp_path = os.path.join(directory, f"{prefix}{os.urandom(6).hex()}.tmp")
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+        except FileExistsError:
+            continue
+        return fd, tmp_path
+    raise FileExistsError(f"Could not create a temporary file for {path}")
+
+
+def replace_file(path: str, data: bytes, executable: bool = False) -> None:
+    """
+    Atomically replaces the file with `data`: it is written to a temporary
+    file in the same folder which is then renamed over `path`. Readers see
+    either the old or the new content, and other hard links to the old file
+    are not changed. Permissions of the existing file are kept, a new file
+    gets the permissions `open` would create it with. If `executable` is
+    True, the file is executable by everyone who can read it.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except OSError:
+        mode = None
+    fd, tmp_path = _create_temp_file(
+        path, EXECUTABLE_FILE_MODE if executable else NEW_FILE_MODE
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if mode is not None:
+            os.chmod(tmp_path, _add_execute_bits(mode) if executable else mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _encode(content: Union[str, bytes]) -> bytes:
+    if isinstance(content, str):
+        # Files are written the same way `open(path, "w")` does on POSIX.
+        return content.encode()
+    return content
+
+
+class FileWriter:
+    """
+    Writes generated files. Files which already have the same content are
+    not written, so their modification time does not change, other files
+    are replaced atomically. Counts written and skipped files and the number
+    of written bytes, remembers every file it wrote or found up to date.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._written_paths: Set[str] = set()
+        self._overridden_paths: Set[str] = set()
+        self.files_written = 0
+        self.bytes_written = 0
+        self.files_skipped = 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._written_paths = set()
+            self._overridden_paths = set()
+            self.files_written = 0
+            self.bytes_written = 0
+            self.files_skipped = 0
+
+    @property
+    def written_paths(self) -> Set[str]:
+        """Absolute paths of the files written since the last reset."""
+        with self._lock:
+            return set(self._written_paths)
+
+    def set_overridden_paths(self, paths: Iterable[str]) -> None:
+        """
+        Files at `paths` are replaced by other files later in the build, so
+        they are not written until the next reset.
+        """
+        with self._lock:
+            self._overridden_paths = {os.path.abspath(path) for path in paths}
+
+    def is_written(self, path: str) -> bool:
+        """Returns True if the file was written since the last reset."""
+        with self._lock:
+            return os.path.abspath(path) in self._written_paths
+
+    @contextlib.contextmanager
+    def record_outputs(self) -> Iterator[Dict[str, Optional[str]]]:
+        """
+        Collects sha256 of the files written by the current thread while the
+        context is active by their absolute paths. Overridden files are
+        collected with None.
+        """
+        previous = getattr(self._local, "outputs", None)
+        self._local.outputs = {}
+        try:
+            yield self._local.outputs
+        finally:
+            self._local.outputs = previous
+
+    def _add_written_path(self, path: str, data: bytes) -> None:
+        path = os.path.abspath(path)
+        with self._lock:
+            self._written_paths.add(path)
+        recorded = getattr(self._local, "outputs", None)
+        if recorded is not None:
+            recorded[path] = hashlib.sha256(data).hexdigest()
+
+    def write(
+        self, path: str, content: Union[str, bytes], executable: bool = False
+    ) -> bool:
+        """
+        Writes `content` to `path`, returns False if it is up to date. The
+        file is made executable if `executable` is True, see `replace_file`.
+        """
+        with self._lock:
+            is_overridden = os.path.abspath(path) in self._overridden_paths
+        if is_overridden:
+            recorded = getattr(self._local, "outputs", None)
+            if recorded is not None:
+                recorded[os.path.abspath(path)] = None
+            return False
+        data = _encode(content)
+        try:
+            path_stat = os.stat(path)
+            if path_stat.st_size == len(data):
+                with open(path, "rb") as f:
+                    up_to_date = f.read() == data
+            else:
+                up_to_date = False
+        except OSError:
+            up_to_date = False
+        if up_to_date:
+            mode = path_stat.st_mode & 0o7777
+            if executable and _add_execute_bits(mode) != mode:
+                os.chmod(path, _add_execute_bits(mode))
+            with self._lock:
+                self.files_skipped += 1
+            self._add_written_path(path, data)
+            return False
+        replace_file(path, data, executable)
+        self._add_written_path(path, data)
+        with self._lock:
+            self.files_written += 1
+            self.bytes_written += len(data)
+        return True
+
+
+_writer = FileWriter()
+
+
+def get_writer() -> FileWriter:
+    """Returns the writer every generated file is written with."""
+    return _writer
+
+
+def write_file(path: str, content: Union[str, bytes], executable: bool = False) -> bool:
+    """Writes the generated file with the shared writer, see `FileWriter`."""
+    return _writer.write(path, content, executable)
@@ -14,31 +14,262 @@
 # limitations under the License.
 #
 import functools
+import hashlib
 import json
-from typing import Optional
+import logging
+import os
+import pickle
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+from splunk_add_on_ucc_framework import __version__
+from splunk_add_on_ucc_framework import file_writer
 from splunk_add_on_ucc_framework import utils
 
+logger = logging.getLogger("ucc_gen")
+
 Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 yaml_load = functools.partial(yaml.load, Loader=Loader)
 
+PARENT_DIR = ".."
+
+# Change to invalidate parsed YAML configs cached by the previous versions.
+PARSED_CONFIG_CACHE_VERSION = "2"
+
+
+def get_parsed_config_cache_dir() -> str:
+    return os.path.join(utils.get_cache_dir(), "configs")
+
+
+def _get_parsed_config_cache_key(config_raw: str) -> str:
+    # Parsed config depends on the YAML parser, pickled objects may depend
+    # on the ucc-gen version.
+    return hashlib.sha256(
+        "\0".join(
+            (
+                PARSED_CONFIG_CACHE_VERSION,
+                __version__,
+                yaml.__version__,
+                Loader.__name__,
+                config_raw,
+            )
+        ).encode()
+    ).hexdigest()
+
+
+def get_global_config_path(source: str, config_path: Optional[str]) -> Tuple[str, bool]:
+    """
+    Returns path to the globalConfig file and whether it is a YAML file.
+    globalConfig.json in the parent directory of the source is used by
+    default, globalConfig.yaml is used if there is no JSON file.
+
+    Args:
+        source: Folder containing the app.manifest and app source.
+        config_path: Path to the globalConfig file provided by user.
+    """
+    if config_path:
+        return config_path, config_path.endswith(".yaml")
+    config_path = os.path.abspath(os.path.join(source, PARENT_DIR, "globalConfig.json"))
+    if os.path.isfile(config_path):
+        return config_path, False
+    return (
+        os.path.abspath(os.path.join(source, PARENT_DIR, "globalConfig.yaml")),
+        True,
+    )
+
+
+def cache_parsed_config(path: str, config_raw: str, content: Any) -> None:
+    """Caches `content` parsed from `config_raw` read from `path`."""
+    key = _get_parsed_config_cache_key(config_raw)
+    try:
+        os.makedirs(get_parsed_config_cache_dir(), exist_ok=True)
+        file_writer.replace_file(
+            os.path.join(get_parsed_config_cache_dir(), key),
+            key.encode() + b"\n" + pickle.dumps(content, pickle.HIGHEST_PROTOCOL),
+        )
+    except OSError as e:
+        logger.debug(f"Could not cache parsed config {path}: {e}")
+
+
+def load_yaml_config(config_raw: str, path: str) -> Any:
+    """
+    Parses YAML config. Parsed config is cached in pickle format under the
+    hash of the config, the ucc-gen version and the PyYAML version, so it is
+    parsed again only after one of them changes. The file starts with that
+    hash, which is checked before the pickle is loaded. Parsing YAML is much
+    slower than loading the pickle, even with libyaml.
+    """
+    key = _get_parsed_config_cache_key(config_raw)
+    try:
+        with open(os.path.join(get_parsed_config_cache_dir(), key), "rb") as f:
+            cached_key, _, cached = f.read().partition(b"\n")
+        if cached_key == key.encode():
+            return pickle.loads(cached)
+    except Exception:
+        # Missing or broken cache, the config is parsed.
+        pass
+    content = yaml_load(config_raw)
+    cache_parsed_config(path, config_raw, content)
+    return content
+
+
+def wrap(value: Any) -> Any:
+    """Wraps objects of globalConfig into nodes, lists are wrapped element-wise."""
+    if isinstance(value, dict):
+        return ConfigNode(value)
+    if isinstance(value, list):
+        return [wrap(v) for v in value]
+    return value
+
+
+class ConfigNode:
+    """
+    Read-only view of an object of globalConfig. Keys of the object are
+    available as attributes, nested objects are wrapped on access, nothing
+    is copied.
+    """
+
+    __slots__ = ("_element",)
+
+    def __init__(self, element: Dict[str, Any]):
+        self._element = element
+
+    @property
+    def element(self) -> Dict[str, Any]:
+        return self._element
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._element.get(key, default)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "_element":
+            raise AttributeError(name)
+        try:
+            return wrap(self._element[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class Entity(ConfigNode):
+    __slots__ = ()
+
+    @property
+    def is_oauth(self) -> bool:
+        return self._element.get("type") == "oauth"
+
+
+class _EntitiesNode(ConfigNode):
+    """Node with entities, which are indexed by their fields."""
+
+    __slots__ = ("_entities", "_entities_by_field")
+
+    def __init__(self, element: Dict[str, Any]):
+        super().__init__(element)
+        self._entities = [
+            Entity(entity)
+            for entity in element.get("entity", [])
+            if isinstance(entity, dict)
+        ]
+        self._entities_by_field: Dict[str, Entity] = {}
+        for entity in self._entities:
+            field = entity.get("field")
+            if field is not None:
+                self._entities_by_field.setdefault(field, entity)
+
+    @property
+    def name(self) -> str:
+        return self._element["name"]
+
+    @property
+    def entities(self) -> List[Entity]:
+        return self._entities
+
+    @property
+    def entities_by_field(self) -> Dict[str, Entity]:
+        return self._entities_by_field
+
+    @property
+    def has_oauth(self) -> bool:
+        return any(entity.is_oauth for entity in self._entities)
+
+
+class Tab(_EntitiesNode):
+    __slots__ = ()
+
+    @property
+    def is_table(self) -> bool:
+        return "table" in self._element
+
+
+class Service(_EntitiesNode):
+    __slots__ = ()
+
+
+def _index_by_name(nodes: List[Any]) -> Dict[str, Any]:
+    by_name: Dict[str, Any] = {}
+    for node in nodes:
+        name = node.get("name")
+        if name is not None:
+            by_name.setdefault(name, node)
+    return by_name
+
+
+class _Index:
+    """Nodes of globalConfig built once and shared by every consumer."""
+
+    __slots__ = (
+        "tabs",
+        "tabs_by_name",
+        "settings",
+        "configs",
+        "services",
+        "services_by_name",
+    )
+
+    def __init__(self, content: Dict[str, Any]):
+        pages = content["pages"]
+        self.tabs = [
+            Tab(tab) for tab in pages["configuration"]["tabs"] if isinstance(tab, dict)
+        ]
+        self.tabs_by_name: Dict[str, Tab] = _index_by_name(self.tabs)
+        self.settings = [tab.element for tab in self.tabs if not tab.is_table]
+        self.configs = [tab.element for tab in self.tabs if tab.is_table]
+        services = pages["inputs"]["services"] if "inputs" in pages else []
+        self.services = [
+            Service(service) for service in services if isinstance(service, dict)
+        ]
+        self.services_by_name: Dict[str, Service] = _index_by_name(self.services)
+
 
 class GlobalConfig:
     def __init__(self):
         self._content = None
         self._is_global_config_yaml = None
         self._original_path = None
+        self._original_raw = None
+        self._index: Optional[_Index] = None
+
+    def _load(self, config_raw: str, path: str) -> Any:
+        if self._is_global_config_yaml:
+            return load_yaml_config(config_raw, path)
+        return json.loads(config_raw)
 
     def parse(self, global_config_path: str, is_global_config_yaml: bool) -> None:
         with open(global_config_path) as f_config:
             config_raw = f_config.read()
-        self._content = (
-            yaml_load(config_raw) if is_global_config_yaml else json.loads(config_raw)
-        )
         self._is_global_config_yaml = is_global_config_yaml
+        self._content = self._load(config_raw, global_config_path)
+        self._original_raw = config_raw
         self._original_path = global_config_path
+        self._index = None
+
+    def _get_index(self) -> _Index:
+        # The index is built on the first use, after globalConfig is updated
+        # to the latest schema version.
+        if self._index is None:
+            self._index = _Index(self._content)
+        return self._index
 
     def dump(self, path: str):
         if self._is_global_config_yaml:
@@ -46,6 +277,21 @@ class GlobalConfig:
         else:
             utils.dump_json_config(self._content, path)
 
+    def save(self) -> bool:
+        """
+        Writes globalConfig back to the file it was parsed from, only if its
+        content was changed since. Returns True if the file was written.
+        """
+        if self._content == self._load(self._original_raw, self._original_path):
+            return False
+        self.dump(self._original_path)
+        with open(self._original_path) as f_config:
+            self._original_raw = f_config.read()
+        if self._is_global_config_yaml:
+            # The next run does not need to parse the saved config.
+            cache_parsed_config(self._original_path, self._original_raw, self._content)
+        return True
+
     @property
     def content(self):
         return self._content
@@ -62,19 +308,27 @@ class GlobalConfig:
 
     @property
     def settings(self):
-        settings = []
-        for tab in self.tabs:
-            if "table" not in tab:
-                settings.append(tab)
-        return settings
+        return self._get_index().settings
 
     @property
     def configs(self):
-        configs = []
-        for tab in self.tabs:
-            if "table" in tab:
-                configs.append(tab)
-        return configs
+        return self._get_index().configs
+
+    @property
+    def configuration_tabs(self) -> List[Tab]:
+        return self._get_index().tabs
+
+    @property
+    def tabs_by_name(self) -> Dict[str, Tab]:
+        return self._get_index().tabs_by_name
+
+    @property
+    def services(self) -> List[Service]:
+        return self._get_index().services
+
+    @property
+    def services_by_name(self) -> Dict[str, Service]:
+        return self._get_index().services_by_name
 
     @property
     def alerts(self):
@@ -110,6 +364,8 @@ class GlobalConfig:
 
     def update_schema_version(self, new_schema_version):
         self.meta["schemaVersion"] = new_schema_version
+        # globalConfig was changed by the update.
+        self._index = None
 
     def update_addon_version(self, version: str) -> None:
         self._content.setdefault("meta", {})["version"] = version
@@ -119,3 +375,8 @@ class GlobalConfig:
 
     def has_alerts(self) -> bool:
         return bool(self.alerts)
+
+    def has_oauth(self) -> bool:
+        """Returns True if OAuth is configured in the account tab."""
+        account_tab = self.tabs_by_name.get("account")
+        return account_tab is not None and account_tab.has_oauth
@@ -14,6 +14,8 @@
 # limitations under the License.
 #
 import logging
+from dataclasses import dataclass
+from typing import Callable, List
 
 from splunk_add_on_ucc_framework import global_config as global_config_lib
 
@@ -63,78 +65,131 @@ def _handle_dropping_api_version_update(global_config: global_config_lib.GlobalC
     global_config.update_schema_version("0.0.3")
 
 
-def handle_global_config_update(global_config: global_config_lib.GlobalConfig):
-    """Handle changes in globalConfig file."""
-    current_schema_version = global_config.schema_version
-    version = current_schema_version if current_schema_version else "0.0.0"
-    logger.info(f"Current globalConfig schema version is {current_schema_version}")
-
-    if _version_tuple(version) < _version_tuple("0.0.1"):
-        _handle_biased_terms_update(global_config)
-        global_config.dump(global_config.original_path)
-        logger.info("Updated globalConfig schema to version 0.0.1")
-
-    if _version_tuple(version) < _version_tuple("0.0.2"):
-        for tab in global_config.tabs:
-            if tab["name"] == "account":
-                conf_entities = tab.get("entity")
-                oauth_state_enabled_entity = {}
-                for entity in conf_entities:
-                    if entity.get("field") == "oauth_state_enabled":
-                        logger.warning(
-                            "oauth_state_enabled field is no longer a separate "
-                            "entity since UCC version 5.0.0. It is now an "
-                            "option in the oauth field. Please update the "
-                            "globalConfig file accordingly."
-                        )
-                        oauth_state_enabled_entity = entity
-
-                    if entity.get("field") == "oauth" and not entity.get(
-                        "options", {}
-                    ).get("oauth_state_enabled"):
-                        entity["options"]["oauth_state_enabled"] = False
-
-                if oauth_state_enabled_entity:
-                    conf_entities.remove(oauth_state_enabled_entity)
-
-            tab_options = tab.get("options", {})
-            if tab_options.get("onChange"):
+def _handle_oauth_state_enabled_and_hooks_update(
+    global_config: global_config_lib.GlobalConfig,
+):
+    for tab in global_config.tabs:
+        if tab["name"] == "account":
+            conf_entities = tab.get("entity")
+            oauth_state_enabled_entity = {}
+            for entity in conf_entities:
+                if entity.get("field") == "oauth_state_enabled":
+                    logger.warning(
+                        "oauth_state_enabled field is no longer a separate "
+                        "entity since UCC version 5.0.0. It is now an "
+                        "option in the oauth field. Please update the "
+                        "globalConfig file accordingly."
+                    )
+                    oauth_state_enabled_entity = entity
+
+                if entity.get("field") == "oauth" and not entity.get("options", {}).get(
+                    "oauth_state_enabled"
+                ):
+                    entity["options"]["oauth_state_enabled"] = False
+
+            if oauth_state_enabled_entity:
+                conf_entities.remove(oauth_state_enabled_entity)
+
+        tab_options = tab.get("options", {})
+        if tab_options.get("onChange"):
+            logger.error(
+                "The onChange option is no longer supported since UCC "
+                "version 5.0.0. You can use custom hooks to implement "
+                "these actions."
+            )
+            del tab_options["onChange"]
+        if tab_options.get("onLoad"):
+            logger.error(
+                "The onLoad option is no longer supported since UCC "
+                "version 5.0.0. You can use custom hooks to implement "
+                "these actions."
+            )
+            del tab_options["onLoad"]
+
+    if global_config.has_inputs():
+        for service in global_config.inputs:
+            service_options = service.get("options", {})
+            if service_options.get("onChange"):
                 logger.error(
                     "The onChange option is no longer supported since UCC "
                     "version 5.0.0. You can use custom hooks to implement "
                     "these actions."
                 )
-                del tab_options["onChange"]
-            if tab_options.get("onLoad"):
+                del service_options["onChange"]
+            if service_options.get("onLoad"):
                 logger.error(
                     "The onLoad option is no longer supported since UCC "
                     "version 5.0.0. You can use custom hooks to implement "
                     "these actions."
                 )
-                del tab_options["onLoad"]
-
-        if global_config.has_inputs():
-            for service in global_config.inputs:
-                service_options = service.get("options", {})
-                if service_options.get("onChange"):
-                    logger.error(
-                        "The onChange option is no longer supported since UCC "
-                        "version 5.0.0. You can use custom hooks to implement "
-                        "these actions."
-                    )
-                    del service_options["onChange"]
-                if service_options.get("onLoad"):
-                    logger.error(
-                        "The onLoad option is no longer supported since UCC "
-                        "version 5.0.0. You can use custom hooks to implement "
-                        "these actions."
-                    )
-                    del service_options["onLoad"]
-        global_config.update_schema_version("0.0.2")
-        global_config.dump(global_config.original_path)
-        logger.info("Updated globalConfig schema to version 0.0.2")
-
-    if _version_tuple(version) < _version_tuple("0.0.3"):
-        _handle_dropping_api_version_update(global_config)
-        global_config.dump(global_config.original_path)
-        logger.info("Updated globalConfig schema to version 0.0.3")
+                del service_options["onLoad"]
+    global_config.update_schema_version("0.0.2")
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Update of globalConfig to the `schema_version`."""
+
+    schema_version: str
+    description: str
+    migrate: Callable[[global_config_lib.GlobalConfig], None]
+
+
+# Migrations in the order they are applied, every migration updates the
+# schema version of globalConfig.
+MIGRATIONS = (
+    Migration(
+        "0.0.1",
+        "replace whiteList and blackList options with allowList and denyList",
+        _handle_biased_terms_update,
+    ),
+    Migration(
+        "0.0.2",
+        "move oauth_state_enabled entity to the oauth options, drop onChange "
+        "and onLoad options",
+        _handle_oauth_state_enabled_and_hooks_update,
+    ),
+    Migration(
+        "0.0.3",
+        "drop apiVersion from meta",
+        _handle_dropping_api_version_update,
+    ),
+)
+
+
+def get_pending_migrations(
+    global_config: global_config_lib.GlobalConfig,
+) -> List[Migration]:
+    """Returns migrations which are needed to update globalConfig."""
+    version = _version_tuple(global_config.schema_version or "0.0.0")
+    return [
+        migration
+        for migration in MIGRATIONS
+        if version < _version_tuple(migration.schema_version)
+    ]
+
+
+def handle_global_config_update(
+    global_config: global_config_lib.GlobalConfig, dry_run: bool = False
+) -> List[Migration]:
+    """
+    Updates globalConfig to the latest schema version in memory, the caller
+    saves it. Returns migrations which were applied (or would be applied if
+    `dry_run` is True, globalConfig is not changed then).
+    """
+    logger.info(
+        f"Current globalConfig schema version is {global_config.schema_version}"
+    )
+    migrations = get_pending_migrations(global_config)
+    for migration in migrations:
+        if dry_run:
+            logger.info(
+                f"Would update globalConfig schema to version "
+                f"{migration.schema_version}: {migration.description}"
+            )
+            continue
+        migration.migrate(global_config)
+        logger.info(
+            f"Updated globalConfig schema to version {migration.schema_version}"
+        )
+    return migrations
@@ -14,18 +14,105 @@
 # limitations under the License.
 #
 
+import functools
+import hashlib
 import json
+import logging
 import os
 import re
-from typing import Any, Dict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import jsonschema
 
 from splunk_add_on_ucc_framework import global_config as global_config_lib
+from splunk_add_on_ucc_framework import regex_analyzer, utils
+
+logger = logging.getLogger("ucc_gen")
+
+# Changing the version invalidates all cached schema check results.
+SCHEMA_CACHE_VERSION = "1"
 
 
 class GlobalConfigValidatorException(Exception):
-    pass
+    def __init__(self, message: str, errors: Optional[List["ValidationError"]] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+@dataclass(frozen=True)
+class ValidationError:
+    """Error found in globalConfig, `path` is a JSON pointer to its location."""
+
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path or '/'}: {self.message}"
+
+
+Path = Tuple[Union[str, int], ...]
+
+
+def get_json_pointer(path: Iterable[Union[str, int]]) -> str:
+    """Returns JSON pointer (RFC 6901) to the element at `path`."""
+    return "".join(
+        "/" + str(part).replace("~", "~0").replace("/", "~1") for part in path
+    )
+
+
+def get_schema_cache_dir() -> str:
+    return os.path.join(utils.get_cache_dir(), "schema")
+
+
+def _is_schema_checked(schema_hash: str) -> bool:
+    return os.path.isfile(os.path.join(get_schema_cache_dir(), schema_hash))
+
+
+def _mark_schema_checked(schema_hash: str) -> None:
+    try:
+        os.makedirs(get_schema_cache_dir(), exist_ok=True)
+        with open(os.path.join(get_schema_cache_dir(), schema_hash), "w"):
+            pass
+    except OSError as e:
+        logger.debug(f"Could not cache schema check result: {e}")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_schema_validator(schema_hash: str, schema_raw: bytes) -> Any:
+    schema = json.loads(schema_raw)
+    validator_class = jsonschema.validators.validator_for(schema)
+    # Checking the schema itself takes more time than validating the config,
+    # so it is only done once for every schema version.
+    if not _is_schema_checked(schema_hash):
+        validator_class.check_schema(schema)
+        _mark_schema_checked(schema_hash)
+    return validator_class(schema)
+
+
+def get_schema_validator(schema_path: str) -> Any:
+    """
+    Returns JSON schema validator for the schema. Validator is created once
+    per process for every schema content, schemas which were already
+    checked are recorded in the cache folder keyed by the schema hash, so
+    they are not checked again by the next runs.
+    """
+    with open(schema_path, "rb") as f_schema:
+        schema_raw = f_schema.read()
+    schema_hash = hashlib.sha256(
+        SCHEMA_CACHE_VERSION.encode() + b"\0" + schema_raw
+    ).hexdigest()
+    return _get_schema_validator(schema_hash, schema_raw)
 
 
 class GlobalConfigValidator:
@@ -34,48 +121,63 @@ class GlobalConfigValidator:
     Simple validation should go to JSON schema in
     https://github.com/splunk/addonfactory-ucc-base-ui repository.
     Custom validation should be implemented here.
+
+    Config is walked once, every check registered for the kind of the
+    visited element is run on it and all found errors are collected
+    together with the JSON schema errors. Issues which do not make the
+    config invalid are collected to `warnings`.
     """
 
     def __init__(self, source_dir: str, global_config: global_config_lib.GlobalConfig):
         self._source_dir = source_dir
+        self._global_config = global_config
         self._config = global_config.content
+        self.warnings: List[ValidationError] = []
+        self._schema_error_paths: List[Path] = []
 
-    def _validate_config_against_schema(self) -> None:
+    def _get_schema_errors(self) -> List[ValidationError]:
         """
-        Validates config against JSON schema.
-        Raises jsonschema.ValidationError if config is not valid.
+        Validates config against JSON schema. The error `jsonschema.validate`
+        would raise goes first.
         """
         schema_path = os.path.join(self._source_dir, "schema", "schema.json")
-        with open(schema_path) as f_schema:
-            schema_raw = f_schema.read()
-            schema = json.loads(schema_raw)
-        try:
-            return jsonschema.validate(instance=self._config, schema=schema)
-        except jsonschema.ValidationError as e:
-            raise GlobalConfigValidatorException(e.message)
-
-    def _validate_configuration_tab_table_has_name_field(self) -> None:
+        validator = get_schema_validator(schema_path)
+        schema_errors = list(validator.iter_errors(self._config))
+        self._schema_error_paths = [
+            tuple(error.absolute_path) for error in schema_errors
+        ]
+        best_error = jsonschema.exceptions.best_match(schema_errors)
+        if best_error is None:
+            return []
+        # `best_match` may return one of the errors which caused an error
+        # from the list, that error does not need to be reported again.
+        best_error_parents = []
+        error = best_error
+        while error is not None:
+            best_error_parents.append(error)
+            error = error.parent
+        errors = [_get_schema_validation_error(best_error)]
+        for error in schema_errors:
+            if not any(error is parent for parent in best_error_parents):
+                errors.append(_get_schema_validation_error(error))
+        return errors
+
+    def _validate_configuration_tab_table_has_name_field(
+        self, tab: Dict[str, Any]
+    ) -> None:
         """
         Validates that if a configuration tab should be rendered as a table,
         then it needs to have an entity which has field "name".
         """
-        pages = self._config["pages"]
-        configuration = pages["configuration"]
-        tabs = configuration["tabs"]
-        for tab in tabs:
-            if "table" in tab:
-                entities = tab["entity"]
-                has_name_field = False
-                for entity in entities:
-                    if entity["field"] == "name":
-                        has_name_field = True
-                        break
-                if not has_name_field:
-                    raise GlobalConfigValidatorException(
-                        f"Tab '{tab['name']}' should have entity with field 'name'"
-                    )
-
-    def _validate_custom_rest_handlers(self) -> None:
+        if "table" in tab:
+            for entity in tab["entity"]:
+                if entity["field"] == "name":
+                    return
+            raise GlobalConfigValidatorException(
+                f"Tab '{tab['name']}' should have entity with field 'name'"
+            )
+
+    def _validate_custom_rest_handlers(self, service: Dict[str, Any]) -> None:
         """
         Validates that only "restHandlerName" or both "restHandlerModule" and
         "restHandlerClass" is present in the input configuration. Also validates
@@ -87,60 +189,48 @@ class GlobalConfigValidator:
             * both restHandlerModule and restHandlerClass is present
         Everything other combination is considered invalid.
         """
-        pages = self._config["pages"]
-        inputs = pages.get("inputs")
-        if inputs is None:
-            return
-        services = inputs["services"]
-        for service in services:
-            rest_handler_name = service.get("restHandlerName")
-            rest_handler_module = service.get("restHandlerModule")
-            rest_handler_class = service.get("restHandlerClass")
-            if rest_handler_name is not None and (
-                rest_handler_module is not None or rest_handler_class is not None
-            ):
-                raise GlobalConfigValidatorException(
-                    f"Input '{service['name']}' has both 'restHandlerName' and "
-                    f"'restHandlerModule' or 'restHandlerClass' fields present. "
-                    f"Please use only 'restHandlerName' or 'restHandlerModule' "
-                    f"and 'restHandlerClass'."
-                )
-            if (rest_handler_module is not None and rest_handler_class is None) or (
-                rest_handler_module is None and rest_handler_class is not None
-            ):
-                raise GlobalConfigValidatorException(
-                    f"Input '{service['name']}' should have both "
-                    f"'restHandlerModule' and 'restHandlerClass' fields "
-                    f"present, only 1 of them was found."
-                )
+        rest_handler_name = service.get("restHandlerName")
+        rest_handler_module = service.get("restHandlerModule")
+        rest_handler_class = service.get("restHandlerClass")
+        if rest_handler_name is not None and (
+            rest_handler_module is not None or rest_handler_class is not None
+        ):
+            raise GlobalConfigValidatorException(
+                f"Input '{service['name']}' has both 'restHandlerName' and "
+                f"'restHandlerModule' or 'restHandlerClass' fields present. "
+                f"Please use only 'restHandlerName' or 'restHandlerModule' "
+                f"and 'restHandlerClass'."
+            )
+        if (rest_handler_module is not None and rest_handler_class is None) or (
+            rest_handler_module is None and rest_handler_class is not None
+        ):
+            raise GlobalConfigValidatorException(
+                f"Input '{service['name']}' should have both "
+                f"'restHandlerModule' and 'restHandlerClass' fields "
+                f"present, only 1 of them was found."
+            )
 
-    def _validate_file_type_entity(self) -> None:
+    def _validate_file_type_entity(self, entity: Dict[str, Any]) -> None:
         """
         Validates that file-based field has all necessary fields.
         Things should be provided in case of file field:
             * options field
             * supportedFileTypes field should be present in options
         """
-        pages = self._config["pages"]
-        configuration = pages["configuration"]
-        tabs = configuration["tabs"]
-        for tab in tabs:
-            entities = tab["entity"]
-            for entity in entities:
-                if entity["type"] == "file":
-                    options = entity.get("options")
-                    if options is None:
-                        raise GlobalConfigValidatorException(
-                            f"Options field for the file type should be present "
-                            f"for '{entity['field']}' field."
-                        )
-                    supported_file_types = options.get("supportedFileTypes")
-                    if supported_file_types is None:
-                        raise GlobalConfigValidatorException(
-                            f"You should define your supported file types in "
-                            f"the `supportedFileTypes` field for the "
-                            f"'{entity['field']}' field."
-                        )
+        if entity["type"] == "file":
+            options = entity.get("options")
+            if options is None:
+                raise GlobalConfigValidatorException(
+                    f"Options field for the file type should be present "
+                    f"for '{entity['field']}' field."
+                )
+            supported_file_types = options.get("supportedFileTypes")
+            if supported_file_types is None:
+                raise GlobalConfigValidatorException(
+                    f"You should define your supported file types in "
+                    f"the `supportedFileTypes` field for the "
+                    f"'{entity['field']}' field."
+                )
 
     def _validate_string_validator(self, entity_field: str, validator: Dict[str, Any]):
         """
@@ -175,49 +265,66 @@ class GlobalConfigValidator:
     def _validate_regex_validator(self, entity_field: str, validator: Dict[str, Any]):
         """
         Validates regex validator, provided regex should at least be compilable.
+        Generated REST handlers match the values sent to splunkd with it, so
+        it should not have constructs which make it take exponential time to
+        match.
         """
         try:
-            re.compile(validator["pattern"])
+            analysis = regex_analyzer.analyze(validator["pattern"])
         except re.error:
             raise GlobalConfigValidatorException(
                 f"Entity '{entity_field}' has incorrect regex validator, "
                 f"pattern provided in the 'pattern' field is not compilable."
             )
+        if analysis.is_vulnerable:
+            raise GlobalConfigValidatorException(
+                f"Entity '{entity_field}' has regex validator vulnerable to "
+                f"catastrophic backtracking: {', '.join(analysis.issues)}."
+            )
 
-    def _validate_entity_validators(self, entity: Dict[str, Any]):
+    def _check_regex_validator_issues(
+        self, entity: Dict[str, Any], validator: Dict[str, Any]
+    ) -> List[str]:
         """
-        Validates entity validators.
+        Returns warnings about generated values matching which took too long
+        and constructs of the regex validator pattern which can make it
+        backtrack, when the pattern is not vulnerable. Time of the match
+        depends on the machine, so it does not make the config invalid.
         """
-        validators = entity.get("validators", [])
-        for validator in validators:
-            if validator["type"] == "string":
-                self._validate_string_validator(entity["field"], validator)
-            if validator["type"] == "number":
-                self._validate_number_validator(entity["field"], validator)
-            if validator["type"] == "regex":
-                self._validate_regex_validator(entity["field"], validator)
-
-    def _validate_validators(self):
+        if validator["type"] != "regex":
+            return []
+        try:
+            analysis = regex_analyzer.analyze(validator["pattern"])
+        except re.error:
+            return []
+        if analysis.is_vulnerable:
+            return []
+        if analysis.slow_value is not None:
+            return [
+                f"Entity '{entity['field']}' has regex validator which may take "
+                f"exponential time to match, matching {analysis.slow_value!r} "
+                f"took more than {regex_analyzer.REGEX_TIME_BUDGET} seconds."
+            ]
+        if analysis.issues:
+            return [
+                f"Entity '{entity['field']}' has regex validator which may take "
+                f"exponential time to match: {', '.join(analysis.issues)}."
+            ]
+        return []
+
+    def _validate_entity_validator(
+        self, entity: Dict[str, Any], validator: Dict[str, Any]
+    ) -> None:
         """
-        Validates both configuration and services validators, currently string,
-        number and regex are supported.
+        Validates entity validator, currently string, number and regex are
+        supported.
         """
-        pages = self._config["pages"]
-        configuration = pages["configuration"]
-        tabs = configuration["tabs"]
-        for tab in tabs:
-            entities = tab["entity"]
-            for entity in entities:
-                self._validate_entity_validators(entity)
-
-        inputs = pages.get("inputs")
-        if inputs is None:
-            return
-        services = inputs["services"]
-        for service in services:
-            entities = service["entity"]
-            for entity in entities:
-                self._validate_entity_validators(entity)
+        if validator["type"] == "string":
+            self._validate_string_validator(entity["field"], validator)
+        if validator["type"] == "number":
+            self._validate_number_validator(entity["field"], validator)
+        if validator["type"] == "regex":
+            self._validate_regex_validator(entity["field"], validator)
 
     @staticmethod
     def _find_duplicates_in_list(_list: list) -> bool:
@@ -239,14 +346,16 @@ class GlobalConfigValidator:
                 f"Duplicates found for autoCompleteFields children in entity '{entity_label}'"
             )
 
-    def _validate_autoCompleteFields_duplicates(
-        self, options: Dict[str, Any], entity_label: str
-    ) -> None:
+    def _validate_autoCompleteFields_duplicates(self, entity: Dict[str, Any]) -> None:
         """
         Validates duplicates in autoCompleteFields keys
         for fields under keys: label, value
         If autoCompleteFields has children key, children validator is called
         """
+        options = entity.get("options")
+        if not options or not options.get("autoCompleteFields"):
+            return
+        entity_label = entity["label"]
         labels, values = [], []
         for field in options["autoCompleteFields"]:
             labels.append(field.get("label").lower())
@@ -262,62 +371,51 @@ class GlobalConfigValidator:
                 f"Duplicates found for autoCompleteFields: '{entity_label}'"
             )
 
-    def _validate_multilevel_menu(self) -> None:
-        inputs = self._config.get("pages").get("inputs")
-        if inputs:
-            groups_menu = inputs.get("groupsMenu")
-            if groups_menu:
-                names, titles = [], []
-                for group in groups_menu:
-                    names.append(group.get("groupName").lower())
-                    titles.append(group.get("groupTitle").lower())
-                    group_services = group.get("groupServices")
-                    if group_services:
-                        for serviceName in group_services:
-                            if not any(
-                                serviceName == service.get("name")
-                                for service in inputs.get("services")
-                            ):
-                                raise GlobalConfigValidatorException(
-                                    f"{serviceName} ServiceName in the "
-                                    f"multi-level menu does not match any "
-                                    f"services name."
-                                )
-                    else:
-                        if not any(
-                            group.get("groupName") == service.get("name")
-                            and group.get("groupTitle") == service.get("title")
-                            for service in inputs.get("services")
-                        ):
+    def _validate_multilevel_menu(self, inputs: Dict[str, Any]) -> None:
+        groups_menu = inputs.get("groupsMenu")
+        if groups_menu:
+            services_by_name = self._global_config.services_by_name
+            names, titles = [], []
+            for group in groups_menu:
+                names.append(group.get("groupName").lower())
+                titles.append(group.get("groupTitle").lower())
+                group_services = group.get("groupServices")
+                if group_services:
+                    for serviceName in group_services:
+                        if serviceName not in services_by_name:
                             raise GlobalConfigValidatorException(
-                                f'{group.get("groupName")} groupName or '
-                                f'{group.get("groupTitle")} groupTitle in the '
-                                f"multi-level menu does not match any services "
-                                f"name or title."
+                                f"{serviceName} ServiceName in the "
+                                f"multi-level menu does not match any "
+                                f"services name."
                             )
+                else:
+                    service = services_by_name.get(group.get("groupName"))
+                    if service is None or group.get("groupTitle") != service.get(
+                        "title"
+                    ):
+                        raise GlobalConfigValidatorException(
+                            f'{group.get("groupName")} groupName or '
+                            f'{group.get("groupTitle")} groupTitle in the '
+                            f"multi-level menu does not match any services "
+                            f"name or title."
+                        )
 
-                if self._find_duplicates_in_list(
-                    names
-                ) or self._find_duplicates_in_list(titles):
-                    raise GlobalConfigValidatorException(
-                        "Duplicates found for multi-level menu groups' names or titles."
-                    )
+            if self._find_duplicates_in_list(names) or self._find_duplicates_in_list(
+                titles
+            ):
+                raise GlobalConfigValidatorException(
+                    "Duplicates found for multi-level menu groups' names or titles."
+                )
 
-    def _validate_entity_duplicates(self, entity: list) -> None:
+    def _validate_entity_duplicates(self, tab_or_service: Dict[str, Any]) -> None:
         """
         Validates duplicates in entity keys
         for fields under keys: field, label
-        If entity has autoCompleteFields key, autoCompleteFields validator is called
         """
         fields, labels = [], []
-        for _entity in entity:
+        for _entity in tab_or_service["entity"]:
             fields.append(_entity["field"].lower())
             labels.append(_entity["label"].lower())
-            options = _entity.get("options")
-            if options and options.get("autoCompleteFields"):
-                self._validate_autoCompleteFields_duplicates(
-                    _entity["options"], _entity["label"]
-                )
         if self._find_duplicates_in_list(fields) or self._find_duplicates_in_list(
             labels
         ):
@@ -329,14 +427,11 @@ class GlobalConfigValidator:
         """
         Validates duplicates in tab keys under configuration
         for fields under keys: name, title
-        Calls for entity validator, as at least one entity is required in schema
         """
         names, titles = [], []
         for tab in tabs:
             names.append(tab["name"].lower())
             titles.append(tab["title"].lower())
-
-            self._validate_entity_duplicates(tab["entity"])
         if self._find_duplicates_in_list(names) or self._find_duplicates_in_list(
             titles
         ):
@@ -354,9 +449,6 @@ class GlobalConfigValidator:
         for service in inputs["services"]:
             names.append(service["name"].lower())
             titles.append(service["title"].lower())
-
-            self._validate_entity_duplicates(service["entity"])
-
         if self._find_duplicates_in_list(names) or self._find_duplicates_in_list(
             titles
         ):
@@ -364,74 +456,208 @@ class GlobalConfigValidator:
                 "Duplicates found for inputs (services) names or titles"
             )
 
-    def _validate_duplicates(self) -> None:
+    def _validate_alert_fields_duplicates(self, alert: Dict[str, Any]) -> None:
+        fields = []
+        for entity in alert.get("entity") or []:
+            if entity.get("field") in fields:
+                raise GlobalConfigValidatorException(
+                    "Field names should be unique across alerts"
+                )
+            fields.append(entity.get("field"))
+
+    def _validate_alert_entity(self, entity: Dict[str, Any]) -> None:
+        # TODO: test cases should be added here.
+        entity_type = entity.get("type")
+        if entity_type in ("radio", "singleSelect"):
+            if not entity.get("options"):
+                raise GlobalConfigValidatorException(
+                    f"{entity_type} type must have options parameter"
+                )
+        elif entity.get("options") and entity_type != "singleSelectSplunkSearch":
+            raise GlobalConfigValidatorException(
+                f"{entity_type} type must not contain options parameter"
+            )
+        if entity_type in ("singleSelectSplunkSearch",):
+            if not all(
+                [
+                    entity.get("search"),
+                    entity.get("valueField"),
+                    entity.get("labelField"),
+                ]
+            ):
+                raise GlobalConfigValidatorException(
+                    f"{entity_type} type must have search, valueLabel and valueField parameters"
+                )
+        elif any(
+            [
+                entity.get("search"),
+                entity.get("valueField"),
+                entity.get("labelField"),
+            ]
+        ):
+            raise GlobalConfigValidatorException(
+                f"{entity_type} type must not contain search, valueField or labelField parameter"
+            )
+
+    # Checks run on every kind of the visited element.
+    _CHECKS: Dict[str, Tuple[Callable[..., Optional[List[str]]], ...]] = {
+        "tabs": (_validate_tabs_duplicates,),
+        "tab": (
+            _validate_configuration_tab_table_has_name_field,
+            _validate_entity_duplicates,
+        ),
+        "tab_entity": (
+            _validate_file_type_entity,
+            _validate_autoCompleteFields_duplicates,
+        ),
+        "inputs": (
+            _validate_inputs_duplicates,
+            _validate_multilevel_menu,
+        ),
+        "service": (
+            _validate_custom_rest_handlers,
+            _validate_entity_duplicates,
+        ),
+        "service_entity": (_validate_autoCompleteFields_duplicates,),
+        "alert": (_validate_alert_fields_duplicates,),
+        "alert_entity": (_validate_alert_entity,),
+    }
+
+    def _visit(
+        self, kind: str, element: Any, path: Path, errors: List[ValidationError]
+    ) -> None:
+        for check in self._CHECKS[kind]:
+            self._run_check(check, path, errors, element)
+
+    def _has_schema_error(self, path: Path) -> bool:
+        """
+        Returns True if JSON schema validation reported an error for the
+        element at `path`, any element in it or any element containing it.
         """
-        Validates duplicates for both tabs and services (inputs). Inputs however are
-        not required in schema, so this checks if globalConfig has inputs
+        for error_path in self._schema_error_paths:
+            common_length = min(len(error_path), len(path))
+            if error_path[:common_length] == path[:common_length]:
+                return True
+        return False
+
+    def _run_check(
+        self,
+        check: Callable[..., Optional[List[str]]],
+        path: Path,
+        errors: List[ValidationError],
+        *args: Any,
+        element_path: Optional[Path] = None,
+    ) -> None:
+        """
+        Runs the check and adds the error it raises or the messages it
+        returns to `errors`. Checks expect the element at `element_path`
+        (defaults to `path`, where the error is reported) to match the
+        schema, an exception caused by an element which does not match it is
+        ignored as the schema error is already reported. Any other exception
+        is reported as an internal error of the check.
         """
-        pages = self._config["pages"]
+        try:
+            messages = check(self, *args)
+        except GlobalConfigValidatorException as e:
+            errors.append(ValidationError(get_json_pointer(path), str(e)))
+        except (KeyError, IndexError, TypeError, AttributeError) as e:
+            if self._has_schema_error(element_path or path):
+                return
+            errors.append(
+                ValidationError(
+                    get_json_pointer(path),
+                    f"Internal error of {check.__name__} check: "
+                    f"{type(e).__name__}: {e}",
+                )
+            )
+        else:
+            for message in messages or ():
+                errors.append(ValidationError(get_json_pointer(path), message))
 
-        self._validate_tabs_duplicates(pages["configuration"]["tabs"])
+    @staticmethod
+    def _enumerate(container: Any, key: str, path: Path) -> Iterator[Tuple[Any, Path]]:
+        """Yields elements of the list under `key` with their paths."""
+        elements = container.get(key) if isinstance(container, dict) else None
+        if isinstance(elements, list):
+            for index, element in enumerate(elements):
+                yield element, path + (key, index)
+
+    def _visit_validators(
+        self, entity: Any, entity_path: Path, errors: List[ValidationError]
+    ) -> None:
+        for validator, validator_path in self._enumerate(
+            entity, "validators", entity_path
+        ):
+            self._run_check(
+                GlobalConfigValidator._validate_entity_validator,
+                validator_path,
+                errors,
+                entity,
+                validator,
+                element_path=entity_path,
+            )
+            self._run_check(
+                GlobalConfigValidator._check_regex_validator_issues,
+                validator_path,
+                self.warnings,
+                entity,
+                validator,
+                element_path=entity_path,
+            )
 
-        inputs = pages.get("inputs")
+    def _get_custom_errors(self) -> List[ValidationError]:
+        errors: List[ValidationError] = []
+        self.warnings = []
+        pages = self._config.get("pages") if isinstance(self._config, dict) else None
+        configuration = pages.get("configuration") if isinstance(pages, dict) else None
+        configuration_path: Path = ("pages", "configuration")
+        if isinstance(configuration, dict):
+            self._visit(
+                "tabs",
+                configuration.get("tabs"),
+                configuration_path + ("tabs",),
+                errors,
+            )
+        for tab, tab_path in self._enumerate(configuration, "tabs", configuration_path):
+            self._visit("tab", tab, tab_path, errors)
+            for entity, entity_path in self._enumerate(tab, "entity", tab_path):
+                self._visit("tab_entity", entity, entity_path, errors)
+                self._visit_validators(entity, entity_path, errors)
+
+        inputs = pages.get("inputs") if isinstance(pages, dict) else None
+        inputs_path: Path = ("pages", "inputs")
         if inputs:
-            self._validate_inputs_duplicates(inputs)
-
-    def _validate_alerts(self) -> None:
-        # TODO: test cases should be added here.
-        alerts = self._config.get("alerts", [])
-        for alert in alerts:
-            fields = []
-            alert_entity = alert.get("entity")
-            if alert_entity is None:
-                continue
-            for entity in alert_entity:
-                if entity.get("field") in fields:
-                    raise GlobalConfigValidatorException(
-                        "Field names should be unique across alerts"
-                    )
-                else:
-                    fields.append(entity.get("field"))
-                entity_type = entity.get("type")
-                if entity_type in ("radio", "singleSelect"):
-                    if not entity.get("options"):
-                        raise GlobalConfigValidatorException(
-                            f"{entity_type} type must have options parameter"
-                        )
-                elif (
-                    entity.get("options") and entity_type != "singleSelectSplunkSearch"
-                ):
-                    raise GlobalConfigValidatorException(
-                        f"{entity_type} type must not contain options parameter"
-                    )
-                if entity_type in ("singleSelectSplunkSearch",):
-                    if not all(
-                        [
-                            entity.get("search"),
-                            entity.get("valueField"),
-                            entity.get("labelField"),
-                        ]
-                    ):
-                        raise GlobalConfigValidatorException(
-                            f"{entity_type} type must have search, valueLabel and valueField parameters"
-                        )
-                elif any(
-                    [
-                        entity.get("search"),
-                        entity.get("valueField"),
-                        entity.get("labelField"),
-                    ]
-                ):
-                    raise GlobalConfigValidatorException(
-                        f"{entity_type} type must not contain search, valueField or labelField parameter"
-                    )
+            self._visit("inputs", inputs, inputs_path, errors)
+        for service, service_path in self._enumerate(inputs, "services", inputs_path):
+            self._visit("service", service, service_path, errors)
+            for entity, entity_path in self._enumerate(service, "entity", service_path):
+                self._visit("service_entity", entity, entity_path, errors)
+                self._visit_validators(entity, entity_path, errors)
+
+        for alert, alert_path in self._enumerate(self._config, "alerts", ()):
+            self._visit("alert", alert, alert_path, errors)
+            for entity, entity_path in self._enumerate(alert, "entity", alert_path):
+                self._visit("alert_entity", entity, entity_path, errors)
+        return errors
+
+    def get_errors(self) -> List[ValidationError]:
+        """
+        Returns all errors found in the config, JSON schema errors go first.
+        Warnings are collected to `warnings`.
+        """
+        return self._get_schema_errors() + self._get_custom_errors()
 
     def validate(self) -> None:
-        self._validate_config_against_schema()
-        self._validate_configuration_tab_table_has_name_field()
-        self._validate_custom_rest_handlers()
-        self._validate_file_type_entity()
-        self._validate_validators()
-        self._validate_multilevel_menu()
-        self._validate_duplicates()
-        self._validate_alerts()
+        """
+        Raises GlobalConfigValidatorException with all found errors if config
+        is not valid, its message is the message of the first error.
+        """
+        errors = self.get_errors()
+        if errors:
+            raise GlobalConfigValidatorException(errors[0].message, errors)
+
+
+def _get_schema_validation_error(
+    error: jsonschema.exceptions.ValidationError,
+) -> ValidationError:
+    return ValidationError(get_json_pointer(error.absolute_path), error.message)
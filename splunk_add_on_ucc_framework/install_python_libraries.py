@@ -13,16 +13,68 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import hashlib
 import logging
 import os
+import re
 import shutil
 import stat
 import subprocess
-from pathlib import Path
-from typing import Sequence
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from splunk_add_on_ucc_framework import build_manifest
+from splunk_add_on_ucc_framework import materializer as materializer_lib
+from splunk_add_on_ucc_framework import output_tree as output_tree_lib
+from splunk_add_on_ucc_framework import utils
 
 logger = logging.getLogger("ucc_gen")
 
+# Changing the version invalidates all cached libraries, it should be bumped
+# when the way libraries are installed changes.
+LIB_CACHE_VERSION = "1"
+_INTERPRETER_TAG_SCRIPT = (
+    "import sys, sysconfig; "
+    "print(sys.implementation.cache_tag, "
+    "sysconfig.get_config_var('SOABI'), "
+    "sysconfig.get_platform())"
+)
+# Packages installed as dependencies of the requirements which are not
+# needed in the add-on.
+PRUNED_PACKAGE_NAMES = (
+    "setuptools",
+    "bin",
+    "pip",
+    "distribute",
+    "wheel",
+)
+# Directories which are removed from the installed libraries if they are
+# stripped, they are not needed to run the add-on.
+STRIPPED_DIRECTORY_NAMES = ("__pycache__", "tests")
+# Files which are removed from `*.dist-info` directories if libraries are
+# stripped.
+STRIPPED_DIST_INFO_FILE_NAMES = ("RECORD",)
+_EXECUTE_BITS = stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+# Options of the requirements file which make pip install requirements that
+# are not in the file itself, libraries installed from it are not cached.
+_NOT_CACHED_REQUIREMENT_OPTIONS = (
+    "-r",
+    "--requirement",
+    "-c",
+    "--constraint",
+    "-e",
+    "--editable",
+    "-f",
+    "--find-links",
+)
+# Requirement pinned to a single version, for example
+# `solnlib[extra]==5.0.0; python_version >= "3.7"`.
+_PINNED_REQUIREMENT_PATTERN = re.compile(
+    r"^[A-Za-z0-9][A-Za-z0-9._-]*\s*(\[[^\]]*\])?\s*===?\s*[^\s,;*]+\s*(;.*)?$"
+)
+
 
 class SplunktaucclibNotFound(Exception):
     pass
@@ -57,11 +109,166 @@ def _check_ucc_library_in_requirements_file(path_to_requirements: str) -> bool:
     return False
 
 
+def get_lib_cache_dir() -> str:
+    return os.path.join(utils.get_cache_dir(), "libs")
+
+
+def _get_interpreter_tag(installer: str) -> Optional[str]:
+    try:
+        output = subprocess.check_output(
+            f'{installer} -c "{_INTERPRETER_TAG_SCRIPT}"',
+            shell=True,
+            stderr=subprocess.DEVNULL,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode().strip()
+
+
+def _read_requirement_lines(requirements_file_path: str) -> List[str]:
+    """
+    Returns lines of the requirements file without comments, blank lines
+    and line continuations.
+    """
+    with open(requirements_file_path) as f:
+        content = f.read()
+    lines = []
+    for line in content.replace("\\\n", " ").splitlines():
+        line = re.sub(r"(^|\s)#.*$", "", line).strip()
+        if line:
+            lines.append(line)
+    return lines
+
+
+def get_unpinned_requirement(requirements_file_path: str) -> Optional[str]:
+    """
+    Returns the first line of the requirements file which may resolve to
+    other libraries while the file stays the same or None if every
+    requirement is pinned with `==` or has `--hash`. Requirements included
+    from other files, editable and URL requirements are never pinned.
+    """
+    for line in _read_requirement_lines(requirements_file_path):
+        option = re.split(r"[\s=]", line, maxsplit=1)[0]
+        # Short options may be followed by the value without a space.
+        if option in _NOT_CACHED_REQUIREMENT_OPTIONS or (
+            not line.startswith("--") and line[:2] in _NOT_CACHED_REQUIREMENT_OPTIONS
+        ):
+            return line
+        if line.startswith("-"):
+            # Index options, they are a part of the file content.
+            continue
+        requirement, _, hashes = line.partition("--hash")
+        if hashes:
+            continue
+        if "://" in requirement or not _PINNED_REQUIREMENT_PATTERN.match(
+            requirement.strip()
+        ):
+            return line
+    return None
+
+
+def get_lib_cache_key(
+    requirements_file_path: str,
+    installer: str,
+    strip: bool = False,
+    wheelhouse: Optional[str] = None,
+) -> Optional[str]:
+    """
+    Returns key of the installed libraries in the cache. It depends on the
+    content of the requirements file, ABI and platform of the interpreter
+    libraries are installed with, whether libraries are stripped, content of
+    the wheelhouse they are installed from and `PIP_*` environment variables.
+    Returns None if the interpreter can't be inspected.
+    """
+    interpreter_tag = _get_interpreter_tag(installer)
+    if not interpreter_tag:
+        return None
+    sha256 = hashlib.sha256()
+    sha256.update(f"{LIB_CACHE_VERSION}\0{interpreter_tag}\0".encode())
+    if strip:
+        sha256.update(b"strip\0")
+    if wheelhouse is not None:
+        sha256.update(
+            f"wheelhouse\0{build_manifest.hash_directory(wheelhouse)}\0".encode()
+        )
+    for name, value in sorted(os.environ.items()):
+        if name.startswith("PIP_"):
+            sha256.update(f"{name}={value}\0".encode())
+    with open(requirements_file_path, "rb") as f:
+        sha256.update(f.read())
+    return sha256.hexdigest()
+
+
+def _install_and_clean_libraries(
+    requirements_file_path: str,
+    installation_path: str,
+    installer: str,
+    wheelhouse: Optional[str] = None,
+    strip: bool = False,
+) -> None:
+    install_libraries(
+        requirements_file_path,
+        installation_path,
+        installer,
+        wheelhouse,
+    )
+    prune_libraries(installation_path, PRUNED_PACKAGE_NAMES, strip=strip)
+
+
+def _install_cached_libraries(
+    requirements_file_path: str,
+    ucc_lib_target: str,
+    installer: str,
+    lib_cache_dir: str,
+    cache_key: str,
+    wheelhouse: Optional[str] = None,
+    strip: bool = False,
+) -> None:
+    """
+    Installs libraries into the cache if they are not there yet and clones
+    or copies them into `ucc_lib_target`.
+    """
+    cached_libraries_path = os.path.join(lib_cache_dir, cache_key)
+    if os.path.isdir(cached_libraries_path):
+        logger.info(f"Using cached libraries from {cached_libraries_path}")
+    else:
+        os.makedirs(lib_cache_dir, exist_ok=True)
+        # Libraries are installed next to their final location and moved
+        # there at once, so the cache never has partially installed
+        # libraries.
+        installation_path = tempfile.mkdtemp(prefix=".tmp-", dir=lib_cache_dir)
+        try:
+            _install_and_clean_libraries(
+                requirements_file_path,
+                installation_path,
+                installer,
+                wheelhouse,
+                strip,
+            )
+            try:
+                os.rename(installation_path, cached_libraries_path)
+            except OSError:
+                # Libraries were cached by another build in the meantime.
+                shutil.rmtree(installation_path)
+        except BaseException:
+            shutil.rmtree(installation_path, ignore_errors=True)
+            raise
+        logger.info(f"Cached libraries in {cached_libraries_path}")
+    cached_libraries = output_tree_lib.OutputTree()
+    cached_libraries.add_directory(cached_libraries_path)
+    # Libraries are not hard linked, so changes of the add-on libraries do not
+    # change the cache.
+    cached_libraries.write(ucc_lib_target, materializer_lib.ReflinkMaterializer())
+
+
 def install_python_libraries(
     source_path: str,
     ucc_lib_target: str,
     python_binary_name: str,
     includes_ui: bool = False,
+    lib_cache_dir: Optional[str] = None,
+    wheelhouse: Optional[str] = None,
+    strip: bool = False,
 ):
     path_to_requirements_file = os.path.join(source_path, "lib", "requirements.txt")
     if os.path.isfile(path_to_requirements_file):
@@ -77,24 +284,43 @@ def install_python_libraries(
                 )
         if not os.path.exists(ucc_lib_target):
             os.makedirs(ucc_lib_target)
-        install_libraries(
-            path_to_requirements_file,
-            ucc_lib_target,
-            python_binary_name,
-        )
-        packages_to_remove = (
-            "setuptools",
-            "bin",
-            "pip",
-            "distribute",
-            "wheel",
-        )
-        remove_package_from_installed_path(
-            ucc_lib_target,
-            packages_to_remove,
-        )
-
-        remove_execute_bit(ucc_lib_target)
+        cache_key = None
+        if lib_cache_dir is not None:
+            unpinned_requirement = get_unpinned_requirement(path_to_requirements_file)
+            if unpinned_requirement is not None:
+                # Libraries of the cache would not be upgraded until the
+                # requirements file changes.
+                logger.info(
+                    f"Requirement '{unpinned_requirement}' is not pinned with "
+                    f"'==' or '--hash', libraries are installed without cache"
+                )
+            else:
+                cache_key = get_lib_cache_key(
+                    path_to_requirements_file, python_binary_name, strip, wheelhouse
+                )
+                if cache_key is None:
+                    logger.warning(
+                        f"Could not inspect {python_binary_name}, libraries are "
+                        f"installed without cache"
+                    )
+        if lib_cache_dir is not None and cache_key is not None:
+            _install_cached_libraries(
+                path_to_requirements_file,
+                ucc_lib_target,
+                python_binary_name,
+                lib_cache_dir,
+                cache_key,
+                wheelhouse,
+                strip,
+            )
+        else:
+            _install_and_clean_libraries(
+                path_to_requirements_file,
+                ucc_lib_target,
+                python_binary_name,
+                wheelhouse,
+                strip,
+            )
     else:
         logger.warning(
             f"Could not find requirements file @ {path_to_requirements_file}, nothing to install"
@@ -105,12 +331,16 @@ def install_libraries(
     requirements_file_path: str,
     installation_path: str,
     installer: str,
+    wheelhouse: Optional[str] = None,
 ):
     """
     Upgrades `pip` version to the latest one and installs requirements to the
     specified path.
+
+    If `wheelhouse` is specified, requirements are installed only from the
+    wheels in that folder without accessing the package index and `pip` is
+    not upgraded.
     """
-    pip_update_command = f"{installer} -m pip install pip --upgrade"
     pip_install_command = (
         f"{installer} "
         f"-m pip "
@@ -122,31 +352,126 @@ def install_libraries(
         f"--use-deprecated=legacy-resolver "
         f'--target "{installation_path}"'
     )
-
-    _subprocess_call(pip_update_command, "pip upgrade")
+    if wheelhouse is not None:
+        pip_install_command += f' --no-index --find-links "{wheelhouse}"'
+    else:
+        pip_update_command = f"{installer} -m pip install pip --upgrade"
+        _subprocess_call(pip_update_command, "pip upgrade")
     _subprocess_call(pip_install_command, "pip install")
 
 
-def remove_package_from_installed_path(
-    installation_path: str, package_names: Sequence[str]
+def download_wheels(
+    requirements_file_path: str,
+    wheelhouse: str,
+    installer: str,
 ):
-    p = Path(installation_path)
-    for package_name in package_names:
-        for o in p.glob(f"{package_name}*"):
-            if o.is_dir():
-                logger.info(f"  removing directory {o} from {installation_path}")
-                shutil.rmtree(o)
-
-
-def remove_execute_bit(installation_path: str):
-    p = Path(installation_path)
-    no_user_exec = ~stat.S_IEXEC
-    no_group_exec = ~stat.S_IXGRP
-    no_other_exec = ~stat.S_IXOTH
-    no_exec = no_user_exec & no_group_exec & no_other_exec
-
-    for o in p.rglob("*"):
-        if not o.is_dir() and os.access(o, os.X_OK):
-            logger.info(f"  fixing {o} execute bit")
-            current_permissions = stat.S_IMODE(os.lstat(o).st_mode)
-            os.chmod(o, current_permissions & no_exec)
+    """
+    Downloads wheels of the requirements and all their dependencies to the
+    `wheelhouse` folder, requirements which are only distributed as source
+    are built into wheels.
+    """
+    pip_wheel_command = (
+        f"{installer} "
+        f"-m pip "
+        f"wheel "
+        f'-r "{requirements_file_path}" '
+        f"--prefer-binary "
+        f"--use-deprecated=legacy-resolver "
+        f'--wheel-dir "{wheelhouse}"'
+    )
+    _subprocess_call(pip_wheel_command, "pip wheel")
+
+
+@dataclass
+class PruneSummary:
+    files: int = 0
+    size: int = 0
+    removed_files: int = 0
+    removed_size: int = 0
+    fixed_files: int = 0
+    elapsed: float = 0.0
+
+
+def _format_size(size: int) -> str:
+    return f"{size / (1024 * 1024):.1f} MiB"
+
+
+def _get_tree_size(path: str) -> Tuple[int, int]:
+    files = size = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                directory_files, directory_size = _get_tree_size(entry.path)
+                files += directory_files
+                size += directory_size
+            else:
+                files += 1
+                size += entry.stat(follow_symlinks=False).st_size
+    return files, size
+
+
+def _remove_tree(path: str, summary: PruneSummary) -> None:
+    files, size = _get_tree_size(path)
+    logger.debug(f"  removing directory {path}")
+    shutil.rmtree(path)
+    summary.removed_files += files
+    summary.removed_size += size
+
+
+def _prune_directory(
+    path: str, summary: PruneSummary, strip: bool, is_dist_info: bool
+) -> None:
+    with os.scandir(path) as it:
+        entries = list(it)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if strip and entry.name in STRIPPED_DIRECTORY_NAMES:
+                _remove_tree(entry.path, summary)
+            else:
+                _prune_directory(
+                    entry.path, summary, strip, entry.name.endswith(".dist-info")
+                )
+            continue
+        entry_stat = entry.stat(follow_symlinks=False)
+        if strip and is_dist_info and entry.name in STRIPPED_DIST_INFO_FILE_NAMES:
+            os.remove(entry.path)
+            summary.removed_files += 1
+            summary.removed_size += entry_stat.st_size
+            continue
+        if stat.S_ISREG(entry_stat.st_mode) and entry_stat.st_mode & _EXECUTE_BITS:
+            logger.debug(f"  fixing {entry.path} execute bit")
+            os.chmod(entry.path, stat.S_IMODE(entry_stat.st_mode) & ~_EXECUTE_BITS)
+            summary.fixed_files += 1
+        summary.files += 1
+        summary.size += entry_stat.st_size
+
+
+def prune_libraries(
+    installation_path: str,
+    package_names: Sequence[str] = PRUNED_PACKAGE_NAMES,
+    strip: bool = False,
+) -> PruneSummary:
+    """
+    Cleans installed libraries in a single walk over the directory: removes
+    top-level directories which names start with any of `package_names` and
+    execute bit from every file. If `strip` is True, `__pycache__` and
+    `tests` directories and `RECORD` files of `*.dist-info` directories are
+    removed as well.
+    """
+    start = time.perf_counter()
+    summary = PruneSummary()
+    with os.scandir(installation_path) as it:
+        entries = list(it)
+    prefixes = tuple(package_names)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False) and entry.name.startswith(prefixes):
+            _remove_tree(entry.path, summary)
+    _prune_directory(installation_path, summary, strip, False)
+    summary.elapsed = time.perf_counter() - start
+    logger.info(
+        f"Pruned {installation_path} in {summary.elapsed:.2f}s: removed "
+        f"{summary.removed_files} files ({_format_size(summary.removed_size)}), "
+        f"fixed execute bit of {summary.fixed_files} files, "
+        f"{summary.files} files ({_format_size(summary.size)}) left"
+    )
+    return summary
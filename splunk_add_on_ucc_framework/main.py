@@ -18,9 +18,7 @@ import sys
 from typing import Optional, Sequence
 import logging
 
-from splunk_add_on_ucc_framework.commands import build
-from splunk_add_on_ucc_framework.commands import init
-from splunk_add_on_ucc_framework.commands import import_from_aob
+from splunk_add_on_ucc_framework import materializer as materializer_lib
 
 logger = logging.getLogger("ucc_gen")
 
@@ -59,6 +57,16 @@ class DefaultSubcommandArgumentParser(argparse.ArgumentParser):
         return super()._parse_known_args(arg_strings, *args, **kwargs)
 
 
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"should be at least 1, got {number}")
+    return number
+
+
 def main(argv: Optional[Sequence[str]] = None):
     argv = argv if argv is not None else sys.argv[1:]
     parser = DefaultSubcommandArgumentParser()
@@ -93,6 +101,98 @@ def main(argv: Optional[Sequence[str]] = None):
         help="Python binary name to use to install requirements.",
         default="python3",
     )
+    build_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        default=False,
+        help="Rerun only the build stages which inputs changed since the "
+        "previous build in the output folder.",
+    )
+    build_parser.add_argument(
+        "--jobs",
+        type=_positive_int,
+        help="Number of build stages which can be run in parallel.",
+        default=1,
+    )
+    build_parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Record time, memory usage and written files of every build "
+        "stage and save them to the output folder.",
+    )
+    build_parser.add_argument(
+        "--materializer",
+        type=str,
+        choices=materializer_lib.MATERIALIZERS,
+        help="How files from UCC template, source package and LICENSES "
+        "folder are materialized in the output folder. 'reflink' uses "
+        "copy-on-write clones where file system supports it and copies "
+        "otherwise.",
+        default=materializer_lib.MATERIALIZER_REFLINK,
+    )
+    build_parser.add_argument(
+        "--archive",
+        type=str,
+        help="Path to the .tar.gz or .spl archive the add-on is written to. "
+        "Files from UCC template, source package and LICENSES folder are "
+        "streamed to the archive without writing them to the output folder.",
+        default=None,
+    )
+    build_parser.add_argument(
+        "--archive-threads",
+        type=_positive_int,
+        help="Number of threads used to compress the archive.",
+        default=1,
+    )
+    build_parser.add_argument(
+        "--no-lib-cache",
+        dest="lib_cache",
+        action="store_false",
+        default=True,
+        help="Always install add-on requirements with pip instead of using "
+        "libraries cached by previous builds.",
+    )
+    build_parser.add_argument(
+        "--wheelhouse",
+        type=str,
+        help="Folder with wheels to install add-on requirements from, "
+        "package index is not accessed and pip is not upgraded. It can be "
+        "filled with `ucc-gen fetch-wheels`.",
+        default=None,
+    )
+    build_parser.add_argument(
+        "--strip-libraries",
+        action="store_true",
+        default=False,
+        help="Remove __pycache__ and tests folders and RECORD files of "
+        "*.dist-info folders from the installed add-on requirements.",
+    )
+    build_parser.add_argument(
+        "--compile",
+        dest="compile_bytecode",
+        action="store_true",
+        default=False,
+        help="Compile Python files of bin and lib folders to bytecode with "
+        "the Python binary the add-on is built for, so modules are not "
+        "compiled when the add-on first imports them.",
+    )
+    build_parser.add_argument(
+        "--compile-optimization",
+        type=int,
+        choices=(0, 1, 2),
+        help="Optimization level of the compiled bytecode, bytecode of "
+        "level 1 and 2 is only used if Python runs with -O or -OO.",
+        default=0,
+    )
+    build_parser.add_argument(
+        "--watch",
+        action="store_true",
+        default=False,
+        help="Rebuild the add-on every time globalConfig file or source "
+        "package changes. Changes of globalConfig file which only affect REST "
+        "handlers regenerate only REST handlers and OpenAPI file.",
+    )
 
     init_parser = subparsers.add_parser("init", description="Bootstrap an add-on.")
     init_parser.add_argument(
@@ -136,15 +236,125 @@ def main(argv: Optional[Sequence[str]] = None):
         required=True,
     )
 
+    fetch_wheels_parser = subparsers.add_parser(
+        "fetch-wheels",
+        description="Download wheels of the add-on requirements for offline builds.",
+    )
+    fetch_wheels_parser.add_argument(
+        "--source",
+        type=str,
+        nargs="?",
+        help="Folder containing the app.manifest and app source.",
+        default="package",
+    )
+    fetch_wheels_parser.add_argument(
+        "--wheelhouse",
+        type=str,
+        help="Folder to save wheels to.",
+        required=True,
+    )
+    fetch_wheels_parser.add_argument(
+        "--python-binary-name",
+        type=str,
+        help="Python binary name to use to download requirements.",
+        default="python3",
+    )
+
+    update_config_parser = subparsers.add_parser(
+        "update-config",
+        description="Update globalConfig file to the latest schema version.",
+    )
+    update_config_parser.add_argument(
+        "--source",
+        type=str,
+        nargs="?",
+        help="Folder containing the app.manifest and app source.",
+        default="package",
+    )
+    update_config_parser.add_argument(
+        "--config",
+        type=str,
+        nargs="?",
+        help="Path to configuration file, defaults to globalConfig file in parent directory of source provided.",
+        default=None,
+    )
+    update_config_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        default=False,
+        help="Only report which updates would be applied.",
+    )
+
+    validate_parser = subparsers.add_parser(
+        "validate",
+        description="Validate the add-on without building it.",
+    )
+    validate_parser.add_argument(
+        "--source",
+        type=str,
+        nargs="?",
+        help="Folder containing the app.manifest and app source.",
+        default="package",
+    )
+    validate_parser.add_argument(
+        "--config",
+        type=str,
+        nargs="?",
+        help="Path to configuration file, defaults to globalConfig file in parent directory of source provided.",
+        default=None,
+    )
+    validate_parser.add_argument(
+        "--output-format",
+        type=str,
+        choices=("text", "json"),
+        help="Format of the validation results, `json` prints them to stdout.",
+        default="text",
+    )
+
     args = parser.parse_args(argv)
-    if args.command == "build":
+    # Commands are imported only when they are run, so the CLI starts fast
+    # and every command imports only the libraries it needs.
+    if args.command == "build" and args.watch:
+        from splunk_add_on_ucc_framework.commands import watch
+
+        watch.watch(
+            source=args.source,
+            config_path=args.config,
+            addon_version=args.ta_version,
+            python_binary_name=args.python_binary_name,
+            jobs=args.jobs,
+            profile=args.profile,
+            materializer=args.materializer,
+            archive=args.archive,
+            lib_cache=args.lib_cache,
+            wheelhouse=args.wheelhouse,
+            strip_libraries=args.strip_libraries,
+            compile_bytecode=args.compile_bytecode,
+            compile_optimization=args.compile_optimization,
+        )
+    elif args.command == "build":
+        from splunk_add_on_ucc_framework.commands import build
+
         build.generate(
             source=args.source,
             config_path=args.config,
             addon_version=args.ta_version,
             python_binary_name=args.python_binary_name,
+            incremental=args.incremental,
+            jobs=args.jobs,
+            profile=args.profile,
+            materializer=args.materializer,
+            archive=args.archive,
+            archive_threads=args.archive_threads,
+            lib_cache=args.lib_cache,
+            wheelhouse=args.wheelhouse,
+            strip_libraries=args.strip_libraries,
+            compile_bytecode=args.compile_bytecode,
+            compile_optimization=args.compile_optimization,
         )
     if args.command == "init":
+        from splunk_add_on_ucc_framework.commands import init
+
         init.init(
             addon_name=args.addon_name,
             addon_display_name=args.addon_display_name,
@@ -153,9 +363,35 @@ def main(argv: Optional[Sequence[str]] = None):
             overwrite=args.overwrite,
         )
     if args.command == "import-from-aob":
+        from splunk_add_on_ucc_framework.commands import import_from_aob
+
         import_from_aob.import_from_aob(
             addon_name=args.addon_name,
         )
+    if args.command == "fetch-wheels":
+        from splunk_add_on_ucc_framework.commands import fetch_wheels
+
+        fetch_wheels.fetch_wheels(
+            source=args.source,
+            wheelhouse=args.wheelhouse,
+            python_binary_name=args.python_binary_name,
+        )
+    if args.command == "update-config":
+        from splunk_add_on_ucc_framework.commands import update_config
+
+        update_config.update_config(
+            source=args.source,
+            config_path=args.config,
+            dry_run=args.dry_run,
+        )
+    if args.command == "validate":
+        from splunk_add_on_ucc_framework.commands import validate
+
+        validate.validate(
+            source=args.source,
+            config_path=args.config,
+            output_format=args.output_format,
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import filecmp
+import logging
+import os
+import shutil
+import threading
+
+from splunk_add_on_ucc_framework import file_writer
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # `fcntl` module is not available on Windows.
+    fcntl = None  # type: ignore
+
+logger = logging.getLogger("ucc_gen")
+
+# ioctl request to clone a file on Linux file systems which support
+# copy-on-write (Btrfs, XFS, OCFS2...), see `man ioctl_ficlone`.
+FICLONE = 0x40049409
+
+# Granularity of modification times of the coarsest file system (FAT). A
+# source file written again within it after it was copied can keep its size
+# and modification time.
+MTIME_GRANULARITY_NS = 2_000_000_000
+
+MATERIALIZER_COPY = "copy"
+MATERIALIZER_REFLINK = "reflink"
+# Files are never hard linked: the add-on in the output folder is modified
+# in place (for example, by `additional_packaging.py` or by the files
+# written by the build), which would change the source files too.
+MATERIALIZERS = (
+    MATERIALIZER_COPY,
+    MATERIALIZER_REFLINK,
+)
+
+
+class Materializer:
+    """
+    Materializes source files in the destination. Destination files which
+    already have the same content as the source are left untouched. Counts
+    materialized and skipped files and the size of materialized files.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.materialized = 0
+        self.bytes_materialized = 0
+        self.skipped = 0
+
+    @staticmethod
+    def is_up_to_date(src: str, dest: str) -> bool:
+        """
+        Returns True if `dest` has the same content as `src`. Files of the
+        same size are up to date if they have the same modification time,
+        which copies keep, unless the source was modified within the
+        granularity of modification times of the time the destination was
+        written (its ctime): then the source could have been written again
+        after the copy without changing its modification time, so the
+        content is compared.
+        """
+        try:
+            dest_stat = os.stat(dest)
+        except OSError:
+            return False
+        src_stat = os.stat(src)
+        if os.path.samestat(src_stat, dest_stat):
+            return True
+        if src_stat.st_size != dest_stat.st_size:
+            return False
+        if (
+            src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+            and dest_stat.st_ctime_ns - src_stat.st_mtime_ns > MTIME_GRANULARITY_NS
+        ):
+            return True
+        return filecmp.cmp(src, dest, shallow=False)
+
+    def materialize(self, src: str, dest: str) -> None:
+        if self.is_up_to_date(src, dest):
+            with self._lock:
+                self.skipped += 1
+            return
+        if os.path.lexists(dest):
+            os.remove(dest)
+        self._create(src, dest)
+        size = os.path.getsize(dest)
+        with self._lock:
+            self.materialized += 1
+            self.bytes_materialized += size
+
+    def materialize_content(self, content: str, dest: str) -> None:
+        try:
+            with open(dest) as f:
+                up_to_date = f.read() == content
+        except (OSError, UnicodeDecodeError):
+            up_to_date = False
+        if up_to_date:
+            with self._lock:
+                self.skipped += 1
+            return
+        # The file is replaced, so content is never written through a hard
+        # link which may exist in the output folder.
+        data = content.encode()
+        file_writer.replace_file(dest, data)
+        with self._lock:
+            self.materialized += 1
+            self.bytes_materialized += len(data)
+
+    def _create(self, src: str, dest: str) -> None:
+        # `copy2` keeps modification time, so the next build does not need
+        # to compare the content of the files.
+        shutil.copy2(src, dest)
+
+
+class CopyMaterializer(Materializer):
+    pass
+
+
+class ReflinkMaterializer(Materializer):
+    """
+    Clones files using copy-on-write if the file system supports it, falls
+    back to copying otherwise.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._supported = fcntl is not None
+
+    def _create(self, src: str, dest: str) -> None:
+        if self._supported:
+            try:
+                with open(src, "rb") as src_file, open(dest, "wb") as dest_file:
+                    fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+                shutil.copystat(src, dest)
+                return
+            except OSError:
+                logger.debug("Reflinks are not supported, falling back to copy")
+                self._supported = False
+                if os.path.lexists(dest):
+                    os.remove(dest)
+        super()._create(src, dest)
+
+
+def get_materializer(name: str) -> Materializer:
+    if name == MATERIALIZER_COPY:
+        return CopyMaterializer()
+    if name == MATERIALIZER_REFLINK:
+        return ReflinkMaterializer()
+    raise ValueError(f"Unknown materializer '{name}'")
@@ -13,8 +13,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import io
+
 import addonfactory_splunk_conf_parser_lib as conf_parser
 
+from splunk_add_on_ucc_framework import file_writer
+
 DEFAULT = """
 # Application-level permissions
 
@@ -34,5 +38,9 @@ class MetaConf:
         self._meta_conf.read_string(DEFAULT)
 
     def write(self, path: str) -> None:
-        with open(path, "w") as fd:
-            self._meta_conf.write(fd)
+        file_writer.write_file(path, str(self))
+
+    def __str__(self) -> str:
+        content = io.StringIO()
+        self._meta_conf.write(content)
+        return content.getvalue()
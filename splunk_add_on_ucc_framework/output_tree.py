@@ -0,0 +1,168 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+import threading
+from typing import Dict, List, Mapping, Optional, Set
+
+from splunk_add_on_ucc_framework import materializer as materializer_lib
+
+
+class OutputTreeException(Exception):
+    pass
+
+
+class OutputFile:
+    """
+    File of the output tree. Its content is either taken from the `source`
+    file or kept in memory in `content`.
+    """
+
+    def __init__(self, source: Optional[str] = None, content: Optional[str] = None):
+        self.source = source
+        self.content = content
+
+    def read(self) -> str:
+        if self.source is None:
+            return self.content or ""
+        with open(self.source) as f:
+            return f.read()
+
+
+def _normalize(path: str) -> str:
+    path = os.path.normpath(path)
+    return "" if path == os.curdir else path
+
+
+def _is_under(path: str, directory: str) -> bool:
+    if not directory:
+        return True
+    return path == directory or path.startswith(directory + os.sep)
+
+
+class OutputTree:
+    """
+    In-memory model of the add-on output folder. Files and directories are
+    added, removed, renamed and changed as operations on the model, nothing
+    is written to disk until `write` is called. Paths are relative to the
+    add-on output folder.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files: Dict[str, OutputFile] = {}
+        self._directories: Set[str] = set()
+
+    @property
+    def files(self) -> List[str]:
+        with self._lock:
+            return sorted(self._files)
+
+    @property
+    def directories(self) -> List[str]:
+        with self._lock:
+            directories = set(self._directories)
+            paths = list(self._files)
+        for path in paths:
+            directory = os.path.dirname(path)
+            while directory:
+                directories.add(directory)
+                directory = os.path.dirname(directory)
+        return sorted(directories)
+
+    def __contains__(self, path: str) -> bool:
+        return _normalize(path) in self._files
+
+    def add_file(self, source: str, path: str) -> None:
+        with self._lock:
+            self._files[_normalize(path)] = OutputFile(source=source)
+
+    def add_content(self, path: str, content: str) -> None:
+        with self._lock:
+            self._files[_normalize(path)] = OutputFile(content=content)
+
+    def add_directory(self, source: str, path: str = "") -> None:
+        """
+        Adds all files from the `source` directory to the tree under `path`
+        overriding files which are already in the tree.
+        """
+        path = _normalize(path)
+        if path:
+            with self._lock:
+                self._directories.add(path)
+        with os.scandir(source) as entries:
+            for entry in entries:
+                entry_path = os.path.join(path, entry.name)
+                if entry.is_dir():
+                    self.add_directory(entry.path, entry_path)
+                else:
+                    self.add_file(entry.path, entry_path)
+
+    def get(self, path: str) -> Optional[OutputFile]:
+        with self._lock:
+            return self._files.get(_normalize(path))
+
+    def read(self, path: str) -> str:
+        output_file = self.get(path)
+        if output_file is None:
+            raise OutputTreeException(f"File {path} is not in the output tree")
+        return output_file.read()
+
+    def remove(self, path: str) -> bool:
+        """
+        Removes file or directory with all its content from the tree.
+        Returns False if nothing was removed.
+        """
+        path = _normalize(path)
+        with self._lock:
+            files = [f for f in self._files if _is_under(f, path)]
+            directories = [d for d in self._directories if _is_under(d, path)]
+            for f in files:
+                del self._files[f]
+            for d in directories:
+                self._directories.discard(d)
+        return bool(files or directories)
+
+    def rename(self, path: str, new_path: str) -> None:
+        path = _normalize(path)
+        with self._lock:
+            if path not in self._files:
+                raise OutputTreeException(f"File {path} is not in the output tree")
+            self._files[_normalize(new_path)] = self._files.pop(path)
+
+    def replace_tokens(self, path: str, tokens: Mapping[str, str]) -> None:
+        """Replaces every token in the file with its value."""
+        content = self.read(path)
+        for token, value in tokens.items():
+            content = content.replace(token, value)
+        self.add_content(path, content)
+
+    def make_directories(self, root: str) -> None:
+        """Creates all directories of the tree under `root`."""
+        os.makedirs(root, exist_ok=True)
+        for directory in self.directories:
+            os.makedirs(os.path.join(root, directory), exist_ok=True)
+
+    def write(self, root: str, materializer: materializer_lib.Materializer) -> None:
+        """Writes all files of the tree under `root`."""
+        self.make_directories(root)
+        with self._lock:
+            files = list(self._files.items())
+        for path, output_file in files:
+            dest = os.path.join(root, path)
+            if output_file.source is not None:
+                materializer.materialize(output_file.source, dest)
+            else:
+                materializer.materialize_content(output_file.content or "", dest)
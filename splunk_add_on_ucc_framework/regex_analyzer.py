@@ -0,0 +1,390 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Finds regular expressions of regex validators which can take exponential
+time to match, generated REST handlers run them on every value sent to
+splunkd.
+
+Patterns are analyzed on the tree `re` compiles them from, so constructs
+`re` already simplifies, for example alternatives of single characters
+which become a character set, are not reported. The analysis reports:
+
+* star height greater than 1, an unbounded repeat inside another one;
+* nested quantifiers, a repeat inside another repeat when one of them is
+  unbounded and the next iteration of the inner repeat can start with the
+  character which follows it;
+* overlapping alternatives in an unbounded repeat, when a character can
+  start more than one alternative.
+
+Patterns with nested quantifiers or overlapping alternatives are vulnerable,
+they backtrack exponentially on some values. Other patterns are matched
+against generated values which force backtracking, with more and more
+repetitions, to find the ones the analysis misses. How long a match takes
+depends on the machine, so a slow value alone does not make the pattern
+vulnerable.
+"""
+import functools
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, FrozenSet, Iterator, List, Optional, Tuple
+
+try:
+    from re import _constants as sre_constants  # type: ignore[attr-defined]
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+except ImportError:  # Python < 3.11
+    import sre_constants  # type: ignore[no-redef]
+    import sre_parse  # type: ignore[no-redef]
+
+# Time a single match of a generated value can take, in seconds.
+REGEX_TIME_BUDGET = 0.1
+NESTED_QUANTIFIERS = "nested quantifiers"
+OVERLAPPING_ALTERNATIVES = "overlapping alternatives in a repeated group"
+# Issues which make the pattern backtrack exponentially, star height alone
+# does not, `(\w+\.)+com` is matched in polynomial time.
+CATASTROPHIC_ISSUES = (NESTED_QUANTIFIERS, OVERLAPPING_ALTERNATIVES)
+# Generated values are not longer than that, polynomial backtracking on
+# values of that length is still fast enough.
+MAX_FUZZ_LENGTH = 1024
+MAX_FUZZ_REPETITIONS = 64
+
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+_UNBOUNDED = sre_constants.MAXREPEAT
+# Not available before Python 3.11, they never backtrack.
+_POSSESSIVE_REPEAT = getattr(sre_constants, "POSSESSIVE_REPEAT", None)
+_ATOMIC_GROUP = getattr(sre_constants, "ATOMIC_GROUP", None)
+
+# Characters the sets of characters which can start a subpattern are
+# computed over, the printable ones go first as they are used in generated
+# values.
+_PROBE_CHARS = (
+    "aAzZ09_-.:/@ !#$%&'()*+,;<=>?[\\]^`{|}~\"bcdefghijklmnopqrstuvwxy"
+    "BCDEFGHIJKLMNOPQRSTUVWXY12345678"
+    + "".join(chr(code) for code in range(128) if not chr(code).isprintable())
+    + "\u00a0\u00e9\u0660\u2003\u4e00"
+)
+_ALL_CHARS = frozenset(_PROBE_CHARS)
+# Appended to generated values to make the match fail at the end.
+_FUZZ_SUFFIXES = ("!", "\x00", " ", "")
+# Alternatives of every branch tried when generating values.
+_MAX_ALTERNATIVES = 4
+
+_CATEGORY_PATTERNS = {
+    "CATEGORY_DIGIT": re.compile(r"\d"),
+    "CATEGORY_NOT_DIGIT": re.compile(r"\D"),
+    "CATEGORY_SPACE": re.compile(r"\s"),
+    "CATEGORY_NOT_SPACE": re.compile(r"\S"),
+    "CATEGORY_WORD": re.compile(r"\w"),
+    "CATEGORY_NOT_WORD": re.compile(r"\W"),
+}
+
+_Subpattern = Any
+
+
+@dataclass(frozen=True)
+class RegexAnalysis:
+    """
+    Result of the analysis, `slow_value` is the generated value a match of
+    which took longer than the time budget, None if there is no such value
+    or the pattern is vulnerable and values were not generated.
+    """
+
+    issues: Tuple[str, ...]
+    slow_value: Optional[str] = None
+
+    @property
+    def is_vulnerable(self) -> bool:
+        return any(issue in CATASTROPHIC_ISSUES for issue in self.issues)
+
+
+def _get_children(op: Any, av: Any) -> List[_Subpattern]:
+    """Returns subpatterns of the node, repeats are handled by callers."""
+    if op == sre_constants.SUBPATTERN:
+        return [av[-1]]
+    if op == sre_constants.BRANCH:
+        return list(av[1])
+    if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return [av[1]]
+    if op == sre_constants.GROUPREF_EXISTS:
+        return [child for child in av[1:] if child is not None]
+    if op in _REPEATS or (_POSSESSIVE_REPEAT is not None and op == _POSSESSIVE_REPEAT):
+        return [av[2]]
+    if _ATOMIC_GROUP is not None and op == _ATOMIC_GROUP:
+        return [av]
+    return []
+
+
+def _matches_set(items: List[Tuple[Any, Any]], char: str) -> bool:
+    negate = False
+    matches = False
+    for op, av in items:
+        if op == sre_constants.NEGATE:
+            negate = True
+        elif op == sre_constants.LITERAL:
+            matches = matches or char == chr(av)
+        elif op == sre_constants.RANGE:
+            matches = matches or av[0] <= ord(char) <= av[1]
+        elif op == sre_constants.CATEGORY:
+            category_pattern = _CATEGORY_PATTERNS.get(str(av))
+            matches = matches or (
+                category_pattern is None or bool(category_pattern.match(char))
+            )
+        else:
+            # Case insensitive ranges and such, assume any character.
+            matches = True
+    return matches != negate
+
+
+def _get_first_chars(subpattern: _Subpattern) -> Tuple[FrozenSet[str], bool]:
+    """
+    Returns characters which can start a match of the subpattern and whether
+    it can match an empty string.
+    """
+    first_chars: FrozenSet[str] = frozenset()
+    for op, av in subpattern:
+        node_chars, nullable = _get_node_first_chars(op, av)
+        first_chars |= node_chars
+        if not nullable:
+            return first_chars, False
+    return first_chars, True
+
+
+def _get_node_first_chars(op: Any, av: Any) -> Tuple[FrozenSet[str], bool]:
+    if op == sre_constants.LITERAL:
+        return frozenset((chr(av),)), False
+    if op == sre_constants.NOT_LITERAL:
+        return _ALL_CHARS - {chr(av)}, False
+    if op == sre_constants.ANY:
+        return _ALL_CHARS - {"\n"}, False
+    if op == sre_constants.IN:
+        return frozenset(char for char in _PROBE_CHARS if _matches_set(av, char)), False
+    if op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        return frozenset(), True
+    if op in _REPEATS or (_POSSESSIVE_REPEAT is not None and op == _POSSESSIVE_REPEAT):
+        first_chars, nullable = _get_first_chars(av[2])
+        return first_chars, nullable or av[0] == 0
+    children = _get_children(op, av)
+    if not children:
+        # Backreferences and unknown nodes can start with anything.
+        return _ALL_CHARS, True
+    first_chars = frozenset()
+    nullable = op == sre_constants.GROUPREF_EXISTS
+    for child in children:
+        child_chars, child_nullable = _get_first_chars(child)
+        first_chars |= child_chars
+        nullable = nullable or child_nullable
+    return first_chars, nullable
+
+
+def _get_issues(
+    subpattern: _Subpattern,
+    outer_repeats: Tuple[bool, ...],
+    follow_chars: FrozenSet[str],
+    issues: List[str],
+) -> int:
+    """
+    Adds issues of the subpattern to `issues` and returns its star height.
+    `outer_repeats` tells for every repeat the subpattern is in whether it
+    is unbounded, `follow_chars` are characters which can follow the
+    subpattern in them.
+    """
+    star_height = 0
+    nodes = list(subpattern)
+    for index, (op, av) in enumerate(nodes):
+        if _ATOMIC_GROUP is not None and op == _ATOMIC_GROUP:
+            # Atomic groups and possessive repeats do not backtrack.
+            continue
+        if _POSSESSIVE_REPEAT is not None and op == _POSSESSIVE_REPEAT:
+            continue
+        next_index = index + 1
+        rest_chars, rest_nullable = _get_first_chars(nodes[next_index:])
+        node_follow_chars = rest_chars | (
+            follow_chars if rest_nullable else frozenset()
+        )
+        if op in _REPEATS and av[1] > 1:
+            is_unbounded = av[1] == _UNBOUNDED
+            body_chars = _get_first_chars(av[2])[0]
+            # The repeat is ambiguous if its next iteration can start with
+            # the character which follows it, `(a+)+` or `(\w+\s?)*`.
+            if (
+                outer_repeats
+                and (is_unbounded or any(outer_repeats))
+                and body_chars & node_follow_chars
+            ):
+                issues.append(NESTED_QUANTIFIERS)
+            body_height = _get_issues(
+                av[2],
+                outer_repeats + (is_unbounded,),
+                body_chars | node_follow_chars,
+                issues,
+            )
+            star_height = max(star_height, body_height + is_unbounded)
+            continue
+        if op == sre_constants.BRANCH and any(outer_repeats):
+            seen_chars: FrozenSet[str] = frozenset()
+            for alternative in av[1]:
+                first_chars = _get_first_chars(alternative)[0]
+                if seen_chars & first_chars:
+                    issues.append(OVERLAPPING_ALTERNATIVES)
+                    break
+                seen_chars |= first_chars
+        for child in _get_children(op, av):
+            star_height = max(
+                star_height,
+                _get_issues(child, outer_repeats, node_follow_chars, issues),
+            )
+    return star_height
+
+
+def get_issues(pattern: str) -> Tuple[str, ...]:
+    """
+    Returns constructs of the pattern which can make it backtrack
+    exponentially, raises `re.error` if the pattern is not valid.
+    """
+    issues: List[str] = []
+    star_height = _get_issues(sre_parse.parse(pattern), (), frozenset(), issues)
+    if star_height > 1:
+        issues.insert(0, f"star height {star_height}")
+    # The same issue is reported once.
+    return tuple(dict.fromkeys(issues))
+
+
+def _get_char(op: Any, av: Any) -> str:
+    """Returns a character matching the node, printable ones are preferred."""
+    if op == sre_constants.LITERAL:
+        return chr(av)
+    for char in _PROBE_CHARS:
+        if op == sre_constants.IN:
+            if _matches_set(av, char):
+                return char
+        elif op == sre_constants.NOT_LITERAL:
+            if char != chr(av):
+                return char
+        elif char != "\n":
+            return char
+    return ""
+
+
+def _has_repeat(op: Any, av: Any) -> bool:
+    if op in _REPEATS:
+        return True
+    return any(
+        _has_repeat(child_op, child_av)
+        for child in _get_children(op, av)
+        for child_op, child_av in child
+    )
+
+
+def _generate(
+    subpattern: _Subpattern, repetitions: int, alternative: int, nested: bool = False
+) -> str:
+    """
+    Returns a value matching the subpattern with the `alternative`th
+    alternative of every branch. Outermost repeats are repeated
+    `repetitions` times, repeats inside them as few times as possible, so
+    the value grows by one iteration of every outermost repeat.
+    """
+    parts = []
+    for op, av in subpattern:
+        if op in (
+            sre_constants.LITERAL,
+            sre_constants.NOT_LITERAL,
+            sre_constants.ANY,
+            sre_constants.IN,
+        ):
+            parts.append(_get_char(op, av))
+        elif op == sre_constants.BRANCH:
+            alternatives = av[1]
+            parts.append(
+                _generate(
+                    alternatives[alternative % len(alternatives)],
+                    repetitions,
+                    alternative,
+                    nested,
+                )
+            )
+        elif op in _REPEATS or (
+            _POSSESSIVE_REPEAT is not None and op == _POSSESSIVE_REPEAT
+        ):
+            min_count, max_count, body = av
+            if nested:
+                count = max(min_count, 1) if max_count > 1 else min_count
+            else:
+                count = min(max_count, max(min_count, repetitions))
+            parts.append(_generate(body, repetitions, alternative, True) * count)
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            continue
+        else:
+            for child in _get_children(op, av)[:1]:
+                parts.append(_generate(child, repetitions, alternative, nested))
+    return "".join(parts)
+
+
+def _generate_values(subpattern: _Subpattern) -> Iterator[str]:
+    """
+    Yields values which make the pattern backtrack, shorter go first. The
+    values are also cut after every repeat, so the match fails right after
+    it and not at the end of the pattern.
+    """
+    nodes = list(subpattern)
+    prefix_ends = {len(nodes)}
+    for index, (op, av) in enumerate(nodes):
+        if _has_repeat(op, av):
+            prefix_ends.add(index + 1)
+    for repetitions in range(1, MAX_FUZZ_REPETITIONS + 1):
+        values = {
+            _generate(nodes[:prefix_end], repetitions, alternative)
+            for prefix_end in prefix_ends
+            for alternative in range(_MAX_ALTERNATIVES)
+        }
+        values = {value for value in values if len(value) < MAX_FUZZ_LENGTH}
+        if not values:
+            return
+        for value in sorted(values, key=lambda value: (len(value), value)):
+            for suffix in _FUZZ_SUFFIXES:
+                yield value + suffix
+
+
+def find_slow_value(
+    pattern: str, time_budget: float = REGEX_TIME_BUDGET
+) -> Optional[str]:
+    """
+    Returns a generated value `re.match(pattern, value)` takes longer than
+    `time_budget` seconds with, or None if there is no such value.
+    """
+    regex = re.compile(pattern)
+    for value in _generate_values(sre_parse.parse(pattern)):
+        start = time.perf_counter()
+        regex.match(value)
+        if time.perf_counter() - start > time_budget:
+            return value
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def analyze(pattern: str, time_budget: float = REGEX_TIME_BUDGET) -> RegexAnalysis:
+    """
+    Analyzes the pattern, raises `re.error` if it is not valid. Patterns
+    which are not vulnerable are still matched against generated values, as
+    the analysis does not find every pattern which can backtrack.
+    """
+    analysis = RegexAnalysis(issues=get_issues(pattern))
+    if analysis.is_vulnerable:
+        return analysis
+    return RegexAnalysis(
+        issues=analysis.issues,
+        slow_value=find_slow_value(pattern, time_budget),
+    )
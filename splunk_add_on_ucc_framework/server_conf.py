@@ -13,10 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import io
 from typing import Sequence
 
 import addonfactory_splunk_conf_parser_lib as conf_parser
 
+from splunk_add_on_ucc_framework import file_writer
+
 SERVER_CONF_FILE_NAME = "server.conf"
 
 
@@ -32,5 +35,9 @@ class ServerConf:
             ] = "true"
 
     def write(self, path: str) -> None:
-        with open(path, "w") as fd:
-            self._server_conf.write(fd)
+        file_writer.write_file(path, str(self))
+
+    def __str__(self) -> str:
+        content = io.StringIO()
+        self._server_conf.write(content)
+        return content.getvalue()
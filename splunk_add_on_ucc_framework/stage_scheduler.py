@@ -0,0 +1,149 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import concurrent.futures
+import logging
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger("ucc_gen")
+
+
+class StageSchedulerException(Exception):
+    pass
+
+
+class Stage:
+    def __init__(
+        self, name: str, func: Callable[[], None], depends_on: Sequence[str] = ()
+    ):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+
+def _run_stage(stage: Stage) -> Optional[BaseException]:
+    # Exceptions (including SystemExit) are returned instead of being raised,
+    # so they are reported back to the main thread for every Python version.
+    try:
+        stage.func()
+    except BaseException as e:
+        return e
+    return None
+
+
+class StageScheduler:
+    """
+    Runs build stages respecting the dependencies between them. Stages which
+    do not depend on each other are run in parallel if `jobs` is greater
+    than 1. Every stage function is passed through `stage_wrapper` if it is
+    provided.
+    """
+
+    def __init__(
+        self,
+        jobs: int = 1,
+        stage_wrapper: Optional[
+            Callable[[str, Callable[[], None]], Callable[[], None]]
+        ] = None,
+    ):
+        if jobs < 1:
+            raise StageSchedulerException(
+                f"Number of jobs should be at least 1, got {jobs}"
+            )
+        self._jobs = jobs
+        self._stage_wrapper = stage_wrapper
+        self._stages: Dict[str, Stage] = {}
+
+    @property
+    def stages(self) -> List[Stage]:
+        return list(self._stages.values())
+
+    def add_stage(
+        self, name: str, func: Callable[[], None], depends_on: Sequence[str] = ()
+    ) -> None:
+        if name in self._stages:
+            raise StageSchedulerException(f"Stage '{name}' is already added")
+        if self._stage_wrapper is not None:
+            func = self._stage_wrapper(name, func)
+        self._stages[name] = Stage(name, func, depends_on)
+
+    def order(self) -> List[str]:
+        """
+        Returns names of the stages in the order they are run with 1 job.
+        Stages are kept in the order they were added unless their
+        dependencies require otherwise.
+        """
+        for stage in self._stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self._stages:
+                    raise StageSchedulerException(
+                        f"Stage '{stage.name}' depends on unknown stage "
+                        f"'{dependency}'"
+                    )
+        ordered: List[str] = []
+        done = set()
+        remaining = list(self._stages.values())
+        while remaining:
+            for stage in remaining:
+                if all(dependency in done for dependency in stage.depends_on):
+                    break
+            else:
+                names = ", ".join(stage.name for stage in remaining)
+                raise StageSchedulerException(
+                    f"Stages have circular dependencies: {names}"
+                )
+            remaining.remove(stage)
+            ordered.append(stage.name)
+            done.add(stage.name)
+        return ordered
+
+    def run(self) -> None:
+        order = self.order()
+        if self._jobs == 1:
+            for name in order:
+                error = _run_stage(self._stages[name])
+                if error is not None:
+                    raise error
+            return
+        self._run_parallel(order)
+
+    def _run_parallel(self, order: List[str]) -> None:
+        done = set()
+        pending = list(order)
+        errors: List[BaseException] = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._jobs) as executor:
+            running: Dict[concurrent.futures.Future, str] = {}
+            while pending or running:
+                if not errors:
+                    for name in list(pending):
+                        stage = self._stages[name]
+                        if all(dependency in done for dependency in stage.depends_on):
+                            pending.remove(name)
+                            running[executor.submit(_run_stage, stage)] = name
+                if not running:
+                    break
+                finished, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in finished:
+                    name = running.pop(future)
+                    error = future.result()
+                    if error is not None:
+                        logger.debug(f"Stage '{name}' failed")
+                        errors.append(error)
+                    else:
+                        done.add(name)
+        if errors:
+            raise errors[0]
@@ -0,0 +1,79 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import functools
+import logging
+import os
+from typing import Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from splunk_add_on_ucc_framework import utils
+
+logger = logging.getLogger("ucc_gen")
+
+internal_root_dir = os.path.dirname(__file__)
+TEMPLATES_DIR = os.path.join(internal_root_dir, "templates")
+ALERT_TEMPLATES_DIR = os.path.join(
+    internal_root_dir, "commands", "modular_alert_builder", "arf_template"
+)
+ALERT_HTML_THEME_DIR = os.path.join(ALERT_TEMPLATES_DIR, "default_html_theme")
+
+
+def get_template_cache_dir() -> str:
+    return os.path.join(utils.get_cache_dir(), "templates")
+
+
+def _get_bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    # Compiled templates are checked against the template source when
+    # loaded, so the cache does not need to be invalidated.
+    cache_dir = get_template_cache_dir()
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as e:
+        logger.debug(f"Compiled templates are not cached: {e}")
+        return None
+    return FileSystemBytecodeCache(cache_dir)
+
+
+@functools.lru_cache(maxsize=None)
+def get_environment() -> Environment:
+    """
+    Returns the environment of UCC templates (modular inputs, OAuth REST
+    handler). It is created once, templates are compiled only the first
+    time they are used and compiled templates are cached on disk for the
+    next runs.
+    """
+    # nosemgrep: splunk.autoescape-disabled, python.jinja2.security.audit.autoescape-disabled.autoescape-disabled
+    return Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
+        bytecode_cache=_get_bytecode_cache(),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_alert_environment() -> Environment:
+    """
+    Returns the environment of alert action templates, shared by all alert
+    action generators, see `get_environment`.
+    """
+    # nosemgrep: splunk.autoescape-disabled, python.jinja2.security.audit.autoescape-disabled.autoescape-disabled
+    return Environment(
+        loader=FileSystemLoader([ALERT_HTML_THEME_DIR, ALERT_TEMPLATES_DIR]),
+        bytecode_cache=_get_bytecode_cache(),
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True,
+    )
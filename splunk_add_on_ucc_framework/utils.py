@@ -14,6 +14,7 @@
 # limitations under the License.
 #
 import json
+import os
 from typing import Any, Dict
 
 import dunamai
@@ -21,6 +22,17 @@ import yaml
 
 from splunk_add_on_ucc_framework import exceptions
 
+# libyaml emitter is used if it is available, it is much faster.
+Dumper = getattr(yaml, "CDumper", yaml.Dumper)
+
+
+def get_cache_dir() -> str:
+    """Returns folder ucc-gen caches data in between the runs."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "ucc-gen")
+
 
 def dump_json_config(config: Dict[Any, Any], file_path: str):
     with open(file_path, "w") as f:
@@ -30,7 +42,7 @@ def dump_json_config(config: Dict[Any, Any], file_path: str):
 
 def dump_yaml_config(config: Dict[Any, Any], file_path: str):
     with open(file_path, "w") as f:
-        yaml.dump(config, f, indent=4)
+        yaml.dump(config, f, Dumper=Dumper, indent=4)
 
 
 def get_version_from_git():
@@ -1,12 +1,22 @@
+import json
 import os
+import re
+import shutil
+import tarfile
 import tempfile
+import tracemalloc
 from os import path
 
+import pytest
+
 from tests.smoke import helpers
 
 import addonfactory_splunk_conf_parser_lib as conf_parser
 
+from splunk_add_on_ucc_framework import build_manifest
+from splunk_add_on_ucc_framework import file_writer
 from splunk_add_on_ucc_framework.commands import build
+from splunk_add_on_ucc_framework.commands import watch
 
 
 def _compare_app_conf(expected_folder: str, actual_folder: str):
@@ -35,6 +45,15 @@ def _compare_app_conf(expected_folder: str, actual_folder: str):
     assert expected_app_conf_dict == actual_app_conf_dict
 
 
+def _get_relative_file_paths(folder: str):
+    relative_file_paths = set()
+    for root, _, files in os.walk(folder):
+        for f in files:
+            relative_path = path.relpath(path.join(root, f), folder)
+            relative_file_paths.add(tuple(relative_path.split(os.sep)))
+    return relative_file_paths
+
+
 def test_ucc_generate():
     package_folder = path.join(
         path.dirname(path.realpath(__file__)),
@@ -144,6 +163,7 @@ def test_ucc_generate_with_inputs_configuration_alerts():
             ("bin", "splunk_ta_uccexample_custom_rh.py"),
             ("bin", "splunk_ta_uccexample_rh_oauth.py"),
             ("bin", "splunk_ta_uccexample_rh_settings.py"),
+            ("bin", "splunk_ta_uccexample_validators.py"),
             ("bin", "test_alert.py"),
             ("README", "alert_actions.conf.spec"),
             ("README", "inputs.conf.spec"),
@@ -215,6 +235,7 @@ def test_ucc_generate_with_configuration():
             ("bin", "splunk_ta_uccexample_rh_account.py"),
             ("bin", "splunk_ta_uccexample_rh_oauth.py"),
             ("bin", "splunk_ta_uccexample_rh_settings.py"),
+            ("bin", "splunk_ta_uccexample_validators.py"),
             ("README", "splunk_ta_uccexample_account.conf.spec"),
             ("README", "splunk_ta_uccexample_settings.conf.spec"),
             ("metadata", "default.meta"),
@@ -305,3 +326,669 @@ def test_ucc_generate_openapi_with_configuration_files_only():
             temp_dir, "Splunk_TA_UCCExample", "static", "openapi.json"
         )
         assert not path.exists(expected_file_path)
+
+
+def test_ucc_generate_incremental():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        package_folder = path.join(
+            path.dirname(path.realpath(__file__)),
+            "..",
+            "testdata",
+            "test_addons",
+            "package_global_config_configuration",
+            "package",
+        )
+        build.generate(
+            source=package_folder,
+            output_directory=temp_dir,
+            addon_version="1.1.1",
+            incremental=True,
+        )
+        actual_folder = path.join(temp_dir, "Splunk_TA_UCCExample")
+        app_conf_path = path.join(actual_folder, "default", "app.conf")
+        app_conf_mtime = os.stat(app_conf_path).st_mtime_ns
+        installed_library_path = path.join(
+            actual_folder, "lib", "splunktaucclib", "__init__.py"
+        )
+        installed_library_mtime = os.stat(installed_library_path).st_mtime_ns
+
+        # Nothing changed, output is not touched.
+        build.generate(
+            source=package_folder,
+            output_directory=temp_dir,
+            addon_version="1.1.1",
+            incremental=True,
+        )
+        assert os.stat(app_conf_path).st_mtime_ns == app_conf_mtime
+
+        # Only add-on version changed, libraries are not reinstalled.
+        build.generate(
+            source=package_folder,
+            output_directory=temp_dir,
+            addon_version="1.1.2",
+            incremental=True,
+        )
+        assert os.stat(installed_library_path).st_mtime_ns == installed_library_mtime
+        with open(path.join(actual_folder, "VERSION")) as version_file:
+            assert version_file.read() == "1.1.2\n1.1.2"
+
+
+def test_ucc_generate_incremental_keeps_up_to_date_files(caplog):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        addon_folder = path.join(temp_dir, "addon")
+        shutil.copytree(
+            path.join(
+                path.dirname(path.realpath(__file__)),
+                "..",
+                "testdata",
+                "test_addons",
+                "package_global_config_inputs_configuration_alerts",
+            ),
+            addon_folder,
+        )
+        package_folder = path.join(addon_folder, "package")
+        extra_file_path = path.join(package_folder, "bin", "extra.py")
+        with open(extra_file_path, "w") as f:
+            f.write("EXTRA = 1\n")
+        output_directory = path.join(temp_dir, "output")
+        build.generate(
+            source=package_folder,
+            output_directory=output_directory,
+            addon_version="1.1.1",
+            incremental=True,
+        )
+        actual_folder = path.join(output_directory, "Splunk_TA_UCCExample")
+        files = _get_relative_file_paths(output_directory)
+        mtimes = {
+            f: os.stat(path.join(output_directory, *f)).st_mtime_ns for f in files
+        }
+        with open(path.join(actual_folder, "bin", "unknown.py"), "w") as f:
+            f.write("UNKNOWN = 1\n")
+        os.remove(extra_file_path)
+        caplog.clear()
+
+        build.generate(
+            source=package_folder,
+            output_directory=output_directory,
+            addon_version="1.1.1",
+            incremental=True,
+        )
+
+        materialized = re.search(
+            r"Materialized (\d+) files, (\d+) files were already up to date",
+            caplog.text,
+        )
+        assert int(materialized.group(2)) > 0
+        writer = file_writer.get_writer()
+        assert writer.files_skipped > 0
+        # Only the build manifest which records the removed file.
+        assert writer.files_written == 1
+        # Files of the previous build which are not produced anymore are
+        # removed, files the build does not know about are kept.
+        removed_file = ("Splunk_TA_UCCExample", "bin", "extra.py")
+        assert _get_relative_file_paths(output_directory) == (
+            files - {removed_file}
+        ) | {("Splunk_TA_UCCExample", "bin", "unknown.py")}
+        # Libraries are kept, app.conf has a new build number.
+        changed_files = {
+            (build_manifest.BUILD_MANIFEST_FILE_NAME,),
+            ("Splunk_TA_UCCExample", "default", "app.conf"),
+        }
+        for f in files - changed_files - {removed_file}:
+            assert os.stat(path.join(output_directory, *f)).st_mtime_ns == mtimes[f], f
+
+
+def test_ucc_generate_without_incremental_cleans_output_directory():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        package_folder = path.join(
+            path.dirname(path.realpath(__file__)),
+            "..",
+            "testdata",
+            "test_addons",
+            "package_global_config_configuration",
+            "package",
+        )
+        output_directory = path.join(temp_dir, "output")
+        build.generate(
+            source=package_folder,
+            output_directory=output_directory,
+            addon_version="1.1.1",
+        )
+        files = _get_relative_file_paths(output_directory)
+        unknown_file_path = path.join(
+            output_directory, "Splunk_TA_UCCExample", "bin", "unknown.py"
+        )
+        with open(unknown_file_path, "w") as f:
+            f.write("UNKNOWN = 1\n")
+
+        build.generate(
+            source=package_folder,
+            output_directory=output_directory,
+            addon_version="1.1.1",
+        )
+
+        assert not path.exists(unknown_file_path)
+        assert _get_relative_file_paths(output_directory) == files
+
+
+def test_ucc_generate_incremental_reruns_changed_stages(caplog):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        addon_folder = path.join(temp_dir, "addon")
+        shutil.copytree(
+            path.join(
+                path.dirname(path.realpath(__file__)),
+                "..",
+                "testdata",
+                "test_addons",
+                "package_global_config_inputs_configuration_alerts",
+            ),
+            addon_folder,
+        )
+        package_folder = path.join(addon_folder, "package")
+        output_directory = path.join(temp_dir, "output")
+        build.generate(
+            source=package_folder,
+            output_directory=output_directory,
+            addon_version="1.1.1",
+            incremental=True,
+        )
+        actual_folder = path.join(output_directory, "Splunk_TA_UCCExample")
+        rest_handler_path = path.join(
+            actual_folder, "bin", "splunk_ta_uccexample_rh_account.py"
+        )
+        rest_handler_mtime = os.stat(rest_handler_path).st_mtime_ns
+        files = _get_relative_file_paths(actual_folder)
+        with open(path.join(package_folder, "bin", "helper.py"), "w") as f:
+            f.write("HELPER = 1\n")
+        caplog.clear()
+
+        build.generate(
+            source=package_folder,
+            output_directory=output_directory,
+            addon_version="1.1.1",
+            incremental=True,
+        )
+
+        for stage in ("rest", "inputs", "alerts"):
+            assert f"Stage {stage} is up to date" in caplog.text
+        assert "Generating OpenAPI file" in caplog.text
+        assert os.stat(rest_handler_path).st_mtime_ns == rest_handler_mtime
+        # Files of the reused stages are kept.
+        assert _get_relative_file_paths(actual_folder) == files | {("bin", "helper.py")}
+
+
+def test_ucc_generate_with_parallel_stages_is_equal_to_serial_build():
+    with tempfile.TemporaryDirectory() as serial_dir:
+        with tempfile.TemporaryDirectory() as parallel_dir:
+            package_folder = path.join(
+                path.dirname(path.realpath(__file__)),
+                "..",
+                "testdata",
+                "test_addons",
+                "package_global_config_inputs_configuration_alerts",
+                "package",
+            )
+            build.generate(
+                source=package_folder,
+                output_directory=serial_dir,
+                addon_version="1.1.1",
+            )
+            build.generate(
+                source=package_folder,
+                output_directory=parallel_dir,
+                addon_version="1.1.1",
+                jobs=4,
+            )
+
+            serial_files = _get_relative_file_paths(serial_dir)
+            parallel_files = _get_relative_file_paths(parallel_dir)
+            assert serial_files == parallel_files
+
+            _compare_app_conf(
+                path.join(serial_dir, "Splunk_TA_UCCExample"),
+                path.join(parallel_dir, "Splunk_TA_UCCExample"),
+            )
+            app_conf_file = ("Splunk_TA_UCCExample", "default", "app.conf")
+            for f in serial_files - {app_conf_file}:
+                with open(path.join(serial_dir, *f), "rb") as serial_file:
+                    with open(path.join(parallel_dir, *f), "rb") as parallel_file:
+                        assert serial_file.read() == parallel_file.read(), f
+
+
+def test_ucc_generate_with_profile():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        package_folder = path.join(
+            path.dirname(path.realpath(__file__)),
+            "..",
+            "testdata",
+            "test_addons",
+            "package_global_config_inputs_configuration_alerts",
+            "package",
+        )
+        build.generate(
+            source=package_folder,
+            output_directory=temp_dir,
+            addon_version="1.1.1",
+            profile=True,
+        )
+
+        with open(path.join(temp_dir, "build_profile.json")) as profile_file:
+            profile = json.load(profile_file)
+        stage_names = [stage["name"] for stage in profile["stages"]]
+        for stage_name in (
+            "validation",
+            "config_update",
+            "template",
+            "libraries",
+            "rest",
+            "alerts",
+            "openapi",
+        ):
+            assert stage_name in stage_names
+        stages = {stage["name"]: stage for stage in profile["stages"]}
+        assert stages["rest"]["files_written"] > 0
+        assert stages["rest"]["bytes_written"] > 0
+        assert profile["max_rss"] > 0
+        assert path.exists(path.join(temp_dir, "build_profile.trace.json"))
+
+
+def test_ucc_generate_with_profile_when_up_to_date():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        package_folder = path.join(
+            path.dirname(path.realpath(__file__)),
+            "..",
+            "testdata",
+            "test_addons",
+            "package_global_config_configuration",
+            "package",
+        )
+        build.generate(
+            source=package_folder,
+            output_directory=temp_dir,
+            addon_version="1.1.1",
+            incremental=True,
+        )
+        build.generate(
+            source=package_folder,
+            output_directory=temp_dir,
+            addon_version="1.1.1",
+            incremental=True,
+            profile=True,
+        )
+
+        with open(path.join(temp_dir, "build_profile.json")) as profile_file:
+            profile = json.load(profile_file)
+        assert profile["stages"] == []
+        assert path.exists(path.join(temp_dir, "build_profile.trace.json"))
+        assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.parametrize("materializer", ["copy", "reflink"])
+def test_ucc_generate_does_not_change_sources(materializer):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        package_folder = path.join(
+            path.dirname(path.realpath(__file__)),
+            "..",
+            "testdata",
+            "test_addons",
+            "package_global_config_configuration",
+            "package",
+        )
+        source_app_conf_path = path.join(package_folder, "default", "app.conf")
+        with open(source_app_conf_path) as source_app_conf_file:
+            source_app_conf = source_app_conf_file.read()
+        source_readme_path = path.join(package_folder, "README.txt")
+        with open(source_readme_path) as source_readme_file:
+            source_readme = source_readme_file.read()
+        template_view_path = path.join(
+            path.dirname(build.__file__),
+            "..",
+            "package",
+            "default",
+            "data",
+            "ui",
+            "views",
+            "configuration.xml",
+        )
+        with open(template_view_path) as template_view_file:
+            template_view = template_view_file.read()
+
+        build.generate(
+            source=package_folder,
+            output_directory=temp_dir,
+            addon_version="1.1.1",
+            materializer=materializer,
+        )
+        actual_folder = path.join(temp_dir, "Splunk_TA_UCCExample")
+        # Files of the output folder are modified in place.
+        with open(path.join(actual_folder, "README.txt"), "a") as output_readme_file:
+            output_readme_file.write("changed")
+
+        with open(source_app_conf_path) as source_app_conf_file:
+            assert source_app_conf_file.read() == source_app_conf
+        with open(template_view_path) as template_view_file:
+            assert template_view_file.read() == template_view
+        with open(source_readme_path) as source_readme_file:
+            assert source_readme_file.read() == source_readme
+        with open(
+            path.join(
+                actual_folder, "default", "data", "ui", "views", "configuration.xml"
+            )
+        ) as output_view_file:
+            assert "${package.name}" not in output_view_file.read()
+
+
+def test_ucc_generate_with_uccignore():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        addon_folder = path.join(temp_dir, "addon")
+        shutil.copytree(
+            path.join(
+                path.dirname(path.realpath(__file__)),
+                "..",
+                "testdata",
+                "test_addons",
+                "package_global_config_inputs_configuration_alerts",
+            ),
+            addon_folder,
+        )
+        with open(path.join(addon_folder, ".uccignore"), "w") as ignore_file:
+            ignore_file.write("default/data/ui/views/configuration.xml\n")
+            ignore_file.write("bin/example_input_one.py\n")
+        output_folder = path.join(temp_dir, "output")
+
+        build.generate(
+            source=path.join(addon_folder, "package"),
+            output_directory=output_folder,
+            addon_version="1.1.1",
+        )
+
+        actual_folder = path.join(output_folder, "Splunk_TA_UCCExample")
+        assert not path.exists(
+            path.join(
+                actual_folder, "default", "data", "ui", "views", "configuration.xml"
+            )
+        )
+        assert not path.exists(path.join(actual_folder, "bin", "example_input_one.py"))
+        assert path.exists(
+            path.join(actual_folder, "default", "data", "ui", "views", "inputs.xml")
+        )
+        assert path.exists(path.join(actual_folder, "bin", "example_input_two.py"))
+
+
+def test_ucc_generate_with_archive_is_equal_to_output():
+    with tempfile.TemporaryDirectory() as output_dir:
+        with tempfile.TemporaryDirectory() as archive_dir:
+            package_folder = path.join(
+                path.dirname(path.realpath(__file__)),
+                "..",
+                "testdata",
+                "test_addons",
+                "package_global_config_inputs_configuration_alerts",
+                "package",
+            )
+            build.generate(
+                source=package_folder,
+                output_directory=output_dir,
+                addon_version="1.1.1",
+            )
+            archive_path = path.join(archive_dir, "Splunk_TA_UCCExample.spl")
+            build.generate(
+                source=package_folder,
+                output_directory=path.join(archive_dir, "output"),
+                addon_version="1.1.1",
+                archive=archive_path,
+                archive_threads=2,
+            )
+            extracted_dir = path.join(archive_dir, "extracted")
+            with tarfile.open(archive_path) as tar:
+                names = tar.getnames()
+                tar.extractall(extracted_dir)
+
+            assert names == sorted(names, key=lambda name: name.split("/"))
+            output_files = _get_relative_file_paths(
+                path.join(output_dir, "Splunk_TA_UCCExample")
+            )
+            archive_files = _get_relative_file_paths(
+                path.join(extracted_dir, "Splunk_TA_UCCExample")
+            )
+            assert output_files == archive_files
+            _compare_app_conf(
+                path.join(output_dir, "Splunk_TA_UCCExample"),
+                path.join(extracted_dir, "Splunk_TA_UCCExample"),
+            )
+            for f in output_files - {("default", "app.conf")}:
+                with open(
+                    path.join(output_dir, "Splunk_TA_UCCExample", *f), "rb"
+                ) as output_file:
+                    with open(
+                        path.join(extracted_dir, "Splunk_TA_UCCExample", *f), "rb"
+                    ) as archive_file:
+                        assert output_file.read() == archive_file.read(), f
+
+
+def test_ucc_generate_with_compile():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        package_folder = path.join(
+            path.dirname(path.realpath(__file__)),
+            "..",
+            "testdata",
+            "test_addons",
+            "package_global_config_inputs_configuration_alerts",
+            "package",
+        )
+        output_dir = path.join(temp_dir, "output")
+        build.generate(
+            source=package_folder,
+            output_directory=output_dir,
+            addon_version="1.1.1",
+            compile_bytecode=True,
+        )
+        archive_path = path.join(temp_dir, "Splunk_TA_UCCExample.spl")
+        build.generate(
+            source=package_folder,
+            output_directory=path.join(temp_dir, "archive_output"),
+            addon_version="1.1.1",
+            archive=archive_path,
+            compile_bytecode=True,
+        )
+        extracted_dir = path.join(temp_dir, "extracted")
+        with tarfile.open(archive_path) as tar:
+            tar.extractall(extracted_dir)
+
+        output_files = _get_relative_file_paths(
+            path.join(output_dir, "Splunk_TA_UCCExample")
+        )
+        python_files = {
+            f for f in output_files if f[0] in ("bin", "lib") and f[-1].endswith(".py")
+        }
+        bytecode_files = {f for f in output_files if f[-1].endswith(".pyc")}
+        assert python_files
+        for f in python_files:
+            cache_prefix = f[-1][: -len(".py")] + "."
+            assert any(
+                bytecode_file[:-1] == f[:-1] + ("__pycache__",)
+                and bytecode_file[-1].startswith(cache_prefix)
+                for bytecode_file in bytecode_files
+            ), f
+        archive_files = _get_relative_file_paths(
+            path.join(extracted_dir, "Splunk_TA_UCCExample")
+        )
+        assert bytecode_files <= archive_files
+        # Bytecode only depends on the sources, not on where they were
+        # compiled from.
+        for f in bytecode_files:
+            with open(path.join(output_dir, "Splunk_TA_UCCExample", *f), "rb") as o:
+                with open(
+                    path.join(extracted_dir, "Splunk_TA_UCCExample", *f), "rb"
+                ) as a:
+                    assert o.read() == a.read(), f
+
+
+def test_ucc_generate_with_compile_keeps_bytecode_of_produced_files():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        addon_folder = path.join(temp_dir, "addon")
+        shutil.copytree(
+            path.join(
+                path.dirname(path.realpath(__file__)),
+                "..",
+                "testdata",
+                "test_addons",
+                "package_global_config_inputs_configuration_alerts",
+            ),
+            addon_folder,
+        )
+        package_folder = path.join(addon_folder, "package")
+        extra_file_path = path.join(package_folder, "bin", "extra.py")
+        with open(extra_file_path, "w") as f:
+            f.write("EXTRA = 1\n")
+        output_dir = path.join(temp_dir, "output")
+        bin_folder = path.join(output_dir, "Splunk_TA_UCCExample", "bin")
+        build.generate(
+            source=package_folder,
+            output_directory=output_dir,
+            addon_version="1.1.1",
+            incremental=True,
+            compile_bytecode=True,
+        )
+        bytecode_files = set(os.listdir(path.join(bin_folder, "__pycache__")))
+        assert any(f.startswith("extra.") for f in bytecode_files)
+        os.remove(extra_file_path)
+
+        build.generate(
+            source=package_folder,
+            output_directory=output_dir,
+            addon_version="1.1.1",
+            incremental=True,
+            compile_bytecode=True,
+        )
+
+        assert set(os.listdir(path.join(bin_folder, "__pycache__"))) == {
+            f for f in bytecode_files if not f.startswith("extra.")
+        }
+
+        build.generate(
+            source=package_folder,
+            output_directory=output_dir,
+            addon_version="1.1.1",
+            incremental=True,
+        )
+
+        assert not path.exists(path.join(bin_folder, "__pycache__"))
+
+
+def test_ucc_generate_with_lib_cache(monkeypatch):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monkeypatch.setenv("XDG_CACHE_HOME", path.join(temp_dir, "cache"))
+        addon_folder = path.join(temp_dir, "addon")
+        shutil.copytree(
+            path.join(
+                path.dirname(path.realpath(__file__)),
+                "..",
+                "testdata",
+                "test_addons",
+                "package_global_config_configuration",
+            ),
+            addon_folder,
+        )
+        package_folder = path.join(addon_folder, "package")
+        # Only libraries of pinned requirements are cached.
+        with open(path.join(package_folder, "lib", "requirements.txt"), "w") as f:
+            f.write("splunktaucclib==8.2.0\n")
+        for output_folder in ("first", "second"):
+            build.generate(
+                source=package_folder,
+                output_directory=path.join(temp_dir, output_folder),
+                addon_version="1.1.1",
+            )
+
+        cache_folder = path.join(temp_dir, "cache", "ucc-gen", "libs")
+        (cache_key,) = os.listdir(cache_folder)
+        lib_file = ("splunktaucclib", "__init__.py")
+        cached_lib_file = path.join(cache_folder, cache_key, *lib_file)
+        with open(cached_lib_file, "rb") as f:
+            cached_content = f.read()
+        for output_folder in ("first", "second"):
+            output_lib_file = path.join(
+                temp_dir, output_folder, "Splunk_TA_UCCExample", "lib", *lib_file
+            )
+            with open(output_lib_file, "rb") as f:
+                assert f.read() == cached_content
+            # Changes of the add-on libraries do not change the cache.
+            with open(output_lib_file, "ab") as f:
+                f.write(b"# changed\n")
+        with open(cached_lib_file, "rb") as f:
+            assert f.read() == cached_content
+
+
+@pytest.mark.parametrize("compile_bytecode", [False, True])
+def test_ucc_generate_with_watch_regenerates_rest_handlers(
+    monkeypatch, compile_bytecode
+):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        addon_folder = path.join(temp_dir, "addon")
+        shutil.copytree(
+            path.join(
+                path.dirname(path.realpath(__file__)),
+                "..",
+                "testdata",
+                "test_addons",
+                "package_global_config_configuration",
+            ),
+            addon_folder,
+        )
+        package_folder = path.join(addon_folder, "package")
+        config_path = path.join(addon_folder, "globalConfig.json")
+        watch_dir = path.join(temp_dir, "watch")
+        full_dir = path.join(temp_dir, "full")
+        session = watch.WatchSession(
+            source=package_folder,
+            addon_version="1.1.1",
+            output_directory=watch_dir,
+            compile_bytecode=compile_bytecode,
+        )
+        session.build()
+
+        with open(config_path) as f:
+            global_config = json.load(f)
+        for tab in global_config["pages"]["configuration"]["tabs"]:
+            if tab["name"] == "custom_abc":
+                tab["entity"].append(
+                    {"field": "testNew", "label": "Test New", "type": "text"}
+                )
+        with open(config_path, "w") as f:
+            json.dump(global_config, f)
+        generate_calls = []
+        monkeypatch.setattr(
+            build, "generate", lambda **kwargs: generate_calls.append(kwargs)
+        )
+        session.rebuild({path.abspath(config_path)})
+        monkeypatch.undo()
+
+        assert generate_calls == []
+        build.generate(
+            source=package_folder,
+            output_directory=full_dir,
+            addon_version="1.1.1",
+            compile_bytecode=compile_bytecode,
+        )
+        watch_files = _get_relative_file_paths(watch_dir)
+        assert watch_files == _get_relative_file_paths(full_dir)
+        ignored_files = {
+            ("Splunk_TA_UCCExample", "default", "app.conf"),
+            # Outputs of the regenerated stages are left for the next build
+            # to check.
+            (build_manifest.BUILD_MANIFEST_FILE_NAME,),
+        }
+        for f in watch_files - ignored_files:
+            with open(path.join(watch_dir, *f), "rb") as watch_file:
+                with open(path.join(full_dir, *f), "rb") as full_file:
+                    assert watch_file.read() == full_file.read(), f
+        with open(
+            path.join(
+                watch_dir,
+                "Splunk_TA_UCCExample",
+                "README",
+                "splunk_ta_uccexample_settings.conf.spec",
+            )
+        ) as spec_file:
+            assert "testNew" in spec_file.read()
@@ -10,6 +10,7 @@ from splunktaucclib.rest_handler.endpoint import (
 from splunktaucclib.rest_handler import admin_external, util
 from splunktaucclib.rest_handler.admin_external import AdminExternalHandler
 import logging
+import splunk_ta_uccexample_validators
 
 util.remove_http_proxy_env_vars()
 
@@ -34,40 +35,28 @@ fields_proxy = [
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.String(
-            max_len=4096, 
-            min_len=0, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_2cf5bc06
     ), 
     field.RestField(
         'proxy_port',
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.Number(
-            max_val=65535, 
-            min_val=1, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_2aa0dc3f
     ), 
     field.RestField(
         'proxy_username',
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.String(
-            max_len=50, 
-            min_len=0, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_d0c0f6f5
     ), 
     field.RestField(
         'proxy_password',
         required=False,
         encrypted=True,
         default=None,
-        validator=validator.String(
-            max_len=8192, 
-            min_len=0, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_cd4ad74b
     ), 
     field.RestField(
         'proxy_rdns',
@@ -98,65 +87,49 @@ fields_custom_abc = [
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.String(
-            max_len=10, 
-            min_len=5, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_5348a019
     ), 
     field.RestField(
         'testNumber',
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.Number(
-            max_val=10, 
-            min_val=1, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_057fca04
     ), 
     field.RestField(
         'testRegex',
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.Pattern(
-            regex=r"""^\w+$""", 
-        )
+        validator=splunk_ta_uccexample_validators.validator_f1382f8c
     ), 
     field.RestField(
         'testEmail',
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.Pattern(
-            regex=r"""^[a-zA-Z0-9.!#$%&'*+\/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$""", 
-        )
+        validator=splunk_ta_uccexample_validators.validator_8da12ad4
     ), 
     field.RestField(
         'testIpv4',
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.Pattern(
-            regex=r"""^(?:(?:[0-1]?\d{1,2}|2[0-4]\d|25[0-5])(?:\.|$)){4}$""", 
-        )
+        validator=splunk_ta_uccexample_validators.validator_6702b5f4
     ), 
     field.RestField(
         'testDate',
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.Pattern(
-            regex=r"""^\s*((?:[+-]\d{6}|\d{4})-(?:\d\d-\d\d|W\d\d-\d|W\d\d|\d\d\d|\d\d))(?:(T| )(\d\d(?::\d\d(?::\d\d(?:[.,]\d+)?)?)?)([\+\-]\d\d(?::?\d\d)?|\s*Z)?)?$""", 
-        )
+        validator=splunk_ta_uccexample_validators.validator_b5fb3b2f
     ), 
     field.RestField(
         'testUrl',
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.Pattern(
-            regex=r"""^(?:(?:https?|ftp|opc\.tcp):\/\/)?(?:\S+(?::\S*)?@)?(?:(?:[1-9]\d?|1\d\d|2[01]\d|22[0-3])(?:\.(?:1?\d{1,2}|2[0-4]\d|25[0-5])){2}(?:\.(?:[1-9]\d?|1\d\d|2[0-4]\d|25[0-4]))|(?:(?:[a-z\u00a1-\uffff0-9]+-?_?)*[a-z\u00a1-\uffff0-9]+)(?:\.(?:[a-z\u00a1-\uffff0-9]+-?)*[a-z\u00a1-\uffff0-9]+)*(?:\.(?:[a-z\u00a1-\uffff]{2,}))?)(?::\d{2,5})?(?:\/[^\s]*)?$""", 
-        )
+        validator=splunk_ta_uccexample_validators.validator_03d45d65
     )
 ]
 model_custom_abc = RestModel(fields_custom_abc, name='custom_abc')
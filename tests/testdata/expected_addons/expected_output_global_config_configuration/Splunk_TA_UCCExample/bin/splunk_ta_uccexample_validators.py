@@ -0,0 +1,150 @@
+from splunktaucclib.rest_handler.endpoint import validator
+
+
+def is_email(value):
+    local_part, at, domain = value.partition("@")
+    if not local_part or not at:
+        return False
+    alphanumeric = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    if not set(local_part) <= set(alphanumeric + ".!#$%&'*+/=?^_`{|}~-"):
+        return False
+    if not set(domain) <= set(alphanumeric + "-."):
+        return False
+    for label in domain.split("."):
+        if not 0 < len(label) <= 63 or label[0] == "-" or label[-1] == "-":
+            return False
+    return True
+
+
+class EmailAddress(validator.Validator):
+    def __init__(self):
+        super().__init__()
+        self.put_msg('Invalid email address')
+
+    def validate(self, value, data):
+        return is_email(value)
+
+
+def is_ipv4(value):
+    import ipaddress
+
+    try:
+        address = ipaddress.IPv4Address(value)
+    except ValueError:
+        return False
+    # Older Python versions accept octets with leading zeros.
+    return str(address) == value
+
+
+class Ipv4Address(validator.Validator):
+    def __init__(self):
+        super().__init__()
+        self.put_msg('Invalid IPv4 address')
+
+    def validate(self, value, data):
+        return is_ipv4(value)
+
+
+def is_date(value):
+    import datetime
+
+    # `fromisoformat` accepts "Z" only since Python 3.11.
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+class IsoDate(validator.Validator):
+    def __init__(self):
+        super().__init__()
+        self.put_msg('Invalid ISO 8601 date')
+
+    def validate(self, value, data):
+        return is_date(value)
+
+
+def is_url(value):
+    import ipaddress
+    from urllib import parse
+
+    if any(char.isspace() for char in value):
+        return False
+    scheme, separator, _ = value.partition("://")
+    if not separator or "/" in scheme:
+        # The scheme is optional.
+        value = "//" + value
+    try:
+        url = parse.urlsplit(value)
+        # Raises ValueError if the port is not a number from 0 to 65535.
+        url.port
+    except ValueError:
+        return False
+    if url.scheme not in ("", "http", "https", "ftp", "opc.tcp") or not url.hostname:
+        return False
+    try:
+        ipaddress.ip_address(url.hostname)
+        return True
+    except ValueError:
+        pass
+    for label in url.hostname.split("."):
+        if not label or label[0] in "-_" or label[-1] in "-_":
+            return False
+        if not label.replace("-", "").replace("_", "").isalnum():
+            return False
+    return True
+
+
+class Url(validator.Validator):
+    def __init__(self):
+        super().__init__()
+        self.put_msg('Invalid URL')
+
+    def validate(self, value, data):
+        return is_url(value)
+
+
+validator_2cf5bc06 = validator.String(
+    max_len=4096,
+    min_len=0,
+)
+
+validator_2aa0dc3f = validator.Number(
+    max_val=65535,
+    min_val=1,
+)
+
+validator_d0c0f6f5 = validator.String(
+    max_len=50,
+    min_len=0,
+)
+
+validator_cd4ad74b = validator.String(
+    max_len=8192,
+    min_len=0,
+)
+
+validator_5348a019 = validator.String(
+    max_len=10,
+    min_len=5,
+)
+
+validator_057fca04 = validator.Number(
+    max_val=10,
+    min_val=1,
+)
+
+validator_f1382f8c = validator.Pattern(
+    regex=r"""^\w+$""",
+)
+
+validator_8da12ad4 = EmailAddress()
+
+validator_6702b5f4 = Ipv4Address()
+
+validator_b5fb3b2f = IsoDate()
+
+validator_03d45d65 = Url()
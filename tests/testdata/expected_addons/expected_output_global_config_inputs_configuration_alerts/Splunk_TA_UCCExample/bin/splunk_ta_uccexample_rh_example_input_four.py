@@ -10,6 +10,7 @@ from splunktaucclib.rest_handler.endpoint import (
 from splunktaucclib.rest_handler import admin_external, util
 from splunk_ta_uccexample_custom_rh import CustomRestHandler
 import logging
+import splunk_ta_uccexample_validators
 
 util.remove_http_proxy_env_vars()
 
@@ -20,9 +21,7 @@ fields = [
         required=True,
         encrypted=False,
         default=None,
-        validator=validator.Pattern(
-            regex=r"""^\-[1-9]\d*$|^\d*$""", 
-        )
+        validator=splunk_ta_uccexample_validators.validator_cda90c7c
     ), 
 
     field.RestField(
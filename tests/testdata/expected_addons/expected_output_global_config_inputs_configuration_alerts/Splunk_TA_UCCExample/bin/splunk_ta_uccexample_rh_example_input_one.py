@@ -10,6 +10,7 @@ from splunktaucclib.rest_handler.endpoint import (
 from splunktaucclib.rest_handler import admin_external, util
 from splunktaucclib.rest_handler.admin_external import AdminExternalHandler
 import logging
+import splunk_ta_uccexample_validators
 
 util.remove_http_proxy_env_vars()
 
@@ -48,19 +49,14 @@ fields = [
         required=True,
         encrypted=False,
         default=None,
-        validator=validator.Pattern(
-            regex=r"""^\-[1-9]\d*$|^\d*$""", 
-        )
+        validator=splunk_ta_uccexample_validators.validator_cda90c7c
     ), 
     field.RestField(
         'index',
         required=True,
         encrypted=False,
         default='default',
-        validator=validator.String(
-            max_len=80, 
-            min_len=1, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_3d3f7f56
     ), 
     field.RestField(
         'account',
@@ -74,30 +70,21 @@ fields = [
         required=True,
         encrypted=False,
         default=None,
-        validator=validator.String(
-            max_len=8192, 
-            min_len=0, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_cd4ad74b
     ), 
     field.RestField(
         'object_fields',
         required=True,
         encrypted=False,
         default=None,
-        validator=validator.String(
-            max_len=8192, 
-            min_len=0, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_cd4ad74b
     ), 
     field.RestField(
         'order_by',
         required=True,
         encrypted=False,
         default='LastModifiedDate',
-        validator=validator.String(
-            max_len=8192, 
-            min_len=0, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_cd4ad74b
     ), 
     field.RestField(
         'use_existing_checkpoint',
@@ -111,19 +98,14 @@ fields = [
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.Pattern(
-            regex=r"""^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}.\d{3}z)?$""", 
-        )
+        validator=splunk_ta_uccexample_validators.validator_e645f78b
     ), 
     field.RestField(
         'limit',
         required=False,
         encrypted=False,
         default='1000',
-        validator=validator.String(
-            max_len=8192, 
-            min_len=0, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_cd4ad74b
     ), 
     field.RestField(
         'example_help_link',
@@ -10,6 +10,7 @@ from splunktaucclib.rest_handler.endpoint import (
 from splunktaucclib.rest_handler import admin_external, util
 from splunktaucclib.rest_handler.admin_external import AdminExternalHandler
 import logging
+import splunk_ta_uccexample_validators
 
 util.remove_http_proxy_env_vars()
 
@@ -20,19 +21,14 @@ fields = [
         required=True,
         encrypted=False,
         default=None,
-        validator=validator.Pattern(
-            regex=r"""^\-[1-9]\d*$|^\d*$""", 
-        )
+        validator=splunk_ta_uccexample_validators.validator_cda90c7c
     ), 
     field.RestField(
         'index',
         required=True,
         encrypted=False,
         default='default',
-        validator=validator.String(
-            max_len=80, 
-            min_len=1, 
-        )
+        validator=splunk_ta_uccexample_validators.validator_3d3f7f56
     ), 
     field.RestField(
         'account',
@@ -74,9 +70,7 @@ fields = [
         required=False,
         encrypted=False,
         default=None,
-        validator=validator.Pattern(
-            regex=r"""^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}.\d{3}z)?$""", 
-        )
+        validator=splunk_ta_uccexample_validators.validator_e645f78b
     ), 
     field.RestField(
         'example_help_link',
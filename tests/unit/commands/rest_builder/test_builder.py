@@ -0,0 +1,63 @@
+import os
+import stat
+
+from splunk_add_on_ucc_framework import global_config as global_config_lib
+from splunk_add_on_ucc_framework import template_env
+from splunk_add_on_ucc_framework.commands.rest_builder import (
+    global_config_builder_schema,
+    global_config_post_processor,
+)
+from splunk_add_on_ucc_framework.commands.rest_builder.builder import RestBuilder
+from tests.unit.helpers import get_testdata_file_path
+
+
+def _get_schema():
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(get_testdata_file_path("valid_config.json"), False)
+    return global_config_builder_schema.GlobalConfigBuilderSchema(
+        global_config, template_env.get_environment()
+    )
+
+
+def _build(output_dir):
+    schema = _get_schema()
+    RestBuilder(
+        schema,
+        str(output_dir),
+        post_processors=(global_config_post_processor.GlobalConfigPostProcessor(),),
+    ).build()
+    return schema
+
+
+def test_rest_builder_post_processes_files_before_saving(tmp_path):
+    schema = _build(tmp_path)
+
+    bin_path = tmp_path / "bin"
+    assert (bin_path / "import_declare_test.py").read_text().startswith("\nimport os\n")
+    for endpoint in schema.endpoints:
+        content = (bin_path / (endpoint.rh_name + ".py")).read_text()
+        assert content.startswith("\nimport import_declare_test\n")
+        assert content.count("import import_declare_test\n") == 1
+
+
+def test_rest_builder_makes_bin_files_executable(tmp_path):
+    _build(tmp_path)
+
+    bin_files = os.listdir(tmp_path / "bin")
+    assert "import_declare_test.py" in bin_files
+    for file_name in bin_files:
+        mode = os.stat(tmp_path / "bin" / file_name).st_mode
+        assert mode & stat.S_IXUSR
+    assert not os.stat(tmp_path / "default" / "restmap.conf").st_mode & stat.S_IXUSR
+
+
+def test_rest_builder_fixes_mode_of_unchanged_files(tmp_path):
+    _build(tmp_path)
+    import_declare_path = tmp_path / "bin" / "import_declare_test.py"
+    os.chmod(import_declare_path, 0o644)
+    mtime = os.stat(import_declare_path).st_mtime_ns
+
+    _build(tmp_path)
+
+    assert os.stat(import_declare_path).st_mode & stat.S_IXUSR
+    assert os.stat(import_declare_path).st_mtime_ns == mtime
@@ -1,6 +1,7 @@
 import pytest
 
 from splunk_add_on_ucc_framework.commands.rest_builder.validator_builder import (
+    SharedValidators,
     ValidatorBuilder,
 )
 from tests.unit.helpers import get_testdata_file
@@ -113,3 +114,64 @@ from tests.unit.helpers import get_testdata_file
 )
 def test_validator_builder(config, expected_result):
     assert expected_result == ValidatorBuilder().build(config)
+
+
+def test_shared_validators():
+    shared_validators = SharedValidators("splunk_ta_uccexample")
+    assert not shared_validators
+
+    assert shared_validators.add(None) is None
+    assert shared_validators.add([{"type": "file"}]) is None
+    string_regex = shared_validators.add(
+        [
+            {"type": "regex", "pattern": "^[a-zA-Z]\\w*$"},
+            {"type": "string", "minLength": 1, "maxLength": 100},
+        ]
+    )
+    url = shared_validators.add([{"type": "url"}])
+    url_again = shared_validators.add([{"type": "url"}])
+    regex = shared_validators.add([{"type": "regex", "pattern": "^[a-zA-Z]\\w*$"}])
+
+    assert shared_validators
+    assert string_regex == "splunk_ta_uccexample_validators.validator_2a31285b"
+    assert url == url_again == "splunk_ta_uccexample_validators.validator_03d45d65"
+    assert regex == "splunk_ta_uccexample_validators.validator_4935f1a9"
+    assert shared_validators.generate() == get_testdata_file("shared_validators_result")
+
+
+def test_shared_validators_generate_separates_definitions():
+    shared_validators = SharedValidators("splunk_ta_uccexample")
+    shared_validators.add([{"type": "email"}])
+    shared_validators.add([{"type": "ipv4"}])
+
+    module = shared_validators.generate()
+
+    compile(module, "splunk_ta_uccexample_validators.py", "exec")
+    assert "\n\n\n\n" not in module
+    assert "\n\n\nclass Ipv4Address(" in module
+    assert "\n\n\ndef is_ipv4(" in module
+    assert module.endswith("validator_6702b5f4 = Ipv4Address()\n")
+
+
+def test_shared_validators_names_do_not_depend_on_other_fields():
+    url = [{"type": "url"}]
+    shared_validators = SharedValidators("splunk_ta_uccexample")
+    name = shared_validators.add(url)
+    other_shared_validators = SharedValidators("splunk_ta_uccexample")
+    other_shared_validators.add([{"type": "email"}])
+
+    assert other_shared_validators.add(url) == name
+
+
+def test_shared_validators_generate_has_no_trailing_whitespace():
+    shared_validators = SharedValidators("splunk_ta_uccexample")
+    shared_validators.add(
+        [
+            {"type": "regex", "pattern": "^\\d+$"},
+            {"type": "string", "minLength": 1, "maxLength": 100},
+        ]
+    )
+
+    module = shared_validators.generate()
+
+    assert all(line == line.rstrip() for line in module.splitlines())
@@ -0,0 +1,46 @@
+import os
+from unittest import mock
+
+import pytest
+
+from splunk_add_on_ucc_framework.commands import fetch_wheels
+from splunk_add_on_ucc_framework.install_python_libraries import (
+    CouldNotInstallRequirements,
+)
+
+
+@mock.patch("splunk_add_on_ucc_framework.commands.fetch_wheels.download_wheels")
+def test_fetch_wheels(mock_download_wheels, tmp_path):
+    (tmp_path / "package" / "lib").mkdir(parents=True)
+    (tmp_path / "package" / "lib" / "requirements.txt").write_text("splunktaucclib\n")
+    wheelhouse = str(tmp_path / "wheelhouse")
+
+    fetch_wheels.fetch_wheels(str(tmp_path / "package"), wheelhouse)
+
+    mock_download_wheels.assert_called_once_with(
+        os.path.join(str(tmp_path / "package"), "lib", "requirements.txt"),
+        wheelhouse,
+        "python3",
+    )
+    assert os.path.isdir(wheelhouse)
+
+
+def test_fetch_wheels_when_no_requirements_file(tmp_path, caplog):
+    with pytest.raises(SystemExit):
+        fetch_wheels.fetch_wheels(
+            str(tmp_path / "package"), str(tmp_path / "wheelhouse")
+        )
+
+    assert "Could not find requirements file" in caplog.text
+
+
+@mock.patch("splunk_add_on_ucc_framework.commands.fetch_wheels.download_wheels")
+def test_fetch_wheels_when_pip_fails(mock_download_wheels, tmp_path):
+    mock_download_wheels.side_effect = CouldNotInstallRequirements
+    (tmp_path / "package" / "lib").mkdir(parents=True)
+    (tmp_path / "package" / "lib" / "requirements.txt").write_text("splunktaucclib\n")
+
+    with pytest.raises(SystemExit):
+        fetch_wheels.fetch_wheels(
+            str(tmp_path / "package"), str(tmp_path / "wheelhouse")
+        )
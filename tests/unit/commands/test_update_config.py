@@ -0,0 +1,45 @@
+import shutil
+
+import pytest
+
+import tests.unit.helpers as helpers
+from splunk_add_on_ucc_framework import global_config as global_config_lib
+from splunk_add_on_ucc_framework.commands import update_config
+
+
+def _create_config(tmp_path):
+    (tmp_path / "package").mkdir()
+    config_path = str(tmp_path / "globalConfig.json")
+    shutil.copy(
+        helpers.get_testdata_file_path("config_with_biased_terms.json"), config_path
+    )
+    return str(tmp_path / "package"), config_path
+
+
+def test_update_config(tmp_path):
+    package_path, config_path = _create_config(tmp_path)
+
+    update_config.update_config(package_path)
+
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(config_path, False)
+    assert global_config.schema_version == "0.0.3"
+
+
+def test_update_config_dry_run(tmp_path, caplog):
+    package_path, config_path = _create_config(tmp_path)
+    with open(config_path) as f:
+        original_content = f.read()
+
+    update_config.update_config(package_path, dry_run=True)
+
+    with open(config_path) as f:
+        assert f.read() == original_content
+    assert "3 updates would be applied" in caplog.text
+
+
+def test_update_config_when_no_config(tmp_path, caplog):
+    with pytest.raises(SystemExit):
+        update_config.update_config(str(tmp_path / "package"))
+
+    assert "Could not find globalConfig file" in caplog.text
@@ -0,0 +1,149 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import tests.unit.helpers as helpers
+from splunk_add_on_ucc_framework.commands import validate
+
+ADDON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "testdata",
+    "test_addons",
+    "package_global_config_configuration",
+)
+
+
+def _create_addon(tmp_path, global_config=None):
+    shutil.copytree(os.path.join(ADDON_PATH, "package"), str(tmp_path / "package"))
+    config_path = str(tmp_path / "globalConfig.json")
+    if global_config is None:
+        shutil.copy(os.path.join(ADDON_PATH, "globalConfig.json"), config_path)
+    else:
+        with open(config_path, "w") as f:
+            json.dump(global_config, f)
+    return str(tmp_path / "package"), config_path
+
+
+def test_get_diagnostics(tmp_path):
+    package_path, config_path = _create_addon(tmp_path)
+    with open(config_path) as f:
+        global_config_content = f.read()
+
+    diagnostics = validate.get_diagnostics(package_path)
+
+    assert diagnostics == {
+        "valid": True,
+        "config": config_path,
+        "errors": [],
+        "warnings": [],
+        "pending_updates": [],
+    }
+    with open(config_path) as f:
+        assert f.read() == global_config_content
+
+
+def test_get_diagnostics_when_global_config_is_not_valid(tmp_path):
+    package_path, config_path = _create_addon(tmp_path, global_config={"meta": {}})
+
+    diagnostics = validate.get_diagnostics(package_path)
+
+    assert diagnostics["valid"] is False
+    assert diagnostics["errors"]
+    for error in diagnostics["errors"]:
+        assert error["file"] == config_path
+        assert error["message"]
+
+
+def test_get_diagnostics_with_warnings(tmp_path):
+    with open(os.path.join(ADDON_PATH, "globalConfig.json")) as f:
+        global_config = json.load(f)
+    entity = global_config["pages"]["configuration"]["tabs"][0]["entity"][0]
+    entity["validators"] = [
+        {"type": "regex", "errorMsg": "Not valid", "pattern": r"^(\w+\.)+com$"}
+    ]
+    package_path, config_path = _create_addon(tmp_path, global_config=global_config)
+
+    diagnostics = validate.get_diagnostics(package_path)
+
+    assert diagnostics["valid"] is True
+    assert diagnostics["warnings"] == [
+        {
+            "file": config_path,
+            "path": "/pages/configuration/tabs/0/entity/0/validators/0",
+            "message": f"Entity '{entity['field']}' has regex validator which "
+            f"may take exponential time to match: star height 2.",
+        }
+    ]
+
+
+def test_get_diagnostics_when_global_config_can_not_be_parsed(tmp_path):
+    package_path, config_path = _create_addon(tmp_path)
+    with open(config_path, "w") as f:
+        f.write("{")
+
+    diagnostics = validate.get_diagnostics(package_path)
+
+    assert diagnostics["valid"] is False
+    assert diagnostics["errors"][0]["message"].startswith("Could not parse")
+
+
+def test_get_diagnostics_when_app_manifest_is_not_valid(tmp_path):
+    package_path, _ = _create_addon(tmp_path)
+    with open(os.path.join(package_path, "app.manifest"), "w") as f:
+        f.write("not a manifest")
+
+    diagnostics = validate.get_diagnostics(package_path)
+
+    assert diagnostics["valid"] is False
+    assert diagnostics["errors"][0]["file"] == os.path.join(
+        package_path, "app.manifest"
+    )
+
+
+def test_get_diagnostics_with_pending_updates(tmp_path):
+    package_path, _ = _create_addon(tmp_path)
+
+    diagnostics = validate.get_diagnostics(
+        package_path, helpers.get_testdata_file_path("config_with_biased_terms.json")
+    )
+
+    assert diagnostics["valid"] is True
+    assert [update["schema_version"] for update in diagnostics["pending_updates"]] == [
+        "0.0.1",
+        "0.0.2",
+        "0.0.3",
+    ]
+
+
+def test_validate_json_output(tmp_path, capsys):
+    package_path, config_path = _create_addon(tmp_path, global_config={"meta": {}})
+
+    with pytest.raises(SystemExit) as exc_info:
+        validate.validate(package_path, output_format="json")
+
+    assert exc_info.value.code == 1
+    diagnostics = json.loads(capsys.readouterr().out)
+    assert diagnostics["valid"] is False
+    assert diagnostics["config"] == config_path
+
+
+def test_validate_text_output(tmp_path, caplog):
+    package_path, _ = _create_addon(tmp_path)
+
+    validate.validate(package_path)
+
+    assert "Add-on is valid" in caplog.text
+
+
+def test_get_diagnostics_when_yaml_global_config_can_not_be_parsed(tmp_path):
+    package_path, _ = _create_addon(tmp_path)
+    config_path = str(tmp_path / "globalConfig.yaml")
+    with open(config_path, "w") as f:
+        f.write("meta: [")
+
+    diagnostics = validate.get_diagnostics(package_path, config_path)
+
+    assert diagnostics["valid"] is False
+    assert diagnostics["errors"][0]["message"].startswith("Could not parse")
@@ -0,0 +1,102 @@
+import os
+from unittest import mock
+
+import pytest
+
+from splunk_add_on_ucc_framework.commands import watch
+
+
+def _create_addon(tmp_path):
+    (tmp_path / "package").mkdir()
+    (tmp_path / "package" / "app.manifest").write_text("{}")
+    (tmp_path / "globalConfig.json").write_text("{}")
+    return str(tmp_path / "package"), str(tmp_path / "globalConfig.json")
+
+
+def test_take_snapshot(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "b.txt").write_text("b")
+    (tmp_path / "c.txt").write_text("cc")
+
+    snapshot = watch.take_snapshot(
+        [str(tmp_path / "a"), str(tmp_path / "c.txt"), str(tmp_path / "missing")]
+    )
+
+    assert sorted(snapshot) == [
+        str(tmp_path / "a" / "b.txt"),
+        str(tmp_path / "c.txt"),
+    ]
+    assert snapshot[str(tmp_path / "c.txt")][1] == 2
+
+
+def test_get_changed_paths():
+    previous = {"a": (1, 1), "b": (1, 1), "c": (1, 1)}
+    current = {"a": (1, 1), "b": (2, 1), "d": (1, 1)}
+
+    assert watch.get_changed_paths(previous, current) == {"b", "c", "d"}
+
+
+@mock.patch("splunk_add_on_ucc_framework.commands.build.generate")
+def test_watch_session_build(mock_generate, tmp_path):
+    package_path, config_path = _create_addon(tmp_path)
+    session = watch.WatchSession(
+        package_path,
+        addon_version="1.0.0",
+        output_directory=str(tmp_path / "output"),
+        jobs=2,
+    )
+    os.remove(config_path)
+
+    session.build()
+
+    mock_generate.assert_called_once_with(
+        source=package_path,
+        config_path=config_path,
+        addon_version="1.0.0",
+        output_directory=str(tmp_path / "output"),
+        incremental=True,
+        jobs=2,
+    )
+
+
+@mock.patch("splunk_add_on_ucc_framework.commands.watch.WatchSession.build")
+def test_watch_session_rebuild_when_package_changed(mock_build, tmp_path):
+    package_path, config_path = _create_addon(tmp_path)
+    session = watch.WatchSession(package_path, addon_version="1.0.0")
+
+    session.rebuild({os.path.join(package_path, "app.manifest")})
+
+    mock_build.assert_called_once_with()
+
+
+@mock.patch("splunk_add_on_ucc_framework.commands.watch.WatchSession.build")
+def test_watch_session_rebuild_when_layout_changed(mock_build, tmp_path):
+    package_path, config_path = _create_addon(tmp_path)
+    session = watch.WatchSession(package_path, addon_version="1.0.0")
+    session._layout_signature = "previous"
+    global_config = mock.MagicMock()
+    global_config.inputs = [{"name": "new_input"}]
+    global_config.alerts = []
+    global_config.namespace = "namespace"
+    global_config.version = "1.0.0"
+    global_config.has_oauth.return_value = False
+    scheme = mock.MagicMock()
+    scheme.settings_conf_file_names = []
+    scheme.configs_conf_file_names = []
+    scheme.oauth_conf_file_names = []
+
+    with mock.patch.object(
+        session, "_load_global_config", return_value=(global_config, scheme)
+    ):
+        session.rebuild({os.path.abspath(config_path)})
+
+    mock_build.assert_called_once_with()
+
+
+def test_watch_with_archive(tmp_path, caplog):
+    package_path, _ = _create_addon(tmp_path)
+
+    with pytest.raises(SystemExit):
+        watch.watch(package_path, addon_version="1.0.0", archive="addon.tar.gz")
+
+    assert "Watch mode can't be used together with the archive" in caplog.text
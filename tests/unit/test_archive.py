@@ -0,0 +1,71 @@
+import gzip
+import io
+import os
+import tarfile
+
+import pytest
+
+from splunk_add_on_ucc_framework import archive
+from splunk_add_on_ucc_framework import output_tree as output_tree_lib
+
+
+def _compress(data, threads):
+    compressed = io.BytesIO()
+    with archive.ChunkedGzipWriter(compressed, threads) as gzip_file:
+        for start in range(0, len(data), 1000):
+            end = start + 1000
+            gzip_file.write(data[start:end])
+    return compressed.getvalue()
+
+
+@pytest.mark.parametrize(
+    "size", [0, 10, archive.CHUNK_SIZE, archive.CHUNK_SIZE * 3 + 7]
+)
+def test_chunked_gzip_writer(size):
+    data = bytes(i % 251 for i in range(size))
+
+    single_thread = _compress(data, 1)
+    multiple_threads = _compress(data, 4)
+
+    assert gzip.decompress(single_thread) == data
+    assert single_thread == multiple_threads
+
+
+def test_write_archive(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1600000000")
+    source = tmp_path / "source"
+    (source / "default").mkdir(parents=True)
+    (source / "default" / "app.conf").write_text("[launcher]\n")
+    (source / "default" / "b.conf").write_text("[b]\n")
+    output_tree = output_tree_lib.OutputTree()
+    output_tree.add_directory(str(source))
+    output_tree.add_content("VERSION", "1.0.0\n1.0.0")
+    addon_output_dir = tmp_path / "output" / "TA"
+    (addon_output_dir / "bin").mkdir(parents=True)
+    (addon_output_dir / "bin" / "input.py").write_text("print()\n")
+    os.chmod(addon_output_dir / "bin" / "input.py", 0o700)
+    (addon_output_dir / "default").mkdir()
+    (addon_output_dir / "default" / "b.conf").write_text("[generated]\n")
+    archive_path = tmp_path / "TA.tar.gz"
+
+    archive.write_archive(str(archive_path), "TA", output_tree, str(addon_output_dir))
+
+    with tarfile.open(archive_path) as tar:
+        members = tar.getmembers()
+        assert [member.name for member in members] == [
+            "TA",
+            "TA/VERSION",
+            "TA/bin",
+            "TA/bin/input.py",
+            "TA/default",
+            "TA/default/app.conf",
+            "TA/default/b.conf",
+        ]
+        assert {member.mtime for member in members} == {1600000000}
+        assert {(member.uid, member.gid) for member in members} == {(0, 0)}
+        modes = {member.name: member.mode for member in members}
+        assert modes["TA/bin"] == 0o755
+        assert modes["TA/bin/input.py"] == 0o755
+        assert modes["TA/default/app.conf"] == 0o644
+        assert tar.extractfile("TA/VERSION").read() == b"1.0.0\n1.0.0"
+        assert tar.extractfile("TA/default/b.conf").read() == b"[generated]\n"
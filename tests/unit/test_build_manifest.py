@@ -0,0 +1,215 @@
+import os
+
+import pytest
+
+from splunk_add_on_ucc_framework import build_manifest
+
+
+def _create_addon(tmp_path):
+    package_path = tmp_path / "package"
+    (package_path / "lib").mkdir(parents=True)
+    (package_path / "lib" / "requirements.txt").write_text("splunktaucclib\n")
+    (package_path / "app.manifest").write_text("{}")
+    global_config_path = tmp_path / "globalConfig.json"
+    global_config_path.write_text("{}")
+    return str(package_path), str(global_config_path)
+
+
+def _get_manifest(package_path, global_config_path, **kwargs):
+    parameters = {
+        "ucc_gen_version": "5.26.0",
+        "addon_version": "1.0.0",
+        "python_binary_name": "python3",
+        "source": package_path,
+        "config_path": global_config_path,
+    }
+    parameters.update(kwargs)
+    return build_manifest.BuildManifest.from_build_inputs(**parameters)
+
+
+def test_hash_file_when_file_does_not_exist(tmp_path):
+    assert build_manifest.hash_file(str(tmp_path / "not_existing")) is None
+
+
+def test_hash_directory_depends_on_file_names_and_content(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "file.txt").write_text("content")
+    first_hash = build_manifest.hash_directory(str(tmp_path / "a"))
+
+    (tmp_path / "a" / "file.txt").rename(tmp_path / "a" / "renamed.txt")
+    second_hash = build_manifest.hash_directory(str(tmp_path / "a"))
+
+    (tmp_path / "a" / "renamed.txt").write_text("another content")
+    third_hash = build_manifest.hash_directory(str(tmp_path / "a"))
+
+    assert len({first_hash, second_hash, third_hash}) == 3
+    assert build_manifest.hash_directory(str(tmp_path / "not_existing")) is None
+
+
+def test_stale_stages_when_no_previous_manifest(tmp_path):
+    package_path, global_config_path = _create_addon(tmp_path)
+    manifest = _get_manifest(package_path, global_config_path)
+
+    assert manifest.stale_stages(None) == set(build_manifest.STAGE_INPUTS)
+
+
+def test_stale_stages_when_nothing_changed(tmp_path):
+    package_path, global_config_path = _create_addon(tmp_path)
+    previous = _get_manifest(package_path, global_config_path)
+    manifest_path = str(tmp_path / build_manifest.BUILD_MANIFEST_FILE_NAME)
+    previous.write(manifest_path)
+
+    manifest = _get_manifest(package_path, global_config_path)
+
+    assert (
+        manifest.stale_stages(build_manifest.read_build_manifest(manifest_path))
+        == set()
+    )
+
+
+def test_stale_stages_when_global_config_changed(tmp_path):
+    package_path, global_config_path = _create_addon(tmp_path)
+    previous = _get_manifest(package_path, global_config_path)
+    with open(global_config_path, "w") as f:
+        f.write('{"meta": {}}')
+
+    manifest = _get_manifest(package_path, global_config_path)
+
+    assert manifest.stale_stages(previous) == {
+        build_manifest.STAGE_ADDON,
+        *build_manifest.GENERATION_STAGES,
+    }
+
+
+def test_stale_stages_when_package_changed(tmp_path):
+    package_path, global_config_path = _create_addon(tmp_path)
+    previous = _get_manifest(package_path, global_config_path)
+    with open(os.path.join(package_path, "app.manifest"), "w") as f:
+        f.write('{"info": {}}')
+
+    manifest = _get_manifest(package_path, global_config_path)
+
+    assert manifest.stale_stages(previous) == {
+        build_manifest.STAGE_ADDON,
+        build_manifest.STAGE_SERVER_CONF,
+        build_manifest.STAGE_OPENAPI,
+    }
+
+
+@pytest.mark.parametrize(
+    "changed_parameters",
+    [
+        {"ucc_gen_version": "5.27.0"},
+        {"python_binary_name": "python3.7"},
+        {"strip_libraries": True},
+        {"compile_optimization": 0},
+    ],
+)
+def test_stale_stages_when_libraries_inputs_changed(tmp_path, changed_parameters):
+    package_path, global_config_path = _create_addon(tmp_path)
+    previous = _get_manifest(package_path, global_config_path)
+
+    manifest = _get_manifest(package_path, global_config_path, **changed_parameters)
+
+    assert build_manifest.STAGE_LIBRARIES in manifest.stale_stages(previous)
+
+
+def test_stale_stages_when_compile_optimization_changed(tmp_path):
+    package_path, global_config_path = _create_addon(tmp_path)
+    previous = _get_manifest(package_path, global_config_path, compile_optimization=0)
+
+    manifest = _get_manifest(package_path, global_config_path, compile_optimization=2)
+
+    assert manifest.stale_stages(previous) == {
+        build_manifest.STAGE_LIBRARIES,
+        build_manifest.STAGE_ADDON,
+    }
+
+
+def test_read_build_manifest_when_manifest_is_broken(tmp_path):
+    manifest_path = tmp_path / build_manifest.BUILD_MANIFEST_FILE_NAME
+    manifest_path.write_text("not a json")
+
+    assert build_manifest.read_build_manifest(str(manifest_path)) is None
+    assert build_manifest.read_build_manifest(str(tmp_path / "not_existing")) is None
+
+
+def test_read_build_manifest_without_recorded_files(tmp_path):
+    manifest_path = tmp_path / build_manifest.BUILD_MANIFEST_FILE_NAME
+    manifest_path.write_text('{"inputs": {}}')
+
+    assert build_manifest.read_build_manifest(str(manifest_path)) is None
+
+
+def test_build_manifest_records_outputs(tmp_path):
+    package_path, global_config_path = _create_addon(tmp_path)
+    manifest = _get_manifest(package_path, global_config_path)
+    manifest_path = str(tmp_path / build_manifest.BUILD_MANIFEST_FILE_NAME)
+    outputs = {build_manifest.STAGE_REST: {"TA/default/web.conf": "hash"}}
+
+    manifest.record_outputs(outputs, ["TA/default/web.conf", "TA/app.manifest"])
+    manifest.write(manifest_path)
+
+    previous = build_manifest.read_build_manifest(manifest_path)
+    assert previous.inputs == manifest.inputs
+    assert previous.outputs == outputs
+    assert previous.files == ["TA/app.manifest", "TA/default/web.conf"]
+
+
+def test_get_intact_outputs(tmp_path):
+    (tmp_path / "TA").mkdir()
+    (tmp_path / "TA" / "web.conf").write_text("[settings]\n")
+    (tmp_path / "TA" / "restmap.conf").write_text("[admin:TA]\n")
+    outputs = {
+        "TA/web.conf": build_manifest.hash_file(str(tmp_path / "TA" / "web.conf")),
+        "TA/restmap.conf": build_manifest.hash_file(
+            str(tmp_path / "TA" / "restmap.conf")
+        ),
+    }
+    manifest = build_manifest.BuildManifest(
+        outputs={build_manifest.STAGE_REST: outputs}
+    )
+    output_directory = str(tmp_path)
+
+    assert manifest.get_intact_outputs("rest", output_directory) == outputs
+    assert manifest.get_intact_outputs("alerts", output_directory) is None
+    (tmp_path / "TA" / "restmap.conf").write_text("[admin:changed]\n")
+    assert manifest.get_intact_outputs("rest", output_directory) is None
+    (tmp_path / "TA" / "restmap.conf").unlink()
+    assert manifest.get_intact_outputs("rest", output_directory) is None
+
+
+def test_get_intact_outputs_with_overridden_files(tmp_path):
+    (tmp_path / "TA").mkdir()
+    (tmp_path / "TA" / "web.conf").write_text("[settings]\n")
+    outputs = {
+        "TA/web.conf": build_manifest.hash_file(str(tmp_path / "TA" / "web.conf")),
+        "TA/restmap.conf": None,
+    }
+    manifest = build_manifest.BuildManifest(outputs={"rest": outputs})
+    output_directory = str(tmp_path)
+
+    assert (
+        manifest.get_intact_outputs("rest", output_directory, {"TA/restmap.conf"})
+        == outputs
+    )
+    # The package does not override the file anymore.
+    assert manifest.get_intact_outputs("rest", output_directory) is None
+    # The package overrides the generated file now.
+    assert (
+        manifest.get_intact_outputs(
+            "rest", output_directory, {"TA/restmap.conf", "TA/web.conf"}
+        )
+        is None
+    )
+
+
+def test_list_output_files(tmp_path):
+    for path in ("TA/default/app.conf", "TA/lib/library.py", "TA/bin/lib/helper.py"):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("")
+
+    assert build_manifest.list_output_files(str(tmp_path), "TA") == [
+        "TA/bin/lib/helper.py",
+        "TA/default/app.conf",
+    ]
@@ -0,0 +1,60 @@
+import json
+
+from splunk_add_on_ucc_framework.build_profiler import BuildProfiler
+
+
+def test_profile_when_profiler_is_disabled():
+    profiler = BuildProfiler()
+    profiler.start()
+
+    with profiler.profile("stage"):
+        pass
+    profiler.stop()
+
+    assert profiler.stages == []
+
+
+def test_profile_records_written_files():
+    written = {"files": 1, "bytes": 10}
+    profiler = BuildProfiler(enabled=True)
+    profiler.add_write_counter(lambda: (written["files"], written["bytes"]))
+    profiler.add_write_counter(lambda: (written["files"], 0))
+    profiler.start()
+
+    def stage():
+        written["files"] += 2
+        written["bytes"] += 8
+
+    profiler.wrap("stage", stage)()
+    profiler.stop()
+
+    assert len(profiler.stages) == 1
+    stage_profile = profiler.stages[0]
+    assert stage_profile["name"] == "stage"
+    assert stage_profile["files_written"] == 4
+    assert stage_profile["bytes_written"] == 8
+    assert stage_profile["wall_time"] >= 0
+    assert stage_profile["cpu_time"] >= 0
+
+
+def test_write_json_and_chrome_trace(tmp_path):
+    profiler = BuildProfiler(enabled=True)
+    profiler.start()
+    with profiler.profile("first"):
+        pass
+    with profiler.profile("second"):
+        pass
+    profiler.stop()
+
+    profiler.write_json(str(tmp_path / "profile.json"))
+    profiler.write_chrome_trace(str(tmp_path / "profile.trace.json"))
+
+    with open(tmp_path / "profile.json") as f:
+        profile = json.load(f)
+    assert [stage["name"] for stage in profile["stages"]] == ["first", "second"]
+    assert profile["max_rss"] >= 0
+    with open(tmp_path / "profile.trace.json") as f:
+        trace = json.load(f)
+    assert [event["name"] for event in trace["traceEvents"]] == ["first", "second"]
+    assert all(event["ph"] == "X" for event in trace["traceEvents"])
+    assert trace["otherData"]["max_rss"] >= 0
@@ -0,0 +1,143 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+from splunk_add_on_ucc_framework import bytecode_compiler
+from splunk_add_on_ucc_framework import output_tree as output_tree_lib
+
+
+def _create_directory(path, files):
+    for file_path, content in files.items():
+        full_path = path / file_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(content)
+    return str(path)
+
+
+def _get_cfile(addon_output_dir, path, optimization=0):
+    return importlib.util.cache_from_source(
+        os.path.join(addon_output_dir, path), optimization=optimization or ""
+    )
+
+
+def test_get_python_files(tmp_path):
+    addon_output_dir = _create_directory(
+        tmp_path / "output",
+        {
+            "bin/input.py": "",
+            "bin/__pycache__/input.py": "",
+            "lib/library/__init__.py": "",
+            "lib/library/data.txt": "",
+            "appserver/static/script.py": "",
+        },
+    )
+    package = _create_directory(
+        tmp_path / "package", {"bin/helper.py": "", "bin/input.py": ""}
+    )
+    output_tree = output_tree_lib.OutputTree()
+    output_tree.add_directory(package)
+    output_tree.add_content(os.path.join("bin", "generated.py"), "")
+
+    files = bytecode_compiler.get_python_files(addon_output_dir, output_tree)
+
+    assert files == {
+        os.path.join("bin", "helper.py"): os.path.join(package, "bin", "helper.py"),
+        os.path.join("bin", "input.py"): os.path.join(
+            addon_output_dir, "bin", "input.py"
+        ),
+        os.path.join("lib", "library", "__init__.py"): os.path.join(
+            addon_output_dir, "lib", "library", "__init__.py"
+        ),
+    }
+
+
+@pytest.mark.parametrize("optimization", [0, 2])
+def test_compile_bytecode(tmp_path, optimization):
+    addon_output_dir = _create_directory(
+        tmp_path / "output",
+        {"bin/input.py": "VALUE = 1\n", "lib/library/python2.py": 'print "x"\n'},
+    )
+    files = bytecode_compiler.get_python_files(
+        addon_output_dir, output_tree_lib.OutputTree()
+    )
+
+    result = bytecode_compiler.compile_bytecode(
+        addon_output_dir, files, sys.executable, optimization
+    )
+
+    assert result.compiled == 1
+    assert result.skipped == 0
+    assert [path for path, _ in result.failed] == ["lib/library/python2.py"]
+    cfile = _get_cfile(addon_output_dir, os.path.join("bin", "input.py"), optimization)
+    with open(cfile, "rb") as f:
+        header = f.read(16)
+    # Checked hash based invalidation.
+    assert header[4:8] == (3).to_bytes(4, "little")
+    assert header[8:] == importlib.util.source_hash(b"VALUE = 1\n")
+
+
+def test_compile_bytecode_skips_up_to_date_files(tmp_path):
+    addon_output_dir = _create_directory(
+        tmp_path / "output", {"bin/a.py": "A = 1\n", "bin/b.py": "B = 1\n"}
+    )
+    files = bytecode_compiler.get_python_files(
+        addon_output_dir, output_tree_lib.OutputTree()
+    )
+    bytecode_compiler.compile_bytecode(addon_output_dir, files, sys.executable)
+    cfile = _get_cfile(addon_output_dir, os.path.join("bin", "a.py"))
+    with open(cfile, "rb") as f:
+        bytecode = f.read()
+    (tmp_path / "output" / "bin" / "b.py").write_text("B = 2\n")
+
+    result = bytecode_compiler.compile_bytecode(addon_output_dir, files, sys.executable)
+
+    assert (result.compiled, result.skipped) == (1, 1)
+    with open(cfile, "rb") as f:
+        assert f.read() == bytecode
+
+
+def test_compile_bytecode_of_output_tree_file(tmp_path):
+    addon_output_dir = str(tmp_path / "output")
+    package = _create_directory(tmp_path / "package", {"bin/helper.py": "A = 1\n"})
+    output_tree = output_tree_lib.OutputTree()
+    output_tree.add_directory(package)
+    files = bytecode_compiler.get_python_files(addon_output_dir, output_tree)
+
+    bytecode_compiler.compile_bytecode(addon_output_dir, files, sys.executable)
+
+    assert os.path.isfile(
+        _get_cfile(addon_output_dir, os.path.join("bin", "helper.py"))
+    )
+    assert not os.path.isdir(os.path.join(package, "bin", "__pycache__"))
+
+
+def test_compile_bytecode_is_reproducible(tmp_path):
+    bytecode = []
+    for name in ("first", "second"):
+        addon_output_dir = _create_directory(
+            tmp_path / name, {"bin/input.py": "def run():\n    return 'x'\n"}
+        )
+        files = bytecode_compiler.get_python_files(
+            addon_output_dir, output_tree_lib.OutputTree()
+        )
+        bytecode_compiler.compile_bytecode(addon_output_dir, files, sys.executable)
+        with open(
+            _get_cfile(addon_output_dir, os.path.join("bin", "input.py")), "rb"
+        ) as f:
+            bytecode.append(f.read())
+
+    assert bytecode[0] == bytecode[1]
+
+
+def test_compile_bytecode_when_interpreter_does_not_exist(tmp_path):
+    with pytest.raises(bytecode_compiler.CouldNotCompileBytecode):
+        bytecode_compiler.compile_bytecode(
+            str(tmp_path), {}, str(tmp_path / "not_existing_python")
+        )
+
+
+def test_compile_bytecode_with_invalid_optimization(tmp_path):
+    with pytest.raises(ValueError):
+        bytecode_compiler.compile_bytecode(str(tmp_path), {}, sys.executable, 3)
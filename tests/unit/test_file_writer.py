@@ -0,0 +1,142 @@
+import hashlib
+import os
+import stat
+
+from splunk_add_on_ucc_framework import file_writer
+
+
+def test_file_writer_write(tmp_path):
+    path = str(tmp_path / "file.conf")
+    writer = file_writer.FileWriter()
+
+    assert writer.write(path, "[stanza]\n") is True
+
+    with open(path) as f:
+        assert f.read() == "[stanza]\n"
+    assert writer.files_written == 1
+    assert writer.bytes_written == 9
+    assert writer.files_skipped == 0
+
+
+def test_file_writer_write_when_up_to_date(tmp_path):
+    path = tmp_path / "file.conf"
+    path.write_text("[stanza]\n")
+    os.utime(path, ns=(0, 0))
+    writer = file_writer.FileWriter()
+
+    assert writer.write(str(path), b"[stanza]\n") is False
+
+    assert os.stat(path).st_mtime_ns == 0
+    assert writer.files_written == 0
+    assert writer.files_skipped == 1
+
+
+def test_file_writer_write_when_changed(tmp_path):
+    path = tmp_path / "file.py"
+    path.write_text("old")
+    os.chmod(path, 0o755)
+    link = tmp_path / "link.py"
+    os.link(path, link)
+    writer = file_writer.FileWriter()
+
+    assert writer.write(str(path), "new") is True
+
+    assert path.read_text() == "new"
+    # Other hard links are not changed and permissions are kept.
+    assert link.read_text() == "old"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o755
+    assert sorted(os.listdir(tmp_path)) == ["file.py", "link.py"]
+
+
+def test_file_writer_records_outputs(tmp_path):
+    writer = file_writer.FileWriter()
+    first_path = str(tmp_path / "first.conf")
+    second_path = str(tmp_path / "second.conf")
+    writer.write(first_path, "first")
+
+    with writer.record_outputs() as outputs:
+        writer.write(second_path, "second")
+        writer.write(first_path, "first")
+
+    assert outputs == {
+        first_path: hashlib.sha256(b"first").hexdigest(),
+        second_path: hashlib.sha256(b"second").hexdigest(),
+    }
+    assert writer.written_paths == {first_path, second_path}
+    assert writer.is_written(second_path)
+    assert not writer.is_written(str(tmp_path / "third.conf"))
+
+
+def test_file_writer_does_not_write_overridden_files(tmp_path):
+    writer = file_writer.FileWriter()
+    path = str(tmp_path / "overridden.conf")
+    writer.set_overridden_paths([path])
+
+    with writer.record_outputs() as outputs:
+        assert writer.write(path, "content") is False
+
+    assert not os.path.exists(path)
+    assert outputs == {path: None}
+    assert not writer.is_written(path)
+    writer.reset()
+    assert writer.write(path, "content") is True
+
+
+def test_file_writer_reset(tmp_path):
+    writer = file_writer.FileWriter()
+    writer.write(str(tmp_path / "file"), "content")
+
+    writer.reset()
+
+    assert writer.files_written == 0
+    assert writer.bytes_written == 0
+    assert writer.files_skipped == 0
+    assert writer.written_paths == set()
+
+
+def _get_mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_replace_file_new_file_mode(tmp_path):
+    path = str(tmp_path / "file")
+    expected = tmp_path / "expected"
+    expected.write_text("content")
+
+    file_writer.replace_file(path, b"content")
+
+    # The same permissions `open` creates the file with.
+    assert _get_mode(path) == _get_mode(expected)
+
+
+def test_replace_file_does_not_change_umask(tmp_path, monkeypatch):
+    def umask(mask):
+        raise AssertionError("umask should not be changed")
+
+    monkeypatch.setattr(os, "umask", umask)
+
+    file_writer.replace_file(str(tmp_path / "file"), b"content")
+    file_writer.replace_file(str(tmp_path / "file"), b"new", executable=True)
+
+
+def test_file_writer_sets_executable(tmp_path):
+    writer = file_writer.FileWriter()
+    path = str(tmp_path / "file.py")
+    writer.write(path, "content")
+    os.chmod(path, 0o640)
+
+    # Execute bits are set even if the content is up to date.
+    assert not writer.write(path, "content", executable=True)
+    assert _get_mode(path) == 0o750
+
+    os.chmod(path, 0o644)
+    assert writer.write(path, "new content", executable=True)
+    assert _get_mode(path) == 0o755
+
+    new_path = str(tmp_path / "new.py")
+    expected = tmp_path / "expected"
+    expected.write_text("content")
+    assert writer.write(new_path, "content", executable=True)
+    # Executable by everyone who can read a file created by `open`.
+    expected_mode = _get_mode(expected)
+    assert _get_mode(new_path) == expected_mode | (expected_mode & 0o444) >> 2
@@ -97,3 +97,156 @@ def test_global_config_update_addon_version():
     global_config.update_addon_version("1.1.1")
 
     assert global_config.version == "1.1.1"
+
+
+def test_global_config_index():
+    global_config_path = helpers.get_testdata_file_path("valid_config.json")
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(global_config_path, False)
+
+    tabs = global_config.configuration_tabs
+    assert [tab.name for tab in tabs] == [tab["name"] for tab in global_config.tabs]
+    assert global_config.tabs_by_name["account"].is_table is True
+    assert global_config.tabs_by_name["logging"].is_table is False
+    assert [service.name for service in global_config.services] == [
+        service["name"] for service in global_config.inputs
+    ]
+    service = global_config.services[0]
+    assert global_config.services_by_name[service.name] is service
+    assert service.entities_by_field["name"].element is service.element["entity"][0]
+    # Properties are built only once.
+    assert global_config.settings is global_config.settings
+    assert global_config.configs is global_config.configs
+
+
+def test_global_config_has_oauth():
+    global_config_path = helpers.get_testdata_file_path("valid_config.json")
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(global_config_path, False)
+
+    assert global_config.has_oauth() is True
+
+    global_config.tabs_by_name["account"].element["entity"] = []
+    global_config.update_schema_version("0.0.3")
+
+    assert global_config.has_oauth() is False
+
+
+def test_config_node():
+    element = {"field": "a", "options": {"items": [{"value": "b"}]}}
+    node = global_config_lib.ConfigNode(element)
+
+    assert node.field == "a"
+    assert node.options.items[0].value == "b"
+    assert node.options.element is element["options"]
+    assert node.get("type") is None
+    assert hasattr(node, "type") is False
+
+
+@pytest.mark.parametrize(
+    "filename,is_yaml",
+    [
+        ("valid_config.json", False),
+        ("valid_config.yaml", True),
+    ],
+)
+def test_global_config_save(filename, is_yaml, tmp_path):
+    global_config_path = str(tmp_path / filename)
+    with open(helpers.get_testdata_file_path(filename)) as f:
+        original_content = f.read()
+    with open(global_config_path, "w") as f:
+        f.write(original_content)
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(global_config_path, is_yaml)
+
+    global_config.update_addon_version(global_config.version)
+
+    assert global_config.save() is False
+    with open(global_config_path) as f:
+        assert f.read() == original_content
+
+    global_config.update_addon_version("2.0.0")
+
+    assert global_config.save() is True
+    assert global_config.save() is False
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(global_config_path, is_yaml)
+    assert global_config.version == "2.0.0"
+
+
+def test_global_config_parse_yaml_uses_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    global_config_path = helpers.get_testdata_file_path("valid_config.yaml")
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(global_config_path, True)
+
+    with mock.patch.object(global_config_lib, "yaml_load") as mock_yaml_load:
+        cached_global_config = global_config_lib.GlobalConfig()
+        cached_global_config.parse(global_config_path, True)
+
+    mock_yaml_load.assert_not_called()
+    assert cached_global_config.content == global_config.content
+
+
+def test_global_config_parse_yaml_when_changed(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    global_config_path = str(tmp_path / "globalConfig.yaml")
+    with open(global_config_path, "w") as f:
+        f.write("meta:\n    version: 1.0.0\n")
+    global_config_lib.GlobalConfig().parse(global_config_path, True)
+    with open(global_config_path, "w") as f:
+        f.write("meta:\n    version: 2.0.0\n")
+
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(global_config_path, True)
+
+    assert global_config.version == "2.0.0"
+
+
+def test_global_config_save_yaml_caches_saved_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    global_config_path = str(tmp_path / "globalConfig.yaml")
+    with open(global_config_path, "w") as f:
+        f.write("meta:\n    version: 1.0.0\n")
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(global_config_path, True)
+    global_config.update_addon_version("2.0.0")
+    global_config.save()
+
+    with mock.patch.object(global_config_lib, "yaml_load") as mock_yaml_load:
+        saved_global_config = global_config_lib.GlobalConfig()
+        saved_global_config.parse(global_config_path, True)
+
+    mock_yaml_load.assert_not_called()
+    assert saved_global_config.version == "2.0.0"
+
+
+def test_global_config_parse_yaml_when_ucc_gen_version_changed(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    global_config_path = helpers.get_testdata_file_path("valid_config.yaml")
+    global_config_lib.GlobalConfig().parse(global_config_path, True)
+    monkeypatch.setattr(global_config_lib, "__version__", "0.0.0")
+
+    with mock.patch.object(
+        global_config_lib, "yaml_load", wraps=global_config_lib.yaml_load
+    ) as mock_yaml_load:
+        global_config_lib.GlobalConfig().parse(global_config_path, True)
+
+    mock_yaml_load.assert_called_once()
+
+
+def test_global_config_parse_yaml_does_not_load_cache_with_other_key(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    global_config_path = helpers.get_testdata_file_path("valid_config.yaml")
+    global_config_lib.GlobalConfig().parse(global_config_path, True)
+    (cache_path,) = (tmp_path / "cache" / "ucc-gen" / "configs").iterdir()
+    cache_path.write_bytes(b"other key\n" + cache_path.read_bytes().split(b"\n", 1)[1])
+
+    with mock.patch.object(global_config_lib.pickle, "loads") as mock_pickle_loads:
+        global_config = global_config_lib.GlobalConfig()
+        global_config.parse(global_config_path, True)
+
+    mock_pickle_loads.assert_not_called()
+    assert global_config.content
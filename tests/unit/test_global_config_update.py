@@ -4,6 +4,8 @@ import tests.unit.helpers as helpers
 from splunk_add_on_ucc_framework.global_config_update import (
     _handle_biased_terms_update,
     _handle_dropping_api_version_update,
+    get_pending_migrations,
+    handle_global_config_update,
 )
 from splunk_add_on_ucc_framework import global_config as global_config_lib
 
@@ -55,3 +57,33 @@ def test_handle_dropping_api_version_update(filename, is_yaml):
     expected_schema_version = "0.0.3"
     assert expected_schema_version == global_config.schema_version
     assert "apiVersion" not in global_config.meta
+
+
+def test_handle_global_config_update():
+    global_config_path = helpers.get_testdata_file_path("config_with_biased_terms.json")
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(global_config_path, False)
+
+    migrations = handle_global_config_update(global_config)
+
+    assert [migration.schema_version for migration in migrations] == [
+        "0.0.1",
+        "0.0.2",
+        "0.0.3",
+    ]
+    assert global_config.schema_version == "0.0.3"
+    assert handle_global_config_update(global_config) == []
+
+
+def test_handle_global_config_update_dry_run(caplog):
+    global_config_path = helpers.get_testdata_file_path("config_with_biased_terms.json")
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(global_config_path, False)
+    schema_version = global_config.schema_version
+
+    migrations = handle_global_config_update(global_config, dry_run=True)
+
+    assert migrations == get_pending_migrations(global_config)
+    assert len(migrations) == 3
+    assert global_config.schema_version == schema_version
+    assert "Would update globalConfig schema to version 0.0.3" in caplog.text
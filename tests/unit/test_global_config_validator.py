@@ -1,14 +1,21 @@
+import json
 import os
 from contextlib import nullcontext as does_not_raise
+from unittest import mock
 
+import jsonschema
 import pytest
 
 import tests.unit.helpers as helpers
 from splunk_add_on_ucc_framework.global_config_validator import (
     GlobalConfigValidator,
     GlobalConfigValidatorException,
+    get_schema_cache_dir,
+    get_schema_validator,
 )
 from splunk_add_on_ucc_framework import global_config as global_config_lib
+from splunk_add_on_ucc_framework import global_config_validator
+from splunk_add_on_ucc_framework import regex_analyzer
 
 
 def _path_to_source_dir() -> str:
@@ -283,3 +290,221 @@ def test_config_validation_when_error(
         validator.validate()
     (msg,) = exc_info.value.args
     assert msg == exception_message
+
+
+def _create_schema(tmp_path, schema):
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps(schema))
+    return str(schema_path)
+
+
+def test_get_schema_validator_is_cached(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    schema_path = _create_schema(
+        tmp_path, {"$schema": "http://json-schema.org/draft-04/schema#"}
+    )
+
+    validator = get_schema_validator(schema_path)
+
+    assert get_schema_validator(schema_path) is validator
+    assert len(os.listdir(get_schema_cache_dir())) == 1
+
+
+def test_get_schema_validator_when_schema_changed(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    schema_path = _create_schema(tmp_path, {"type": "object"})
+    validator = get_schema_validator(schema_path)
+
+    _create_schema(tmp_path, {"type": "array"})
+
+    assert get_schema_validator(schema_path) is not validator
+    assert get_schema_validator(schema_path).is_valid([])
+
+
+def test_get_schema_validator_does_not_check_checked_schema(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    schema_path = _create_schema(tmp_path, {"type": "string"})
+    get_schema_validator(schema_path)
+    # In-memory cache is empty in the next run.
+    global_config_validator._get_schema_validator.cache_clear()
+
+    with mock.patch(
+        "jsonschema.validators.Draft202012Validator.check_schema"
+    ) as mock_check_schema:
+        get_schema_validator(schema_path)
+
+    mock_check_schema.assert_not_called()
+
+
+def test_get_schema_validator_when_schema_is_invalid(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    schema_path = _create_schema(tmp_path, {"type": 1})
+
+    with pytest.raises(jsonschema.SchemaError):
+        get_schema_validator(schema_path)
+
+    assert not os.path.exists(get_schema_cache_dir())
+
+
+def test_config_validation_reports_all_errors(tmp_path):
+    with open(helpers.get_testdata_file_path("valid_config.json")) as f:
+        config = json.load(f)
+    tabs = config["pages"]["configuration"]["tabs"]
+    tabs[1]["title"] = 1
+    tabs[1]["entity"][3]["validators"][0]["range"] = [10, 1]
+    tabs[3]["entity"][0]["validators"][0]["maxLength"] = 1
+    services = config["pages"]["inputs"]["services"]
+    services[0]["restHandlerModule"] = "module"
+    global_config_path = tmp_path / "globalConfig.json"
+    global_config_path.write_text(json.dumps(config))
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(str(global_config_path), False)
+    validator = GlobalConfigValidator(_path_to_source_dir(), global_config)
+
+    with pytest.raises(GlobalConfigValidatorException) as exc_info:
+        validator.validate()
+
+    assert [(e.path, e.message) for e in exc_info.value.errors] == [
+        ("/pages/configuration/tabs/1/title", "1 is not of type 'string'"),
+        (
+            "/pages/configuration/tabs/1/entity/3/validators/0",
+            "Entity 'proxy_port' has incorrect number validator, second "
+            "element should be greater or equal than first element.",
+        ),
+        (
+            "/pages/configuration/tabs/3/entity/0/validators/0",
+            "Entity 'testString' has incorrect string validator, 'maxLength' "
+            "should be greater or equal than 'minLength'.",
+        ),
+        (
+            "/pages/inputs/services/0",
+            "Input 'example_input_one' should have both 'restHandlerModule' "
+            "and 'restHandlerClass' fields present, only 1 of them was found.",
+        ),
+    ]
+    assert str(exc_info.value) == "1 is not of type 'string'"
+
+
+def _parse_config(tmp_path, config):
+    global_config_path = tmp_path / "globalConfig.json"
+    global_config_path.write_text(json.dumps(config))
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(str(global_config_path), False)
+    return global_config
+
+
+def test_config_validation_when_check_fails_on_schema_error(tmp_path):
+    with open(helpers.get_testdata_file_path("valid_config.json")) as f:
+        config = json.load(f)
+    # The check of the table looks for the field of every entity.
+    del config["pages"]["configuration"]["tabs"][0]["entity"][0]["field"]
+    validator = GlobalConfigValidator(
+        _path_to_source_dir(), _parse_config(tmp_path, config)
+    )
+
+    with pytest.raises(GlobalConfigValidatorException) as exc_info:
+        validator.validate()
+
+    assert [(e.path, e.message) for e in exc_info.value.errors] == [
+        ("/pages/configuration/tabs/0/entity/0", "'field' is a required property")
+    ]
+
+
+def test_config_validation_when_check_fails(monkeypatch, tmp_path):
+    with open(helpers.get_testdata_file_path("valid_config.json")) as f:
+        config = json.load(f)
+
+    def _failing_check(self, alert):
+        return alert["not_existing"]
+
+    monkeypatch.setitem(GlobalConfigValidator._CHECKS, "alert", (_failing_check,))
+    validator = GlobalConfigValidator(
+        _path_to_source_dir(), _parse_config(tmp_path, config)
+    )
+
+    with pytest.raises(GlobalConfigValidatorException) as exc_info:
+        validator.validate()
+
+    assert [(e.path, e.message) for e in exc_info.value.errors] == [
+        (
+            "/alerts/0",
+            "Internal error of _failing_check check: KeyError: 'not_existing'",
+        )
+    ]
+
+
+def test_get_json_pointer():
+    assert global_config_validator.get_json_pointer([]) == ""
+    assert (
+        global_config_validator.get_json_pointer(["pages", "a/b~c", 0])
+        == "/pages/a~1b~0c/0"
+    )
+
+
+def _parse_config_with_regex_pattern(tmp_path, pattern):
+    with open(helpers.get_testdata_file_path("valid_config.json")) as f:
+        config = json.load(f)
+    config["pages"]["configuration"]["tabs"][3]["entity"][2]["validators"][0][
+        "pattern"
+    ] = pattern
+    global_config_path = tmp_path / "globalConfig.json"
+    global_config_path.write_text(json.dumps(config))
+    global_config = global_config_lib.GlobalConfig()
+    global_config.parse(str(global_config_path), False)
+    return global_config
+
+
+def test_config_validation_when_regex_validator_backtracks(tmp_path):
+    global_config = _parse_config_with_regex_pattern(tmp_path, r"^(\w+\s?)*$")
+    validator = GlobalConfigValidator(_path_to_source_dir(), global_config)
+
+    with pytest.raises(GlobalConfigValidatorException) as exc_info:
+        validator.validate()
+
+    assert exc_info.value.errors == [
+        global_config_validator.ValidationError(
+            "/pages/configuration/tabs/3/entity/2/validators/0",
+            "Entity 'testRegex' has regex validator vulnerable to catastrophic "
+            "backtracking: star height 2, nested quantifiers.",
+        )
+    ]
+    assert validator.warnings == []
+
+
+def test_config_validation_when_regex_validator_may_backtrack(tmp_path):
+    global_config = _parse_config_with_regex_pattern(tmp_path, r"^(\w+\.)+com$")
+    validator = GlobalConfigValidator(_path_to_source_dir(), global_config)
+
+    validator.validate()
+
+    assert validator.warnings == [
+        global_config_validator.ValidationError(
+            "/pages/configuration/tabs/3/entity/2/validators/0",
+            "Entity 'testRegex' has regex validator which may take exponential "
+            "time to match: star height 2.",
+        )
+    ]
+
+
+def test_config_validation_when_regex_validator_is_slow(tmp_path, monkeypatch):
+    analyze = regex_analyzer.analyze
+
+    def analyze_with_slow_value(pattern):
+        if pattern == r"^\w+x$":
+            return regex_analyzer.RegexAnalysis(issues=(), slow_value="aaa!")
+        return analyze(pattern)
+
+    monkeypatch.setattr(regex_analyzer, "analyze", analyze_with_slow_value)
+    global_config = _parse_config_with_regex_pattern(tmp_path, r"^\w+x$")
+    validator = GlobalConfigValidator(_path_to_source_dir(), global_config)
+
+    validator.validate()
+
+    assert validator.warnings == [
+        global_config_validator.ValidationError(
+            "/pages/configuration/tabs/3/entity/2/validators/0",
+            "Entity 'testRegex' has regex validator which may take exponential "
+            "time to match, matching 'aaa!' took more than "
+            f"{regex_analyzer.REGEX_TIME_BUDGET} seconds.",
+        )
+    ]
@@ -8,10 +8,13 @@ from splunk_add_on_ucc_framework.install_python_libraries import (
     CouldNotInstallRequirements,
     SplunktaucclibNotFound,
     _check_ucc_library_in_requirements_file,
+    download_wheels,
+    get_lib_cache_dir,
+    get_lib_cache_key,
+    get_unpinned_requirement,
     install_libraries,
     install_python_libraries,
-    remove_execute_bit,
-    remove_package_from_installed_path,
+    prune_libraries,
 )
 
 
@@ -90,6 +93,45 @@ def test_install_libraries(mock_subprocess_call):
     )
 
 
+@mock.patch("subprocess.call", autospec=True)
+def test_install_libraries_with_wheelhouse(mock_subprocess_call):
+    mock_subprocess_call.return_value = 0
+
+    install_libraries(
+        "package/lib/requirements.txt",
+        "/path/to/output/addon_name/lib",
+        "python3",
+        wheelhouse="/path/to/wheelhouse",
+    )
+
+    expected_install_command = (
+        'python3 -m pip install -r "package/lib/requirements.txt"'
+        " --no-compile --prefer-binary --ignore-installed "
+        '--use-deprecated=legacy-resolver --target "'
+        '/path/to/output/addon_name/lib" '
+        '--no-index --find-links "/path/to/wheelhouse"'
+    )
+    mock_subprocess_call.assert_called_once_with(expected_install_command, shell=True)
+
+
+@mock.patch("subprocess.call", autospec=True)
+def test_download_wheels(mock_subprocess_call):
+    mock_subprocess_call.return_value = 0
+
+    download_wheels(
+        "package/lib/requirements.txt",
+        "/path/to/wheelhouse",
+        "python3",
+    )
+
+    expected_wheel_command = (
+        'python3 -m pip wheel -r "package/lib/requirements.txt"'
+        " --prefer-binary --use-deprecated=legacy-resolver "
+        '--wheel-dir "/path/to/wheelhouse"'
+    )
+    mock_subprocess_call.assert_called_once_with(expected_wheel_command, shell=True)
+
+
 @mock.patch("subprocess.call", autospec=True)
 def test_install_libraries_when_subprocess_raises_os_error(mock_subprocess_call):
     mock_subprocess_call.side_effect = OSError
@@ -195,7 +237,7 @@ def test_install_libraries_when_no_splunktaucclib_is_present_but_has_ui(tmp_path
         )
 
 
-def test_remove_package_from_installed_path(tmp_path):
+def test_prune_libraries_removes_packages(tmp_path):
     tmp_lib_path = tmp_path / "lib"
     tmp_lib_path.mkdir()
     tmp_lib_path_foo = tmp_lib_path / "foo"
@@ -209,7 +251,7 @@ def test_remove_package_from_installed_path(tmp_path):
     tmp_lib_path_qux = tmp_lib_path / "qux.txt"
     tmp_lib_path_qux.write_text("some text")
 
-    remove_package_from_installed_path(
+    prune_libraries(
         str(tmp_lib_path),
         ["foo", "bar", "qux"],
     )
@@ -221,7 +263,7 @@ def test_remove_package_from_installed_path(tmp_path):
     assert tmp_lib_path_baz.exists()
 
 
-def test_remove_execute_bit(tmp_path):
+def test_prune_libraries_removes_execute_bit(tmp_path):
     tmp_lib_path = tmp_path / "lib"
     tmp_lib_path.mkdir()
     tmp_lib_path_foo = tmp_lib_path / "foo"
@@ -234,9 +276,279 @@ def test_remove_execute_bit(tmp_path):
     tmp_lib_path_bar_file = tmp_lib_path_bar / "file.txt"
     tmp_lib_path_bar_file.write_text("normal")
 
-    remove_execute_bit(
+    prune_libraries(
         str(tmp_lib_path),
+        [],
     )
 
     assert os.access(tmp_lib_path_foo_file, os.X_OK) is False
     assert os.access(tmp_lib_path_bar_file, os.X_OK) is False
+
+
+def _create_installed_libraries(tmp_path):
+    tmp_lib_path = tmp_path / "lib"
+    (tmp_lib_path / "pip").mkdir(parents=True)
+    (tmp_lib_path / "pip" / "__init__.py").write_text("pip")
+    (tmp_lib_path / "foo" / "__pycache__").mkdir(parents=True)
+    (tmp_lib_path / "foo" / "__pycache__" / "bar.cpython-37.pyc").write_text("pyc")
+    (tmp_lib_path / "foo" / "tests").mkdir()
+    (tmp_lib_path / "foo" / "tests" / "test_bar.py").write_text("test")
+    (tmp_lib_path / "foo" / "bar.py").write_text("bar")
+    (tmp_lib_path / "foo" / "bar.so").write_text("binary")
+    (tmp_lib_path / "foo" / "bar.so").chmod(0o755)
+    (tmp_lib_path / "foo-1.0.0.dist-info").mkdir()
+    (tmp_lib_path / "foo-1.0.0.dist-info" / "METADATA").write_text("metadata")
+    (tmp_lib_path / "foo-1.0.0.dist-info" / "RECORD").write_text("record")
+    return tmp_lib_path
+
+
+def test_prune_libraries(tmp_path):
+    tmp_lib_path = _create_installed_libraries(tmp_path)
+
+    summary = prune_libraries(str(tmp_lib_path), ["pip"])
+
+    assert not (tmp_lib_path / "pip").exists()
+    assert os.access(tmp_lib_path / "foo" / "bar.so", os.X_OK) is False
+    assert (tmp_lib_path / "foo" / "__pycache__" / "bar.cpython-37.pyc").exists()
+    assert (tmp_lib_path / "foo" / "tests" / "test_bar.py").exists()
+    assert (tmp_lib_path / "foo-1.0.0.dist-info" / "RECORD").exists()
+    assert summary.files == 6
+    assert summary.size == 30
+    assert summary.removed_files == 1
+    assert summary.removed_size == 3
+    assert summary.fixed_files == 1
+
+
+def test_prune_libraries_with_strip(tmp_path):
+    tmp_lib_path = _create_installed_libraries(tmp_path)
+
+    summary = prune_libraries(str(tmp_lib_path), ["pip"], strip=True)
+
+    assert not (tmp_lib_path / "pip").exists()
+    assert not (tmp_lib_path / "foo" / "__pycache__").exists()
+    assert not (tmp_lib_path / "foo" / "tests").exists()
+    assert not (tmp_lib_path / "foo-1.0.0.dist-info" / "RECORD").exists()
+    assert (tmp_lib_path / "foo" / "bar.py").exists()
+    assert (tmp_lib_path / "foo-1.0.0.dist-info" / "METADATA").exists()
+    assert summary.files == 3
+    assert summary.removed_files == 4
+
+
+def _create_requirements_file(tmp_path, content):
+    tmp_lib_path = tmp_path / "package" / "lib"
+    tmp_lib_path.mkdir(parents=True)
+    tmp_lib_reqs_file = tmp_lib_path / "requirements.txt"
+    tmp_lib_reqs_file.write_text(content)
+    return str(tmp_lib_reqs_file)
+
+
+def _install_libraries(
+    requirements_file_path, installation_path, installer, wheelhouse=None
+):
+    os.makedirs(os.path.join(installation_path, "solnlib"))
+    with open(os.path.join(installation_path, "solnlib", "__init__.py"), "w") as f:
+        f.write("")
+
+
+def test_get_lib_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert get_lib_cache_dir() == str(tmp_path / "ucc-gen" / "libs")
+
+
+@mock.patch("subprocess.check_output", autospec=True)
+def test_get_lib_cache_key(mock_subprocess_check_output, tmp_path):
+    mock_subprocess_check_output.return_value = (
+        b"cpython-37 cpython-37m-x86_64-linux-gnu linux-x86_64\n"
+    )
+    requirements_file_path = _create_requirements_file(tmp_path, "solnlib==5.0.0\n")
+
+    key = get_lib_cache_key(requirements_file_path, "python3")
+    with open(requirements_file_path, "w") as f:
+        f.write("solnlib==5.0.1\n")
+    key_with_updated_requirements = get_lib_cache_key(requirements_file_path, "python3")
+    mock_subprocess_check_output.return_value = (
+        b"cpython-39 cpython-39-x86_64-linux-gnu linux-x86_64\n"
+    )
+    key_with_another_interpreter = get_lib_cache_key(requirements_file_path, "python3")
+    key_with_stripped_libraries = get_lib_cache_key(
+        requirements_file_path, "python3", strip=True
+    )
+
+    assert (
+        len(
+            {
+                key,
+                key_with_updated_requirements,
+                key_with_another_interpreter,
+                key_with_stripped_libraries,
+            }
+        )
+        == 4
+    )
+
+
+@mock.patch("subprocess.check_output", autospec=True)
+def test_get_lib_cache_key_with_wheelhouse(
+    mock_subprocess_check_output, monkeypatch, tmp_path
+):
+    mock_subprocess_check_output.return_value = (
+        b"cpython-37 cpython-37m-x86_64-linux-gnu linux-x86_64\n"
+    )
+    requirements_file_path = _create_requirements_file(tmp_path, "solnlib==5.0.0\n")
+    wheelhouse = tmp_path / "wheelhouse"
+    wheelhouse.mkdir()
+    wheel_path = wheelhouse / "solnlib-5.0.0-py3-none-any.whl"
+    wheel_path.write_bytes(b"wheel")
+
+    key_from_index = get_lib_cache_key(requirements_file_path, "python3")
+    key = get_lib_cache_key(
+        requirements_file_path, "python3", wheelhouse=str(wheelhouse)
+    )
+    wheel_path.write_bytes(b"rebuilt wheel")
+    key_with_rebuilt_wheel = get_lib_cache_key(
+        requirements_file_path, "python3", wheelhouse=str(wheelhouse)
+    )
+    monkeypatch.setenv("PIP_INDEX_URL", "https://example.com/simple")
+    key_with_pip_options = get_lib_cache_key(
+        requirements_file_path, "python3", wheelhouse=str(wheelhouse)
+    )
+
+    assert len({key_from_index, key, key_with_rebuilt_wheel, key_with_pip_options}) == 4
+
+
+@pytest.mark.parametrize(
+    "requirements_content,expected_result",
+    [
+        ("", None),
+        ("solnlib==5.0.0\n", None),
+        ("# comment\nsolnlib == 5.0.0  # pinned\n", None),
+        ('solnlib[extra]==5.0.0; python_version >= "3.7"\n', None),
+        ("--index-url https://example.com/simple\nsolnlib==5.0.0\n", None),
+        (
+            """splunktalib==2.2.6; python_version >= "3.7" and python_version < "4.0" \\
+    --hash=sha256:bba70ac7407cdedcb45437cb152ac0e43aae16b978031308e6bec548d3543119
+""",
+            None,
+        ),
+        ("solnlib\n", "solnlib"),
+        ("solnlib==5.0.0\nsplunktaucclib>=6\n", "splunktaucclib>=6"),
+        ("solnlib==5.*\n", "solnlib==5.*"),
+        ("-r other.txt\n", "-r other.txt"),
+        ("--constraint=constraints.txt\n", "--constraint=constraints.txt"),
+        ("-e ./solnlib\n", "-e ./solnlib"),
+        (
+            "solnlib @ https://example.com/solnlib-5.0.0-py3-none-any.whl\n",
+            "solnlib @ https://example.com/solnlib-5.0.0-py3-none-any.whl",
+        ),
+    ],
+)
+def test_get_unpinned_requirement(tmp_path, requirements_content, expected_result):
+    requirements_file_path = _create_requirements_file(tmp_path, requirements_content)
+
+    assert get_unpinned_requirement(requirements_file_path) == expected_result
+
+
+@mock.patch("subprocess.check_output", autospec=True)
+def test_get_lib_cache_key_when_interpreter_can_not_be_inspected(
+    mock_subprocess_check_output, tmp_path
+):
+    mock_subprocess_check_output.side_effect = OSError
+    requirements_file_path = _create_requirements_file(tmp_path, "solnlib\n")
+
+    assert get_lib_cache_key(requirements_file_path, "python3") is None
+
+
+@mock.patch(
+    "splunk_add_on_ucc_framework.install_python_libraries.install_libraries",
+    autospec=True,
+)
+@mock.patch(
+    "splunk_add_on_ucc_framework.install_python_libraries.get_lib_cache_key",
+    autospec=True,
+)
+def test_install_python_libraries_with_lib_cache(
+    mock_get_lib_cache_key, mock_install_libraries, tmp_path
+):
+    mock_get_lib_cache_key.return_value = "key"
+    mock_install_libraries.side_effect = _install_libraries
+    _create_requirements_file(tmp_path, "solnlib==5.0.0\n")
+    lib_cache_dir = tmp_path / "cache"
+    first_lib_target = tmp_path / "first" / "lib"
+    second_lib_target = tmp_path / "second" / "lib"
+
+    install_python_libraries(
+        str(tmp_path / "package"),
+        str(first_lib_target),
+        python_binary_name="python3",
+        lib_cache_dir=str(lib_cache_dir),
+    )
+    install_python_libraries(
+        str(tmp_path / "package"),
+        str(second_lib_target),
+        python_binary_name="python3",
+        lib_cache_dir=str(lib_cache_dir),
+    )
+
+    mock_install_libraries.assert_called_once()
+    assert os.listdir(lib_cache_dir) == ["key"]
+    cached_file = lib_cache_dir / "key" / "solnlib" / "__init__.py"
+    lib_file = second_lib_target / "solnlib" / "__init__.py"
+    assert not os.path.samefile(cached_file, lib_file)
+    assert lib_file.read_bytes() == cached_file.read_bytes()
+    assert (first_lib_target / "solnlib" / "__init__.py").exists()
+
+
+@mock.patch(
+    "splunk_add_on_ucc_framework.install_python_libraries.install_libraries",
+    autospec=True,
+)
+@mock.patch(
+    "splunk_add_on_ucc_framework.install_python_libraries.get_lib_cache_key",
+    autospec=True,
+)
+def test_install_python_libraries_with_lib_cache_when_installation_fails(
+    mock_get_lib_cache_key, mock_install_libraries, tmp_path
+):
+    mock_get_lib_cache_key.return_value = "key"
+    mock_install_libraries.side_effect = CouldNotInstallRequirements
+    _create_requirements_file(tmp_path, "solnlib==5.0.0\n")
+    lib_cache_dir = tmp_path / "cache"
+
+    with pytest.raises(CouldNotInstallRequirements):
+        install_python_libraries(
+            str(tmp_path / "package"),
+            str(tmp_path / "output" / "lib"),
+            python_binary_name="python3",
+            lib_cache_dir=str(lib_cache_dir),
+        )
+
+    assert os.listdir(lib_cache_dir) == []
+
+
+@mock.patch(
+    "splunk_add_on_ucc_framework.install_python_libraries.install_libraries",
+    autospec=True,
+)
+@mock.patch(
+    "splunk_add_on_ucc_framework.install_python_libraries.get_lib_cache_key",
+    autospec=True,
+)
+def test_install_python_libraries_with_lib_cache_when_requirement_is_not_pinned(
+    mock_get_lib_cache_key, mock_install_libraries, caplog, tmp_path
+):
+    mock_install_libraries.side_effect = _install_libraries
+    _create_requirements_file(tmp_path, "solnlib>=5.0.0\n")
+    lib_cache_dir = tmp_path / "cache"
+
+    install_python_libraries(
+        str(tmp_path / "package"),
+        str(tmp_path / "output" / "lib"),
+        python_binary_name="python3",
+        lib_cache_dir=str(lib_cache_dir),
+    )
+
+    mock_get_lib_cache_key.assert_not_called()
+    assert not lib_cache_dir.exists()
+    assert (tmp_path / "output" / "lib" / "solnlib" / "__init__.py").exists()
+    assert "Requirement 'solnlib>=5.0.0' is not pinned" in caplog.text
@@ -1,3 +1,6 @@
+import os
+import subprocess
+import sys
 from unittest import mock
 
 import pytest
@@ -15,6 +18,17 @@ from splunk_add_on_ucc_framework import main
                 "config_path": None,
                 "addon_version": None,
                 "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
             },
         ),
         (
@@ -24,6 +38,17 @@ from splunk_add_on_ucc_framework import main
                 "config_path": None,
                 "addon_version": None,
                 "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
             },
         ),
         (
@@ -33,6 +58,17 @@ from splunk_add_on_ucc_framework import main
                 "config_path": None,
                 "addon_version": None,
                 "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
             },
         ),
         (
@@ -42,6 +78,17 @@ from splunk_add_on_ucc_framework import main
                 "config_path": None,
                 "addon_version": None,
                 "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
             },
         ),
         (
@@ -51,6 +98,17 @@ from splunk_add_on_ucc_framework import main
                 "config_path": None,
                 "addon_version": "2.1.0",
                 "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
             },
         ),
         (
@@ -67,6 +125,17 @@ from splunk_add_on_ucc_framework import main
                 "config_path": None,
                 "addon_version": "2.2.0",
                 "python_binary_name": "python.exe",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
             },
         ),
         (
@@ -85,6 +154,17 @@ from splunk_add_on_ucc_framework import main
                 "config_path": "/path/to/globalConfig.json",
                 "addon_version": "2.2.0",
                 "python_binary_name": "python.exe",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
             },
         ),
         (
@@ -103,6 +183,17 @@ from splunk_add_on_ucc_framework import main
                 "config_path": "/path/to/globalConfig.yaml",
                 "addon_version": "2.2.0",
                 "python_binary_name": "python.exe",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
             },
         ),
         (
@@ -122,6 +213,212 @@ from splunk_add_on_ucc_framework import main
                 "config_path": "/path/to/globalConfig.yaml",
                 "addon_version": "2.2.0",
                 "python_binary_name": "python.exe",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
+            },
+        ),
+        (
+            ["build", "--source", "package", "--incremental"],
+            {
+                "source": "package",
+                "config_path": None,
+                "addon_version": None,
+                "python_binary_name": "python3",
+                "incremental": True,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
+            },
+        ),
+        (
+            ["build", "--source", "package", "--jobs", "4"],
+            {
+                "source": "package",
+                "config_path": None,
+                "addon_version": None,
+                "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 4,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
+            },
+        ),
+        (
+            ["build", "--source", "package", "--profile"],
+            {
+                "source": "package",
+                "config_path": None,
+                "addon_version": None,
+                "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": True,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
+            },
+        ),
+        (
+            ["build", "--source", "package", "--materializer", "copy"],
+            {
+                "source": "package",
+                "config_path": None,
+                "addon_version": None,
+                "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "copy",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
+            },
+        ),
+        (
+            [
+                "build",
+                "--source",
+                "package",
+                "--archive",
+                "Splunk_TA_UCCExample.spl",
+                "--archive-threads",
+                "4",
+            ],
+            {
+                "source": "package",
+                "config_path": None,
+                "addon_version": None,
+                "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": "Splunk_TA_UCCExample.spl",
+                "archive_threads": 4,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
+            },
+        ),
+        (
+            ["build", "--source", "package", "--no-lib-cache"],
+            {
+                "source": "package",
+                "config_path": None,
+                "addon_version": None,
+                "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": False,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
+            },
+        ),
+        (
+            ["build", "--source", "package", "--wheelhouse", "wheelhouse"],
+            {
+                "source": "package",
+                "config_path": None,
+                "addon_version": None,
+                "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": "wheelhouse",
+                "strip_libraries": False,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
+            },
+        ),
+        (
+            [
+                "build",
+                "--source",
+                "package",
+                "--compile",
+                "--compile-optimization",
+                "2",
+            ],
+            {
+                "source": "package",
+                "config_path": None,
+                "addon_version": None,
+                "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": False,
+                "compile_bytecode": True,
+                "compile_optimization": 2,
+            },
+        ),
+        (
+            ["build", "--source", "package", "--strip-libraries"],
+            {
+                "source": "package",
+                "config_path": None,
+                "addon_version": None,
+                "python_binary_name": "python3",
+                "incremental": False,
+                "jobs": 1,
+                "profile": False,
+                "materializer": "reflink",
+                "archive": None,
+                "archive_threads": 1,
+                "lib_cache": True,
+                "wheelhouse": None,
+                "strip_libraries": True,
+                "compile_bytecode": False,
+                "compile_optimization": 0,
             },
         ),
     ],
@@ -133,6 +430,40 @@ def test_build_command(mock_ucc_gen_generate, args, expected_parameters):
     mock_ucc_gen_generate.assert_called_with(**expected_parameters)
 
 
+@pytest.mark.parametrize("jobs", ["0", "-1", "many"])
+@mock.patch("splunk_add_on_ucc_framework.commands.build.generate")
+def test_build_command_with_invalid_jobs(mock_ucc_gen_generate, capsys, jobs):
+    with pytest.raises(SystemExit) as exc_info:
+        main.main(["build", "--source", "package", "--jobs", jobs])
+
+    assert exc_info.value.code == 2
+    assert "--jobs" in capsys.readouterr().err
+    mock_ucc_gen_generate.assert_not_called()
+
+
+@pytest.mark.parametrize("threads", ["0", "-1", "many"])
+@mock.patch("splunk_add_on_ucc_framework.commands.build.generate")
+def test_build_command_with_invalid_archive_threads(
+    mock_ucc_gen_generate, capsys, threads
+):
+    with pytest.raises(SystemExit) as exc_info:
+        main.main(
+            [
+                "build",
+                "--source",
+                "package",
+                "--archive",
+                "addon.spl",
+                "--archive-threads",
+                threads,
+            ]
+        )
+
+    assert exc_info.value.code == 2
+    assert "--archive-threads" in capsys.readouterr().err
+    mock_ucc_gen_generate.assert_not_called()
+
+
 @pytest.mark.parametrize(
     "args,expected_parameters",
     [
@@ -179,3 +510,192 @@ def test_import_from_aob_command(mock_import_from_aob, args, expected_parameters
     main.main(args)
 
     mock_import_from_aob.assert_called_with(**expected_parameters)
+
+
+@pytest.mark.parametrize(
+    "args,expected_parameters",
+    [
+        (
+            ["fetch-wheels", "--wheelhouse", "wheelhouse"],
+            {
+                "source": "package",
+                "wheelhouse": "wheelhouse",
+                "python_binary_name": "python3",
+            },
+        ),
+        (
+            [
+                "fetch-wheels",
+                "--source",
+                "addon/package",
+                "--wheelhouse",
+                "wheelhouse",
+                "--python-binary-name",
+                "python3.7",
+            ],
+            {
+                "source": "addon/package",
+                "wheelhouse": "wheelhouse",
+                "python_binary_name": "python3.7",
+            },
+        ),
+    ],
+)
+@mock.patch("splunk_add_on_ucc_framework.commands.fetch_wheels.fetch_wheels")
+def test_fetch_wheels_command(mock_fetch_wheels, args, expected_parameters):
+    main.main(args)
+
+    mock_fetch_wheels.assert_called_with(**expected_parameters)
+
+
+@mock.patch("splunk_add_on_ucc_framework.commands.watch.watch")
+def test_build_command_with_watch(mock_watch):
+    main.main(["build", "--source", "package", "--ta-version", "1.0.0", "--watch"])
+
+    mock_watch.assert_called_once_with(
+        source="package",
+        config_path=None,
+        addon_version="1.0.0",
+        python_binary_name="python3",
+        jobs=1,
+        profile=False,
+        materializer="reflink",
+        archive=None,
+        lib_cache=True,
+        wheelhouse=None,
+        strip_libraries=False,
+        compile_bytecode=False,
+        compile_optimization=0,
+    )
+
+
+@pytest.mark.parametrize(
+    "args,expected_parameters",
+    [
+        (
+            ["update-config"],
+            {
+                "source": "package",
+                "config_path": None,
+                "dry_run": False,
+            },
+        ),
+        (
+            [
+                "update-config",
+                "--source",
+                "addon/package",
+                "--config",
+                "addon/globalConfig.yaml",
+                "--dry-run",
+            ],
+            {
+                "source": "addon/package",
+                "config_path": "addon/globalConfig.yaml",
+                "dry_run": True,
+            },
+        ),
+    ],
+)
+@mock.patch("splunk_add_on_ucc_framework.commands.update_config.update_config")
+def test_update_config_command(mock_update_config, args, expected_parameters):
+    main.main(args)
+
+    mock_update_config.assert_called_with(**expected_parameters)
+
+
+@pytest.mark.parametrize(
+    "args,expected_parameters",
+    [
+        (
+            ["validate"],
+            {
+                "source": "package",
+                "config_path": None,
+                "output_format": "text",
+            },
+        ),
+        (
+            [
+                "validate",
+                "--source",
+                "addon/package",
+                "--config",
+                "addon/globalConfig.json",
+                "--output-format",
+                "json",
+            ],
+            {
+                "source": "addon/package",
+                "config_path": "addon/globalConfig.json",
+                "output_format": "json",
+            },
+        ),
+    ],
+)
+@mock.patch("splunk_add_on_ucc_framework.commands.validate.validate")
+def test_validate_command(mock_validate, args, expected_parameters):
+    main.main(args)
+
+    mock_validate.assert_called_with(**expected_parameters)
+
+
+HEAVY_MODULES = (
+    "cookiecutter",
+    "dunamai",
+    "jinja2",
+    "jsonschema",
+    "openapi3",
+    "yaml",
+)
+# Modules only the build needs.
+BUILD_MODULES = (
+    "cookiecutter",
+    "jinja2",
+    "openapi3",
+)
+
+
+def _get_imported_modules(args, cwd):
+    repository_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    code = f"from splunk_add_on_ucc_framework import main\nmain.main({args!r})"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        cwd=cwd or repository_root,
+        env={**os.environ, "PYTHONPATH": repository_root},
+    )
+    assert result.returncode == 0, result.stderr
+    imported_modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        name = line.split("|")[-1].strip()
+        imported_modules.add(name.split(".")[0])
+    return imported_modules
+
+
+@pytest.mark.parametrize(
+    "args,cwd,forbidden_modules",
+    [
+        (["--help"], None, HEAVY_MODULES),
+        (["build", "--help"], None, HEAVY_MODULES),
+        (["init", "--help"], None, HEAVY_MODULES),
+        (
+            ["validate"],
+            os.path.join(
+                os.path.dirname(os.path.dirname(__file__)),
+                "testdata",
+                "test_addons",
+                "package_global_config_configuration",
+            ),
+            BUILD_MODULES,
+        ),
+    ],
+)
+def test_startup_imports(args, cwd, forbidden_modules):
+    imported_modules = _get_imported_modules(args, cwd)
+
+    assert imported_modules.isdisjoint(forbidden_modules)
@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from splunk_add_on_ucc_framework import materializer
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        materializer.MATERIALIZER_COPY,
+        materializer.MATERIALIZER_REFLINK,
+    ],
+)
+def test_materialize(tmp_path, name):
+    src = tmp_path / "src.txt"
+    src.write_text("content")
+    dest = tmp_path / "dest.txt"
+    dest.write_text("old content")
+    file_materializer = materializer.get_materializer(name)
+
+    file_materializer.materialize(str(src), str(dest))
+
+    assert dest.read_text() == "content"
+    assert file_materializer.materialized == 1
+    assert file_materializer.bytes_materialized == len("content")
+    assert file_materializer.skipped == 0
+
+
+def test_materialize_skips_up_to_date_files(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_text("content")
+    dest = tmp_path / "dest.txt"
+    file_materializer = materializer.get_materializer(materializer.MATERIALIZER_COPY)
+    file_materializer.materialize(str(src), str(dest))
+    dest_inode = os.stat(dest).st_ino
+
+    file_materializer.materialize(str(src), str(dest))
+
+    # Same content, but different modification time.
+    os.utime(dest, ns=(0, 0))
+    file_materializer.materialize(str(src), str(dest))
+
+    assert os.stat(dest).st_ino == dest_inode
+    assert file_materializer.materialized == 1
+    assert file_materializer.bytes_materialized == len("content")
+    assert file_materializer.skipped == 2
+
+
+def test_materialize_when_content_changed_with_same_size(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_text("content")
+    dest = tmp_path / "dest.txt"
+    dest.write_text("CONTENT")
+
+    materializer.get_materializer(materializer.MATERIALIZER_COPY).materialize(
+        str(src), str(dest)
+    )
+
+    assert dest.read_text() == "content"
+
+
+def test_materialize_when_source_changed_right_after_copy(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_text("content")
+    dest = tmp_path / "dest.txt"
+    file_materializer = materializer.get_materializer(materializer.MATERIALIZER_COPY)
+    file_materializer.materialize(str(src), str(dest))
+    src_mtime_ns = os.stat(src).st_mtime_ns
+
+    # Written again within the granularity of the modification time.
+    src.write_text("CONTENT")
+    os.utime(src, ns=(src_mtime_ns, src_mtime_ns))
+    file_materializer.materialize(str(src), str(dest))
+
+    assert dest.read_text() == "CONTENT"
+    assert file_materializer.materialized == 2
+
+
+@pytest.mark.parametrize("name", materializer.MATERIALIZERS)
+def test_materialized_file_does_not_share_content_with_source(tmp_path, name):
+    src = tmp_path / "src.txt"
+    src.write_text("content")
+    dest = tmp_path / "dest.txt"
+
+    materializer.get_materializer(name).materialize(str(src), str(dest))
+    with open(dest, "a") as f:
+        f.write(" changed")
+
+    assert not os.path.samefile(src, dest)
+    assert src.read_text() == "content"
+
+
+def test_get_materializer_when_name_is_unknown():
+    with pytest.raises(ValueError):
+        materializer.get_materializer("unknown")
+    with pytest.raises(ValueError):
+        materializer.get_materializer("hardlink")
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from splunk_add_on_ucc_framework import materializer as materializer_lib
+from splunk_add_on_ucc_framework import output_tree as output_tree_lib
+
+
+def _create_directory(path, files):
+    for file_path, content in files.items():
+        full_path = path / file_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(content)
+    return str(path)
+
+
+def test_add_directory_overrides_files(tmp_path):
+    template = _create_directory(
+        tmp_path / "template",
+        {"default/a.conf": "template a", "default/b.conf": "template b"},
+    )
+    package = _create_directory(tmp_path / "package", {"default/a.conf": "package a"})
+    output_tree = output_tree_lib.OutputTree()
+
+    output_tree.add_directory(template)
+    output_tree.add_directory(package)
+
+    assert output_tree.files == [
+        os.path.join("default", "a.conf"),
+        os.path.join("default", "b.conf"),
+    ]
+    assert output_tree.read(os.path.join("default", "a.conf")) == "package a"
+
+
+def test_remove(tmp_path):
+    template = _create_directory(
+        tmp_path / "template",
+        {"default/a.conf": "a", "default/data/b.xml": "b", "bin/c.py": "c"},
+    )
+    output_tree = output_tree_lib.OutputTree()
+    output_tree.add_directory(template)
+
+    assert output_tree.remove("default/")
+    assert not output_tree.remove("not_existing")
+    assert output_tree.files == [os.path.join("bin", "c.py")]
+    assert output_tree.directories == ["bin"]
+
+
+def test_rename_and_replace_tokens(tmp_path):
+    template = _create_directory(
+        tmp_path / "template", {"views/redirect.xml": "${package.name} ${ta.name}"}
+    )
+    output_tree = output_tree_lib.OutputTree()
+    output_tree.add_directory(template)
+
+    output_tree.rename(
+        os.path.join("views", "redirect.xml"),
+        os.path.join("views", "ta_redirect.xml"),
+    )
+    output_tree.replace_tokens(
+        os.path.join("views", "ta_redirect.xml"),
+        {"${package.name}": "TA", "${ta.name}": "ta"},
+    )
+
+    assert os.path.join("views", "redirect.xml") not in output_tree
+    assert output_tree.read(os.path.join("views", "ta_redirect.xml")) == "TA ta"
+    # Source file is never changed.
+    assert (tmp_path / "template" / "views" / "redirect.xml").read_text() == (
+        "${package.name} ${ta.name}"
+    )
+
+
+def test_rename_when_file_is_not_in_tree():
+    output_tree = output_tree_lib.OutputTree()
+
+    with pytest.raises(output_tree_lib.OutputTreeException):
+        output_tree.rename("a", "b")
+
+
+def test_write(tmp_path):
+    template = _create_directory(
+        tmp_path / "template", {"default/a.conf": "a", "appserver/static/.keep": ""}
+    )
+    (tmp_path / "template" / "empty").mkdir()
+    output_tree = output_tree_lib.OutputTree()
+    output_tree.add_directory(template)
+    output_tree.remove(os.path.join("appserver", "static", ".keep"))
+    output_tree.add_content("VERSION", "1.0.0\n1.0.0")
+    output_directory = tmp_path / "output"
+    materializer = materializer_lib.CopyMaterializer()
+
+    output_tree.write(str(output_directory), materializer)
+
+    assert (output_directory / "default" / "a.conf").read_text() == "a"
+    assert (output_directory / "VERSION").read_text() == "1.0.0\n1.0.0"
+    assert (output_directory / "appserver" / "static").is_dir()
+    assert not (output_directory / "appserver" / "static" / ".keep").exists()
+    assert (output_directory / "empty").is_dir()
+    assert materializer.materialized == 2
+
+    output_tree.write(str(output_directory), materializer)
+
+    assert materializer.materialized == 2
+    assert materializer.skipped == 2
@@ -0,0 +1,95 @@
+import re
+
+import pytest
+
+from splunk_add_on_ucc_framework import regex_analyzer
+
+
+@pytest.mark.parametrize(
+    "pattern,expected_issues",
+    [
+        (r"^[a-zA-Z]\w*$", ()),
+        (r"^\-[1-9]\d*$|^\d*$", ()),
+        (r"^(?:\d{1,3}\.){3}\d{1,3}$", ()),
+        (r"^(a{1,5}){1,5}$", ()),
+        # `re` turns the alternatives into a character set.
+        (r"^(\w|\d)+$", ()),
+        # Repeats separated by a character they can't match.
+        (r"^(\w+\.)+com$", ("star height 2",)),
+        (r"^(a+)+$", ("star height 2", "nested quantifiers")),
+        (r"^(\w+\s?)*$", ("star height 2", "nested quantifiers")),
+        (r"^((a+)+b*)*$", ("star height 3", "nested quantifiers")),
+        (r"^(?:\w{1,5})+$", ("nested quantifiers",)),
+        (r"^(a|a?)+$", ("overlapping alternatives in a repeated group",)),
+        (r"^(\d|[0-9a-f]x)*$", ("overlapping alternatives in a repeated group",)),
+        # Atomic groups do not backtrack.
+        (r"^(?>a+)+$", ()),
+    ],
+)
+def test_get_issues(pattern, expected_issues):
+    assert regex_analyzer.get_issues(pattern) == expected_issues
+
+
+def test_get_issues_when_pattern_is_not_valid():
+    with pytest.raises(re.error):
+        regex_analyzer.get_issues("[.*")
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"^(a+)+$",
+        r"^(\w+\s?)*$",
+        r"^(a|a?)+$",
+        # The match fails before the end of the pattern.
+        r"(x+x+)+y",
+    ],
+)
+def test_find_slow_value(pattern):
+    slow_value = regex_analyzer.find_slow_value(pattern, time_budget=0.01)
+
+    assert slow_value is not None
+    assert len(slow_value) < regex_analyzer.MAX_FUZZ_LENGTH
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"^[a-zA-Z]\w*$",
+        r"^(\w+\.)+com$",
+        r"^\d*\d*x$",
+        r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}.\d{3}z)?$",
+    ],
+)
+def test_find_slow_value_when_pattern_is_safe(pattern):
+    assert regex_analyzer.find_slow_value(pattern) is None
+
+
+def test_analyze():
+    analysis = regex_analyzer.analyze(r"^(a+)+$")
+
+    assert analysis.issues == ("star height 2", "nested quantifiers")
+    assert analysis.is_vulnerable
+    # Vulnerable patterns are not matched against generated values.
+    assert analysis.slow_value is None
+    assert regex_analyzer.analyze(r"^(a+)+$") is analysis
+    assert not regex_analyzer.analyze(r"^\w+$").is_vulnerable
+
+
+def test_analyze_when_pattern_has_only_star_height():
+    analysis = regex_analyzer.analyze(r"^(\w+\.)+com$")
+
+    assert analysis.issues == ("star height 2",)
+    assert not analysis.is_vulnerable
+    assert analysis.slow_value is None
+
+
+def test_analyze_when_generated_value_is_slow(monkeypatch):
+    monkeypatch.setattr(
+        regex_analyzer, "find_slow_value", lambda pattern, time_budget: "aaa!"
+    )
+
+    analysis = regex_analyzer.analyze.__wrapped__(r"^a+b$")
+
+    assert analysis == regex_analyzer.RegexAnalysis(issues=(), slow_value="aaa!")
+    assert not analysis.is_vulnerable
@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from splunk_add_on_ucc_framework.stage_scheduler import (
+    StageScheduler,
+    StageSchedulerException,
+)
+
+
+def test_order_keeps_insertion_order_when_possible():
+    scheduler = StageScheduler()
+    scheduler.add_stage("a", lambda: None)
+    scheduler.add_stage("c", lambda: None, depends_on=("b",))
+    scheduler.add_stage("b", lambda: None, depends_on=("a",))
+    scheduler.add_stage("d", lambda: None)
+
+    assert scheduler.order() == ["a", "b", "c", "d"]
+
+
+def test_order_when_dependency_is_unknown():
+    scheduler = StageScheduler()
+    scheduler.add_stage("a", lambda: None, depends_on=("unknown",))
+
+    with pytest.raises(StageSchedulerException):
+        scheduler.order()
+
+
+def test_order_when_dependencies_are_circular():
+    scheduler = StageScheduler()
+    scheduler.add_stage("a", lambda: None, depends_on=("b",))
+    scheduler.add_stage("b", lambda: None, depends_on=("a",))
+
+    with pytest.raises(StageSchedulerException):
+        scheduler.order()
+
+
+def test_add_stage_when_stage_already_added():
+    scheduler = StageScheduler()
+    scheduler.add_stage("a", lambda: None)
+
+    with pytest.raises(StageSchedulerException):
+        scheduler.add_stage("a", lambda: None)
+
+
+def test_scheduler_when_jobs_number_is_invalid():
+    with pytest.raises(StageSchedulerException):
+        StageScheduler(0)
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_run_respects_dependencies(jobs):
+    calls = []
+    lock = threading.Lock()
+
+    def stage(name):
+        def func():
+            with lock:
+                calls.append(name)
+
+        return func
+
+    scheduler = StageScheduler(jobs)
+    scheduler.add_stage("template", stage("template"))
+    scheduler.add_stage("libraries", stage("libraries"))
+    scheduler.add_stage("rest", stage("rest"), depends_on=("template",))
+    scheduler.add_stage("alerts", stage("alerts"), depends_on=("rest",))
+    scheduler.add_stage("package", stage("package"), depends_on=("libraries", "alerts"))
+    scheduler.run()
+
+    assert sorted(calls) == ["alerts", "libraries", "package", "rest", "template"]
+    assert calls.index("template") < calls.index("rest") < calls.index("alerts")
+    assert calls[-1] == "package"
+
+
+def test_run_runs_independent_stages_in_parallel():
+    barrier = threading.Barrier(2, timeout=5)
+    scheduler = StageScheduler(2)
+    scheduler.add_stage("a", barrier.wait)
+    scheduler.add_stage("b", barrier.wait)
+
+    scheduler.run()
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_run_when_stage_fails(jobs):
+    calls = []
+
+    def fail():
+        raise SystemExit(1)
+
+    scheduler = StageScheduler(jobs)
+    scheduler.add_stage("a", fail)
+    scheduler.add_stage("b", lambda: calls.append("b"), depends_on=("a",))
+
+    with pytest.raises(SystemExit):
+        scheduler.run()
+    assert calls == []
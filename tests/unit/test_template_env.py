@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from splunk_add_on_ucc_framework import template_env
+
+
+@pytest.fixture
+def template_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    template_env.get_environment.cache_clear()
+    template_env.get_alert_environment.cache_clear()
+    yield template_env.get_template_cache_dir()
+    template_env.get_environment.cache_clear()
+    template_env.get_alert_environment.cache_clear()
+
+
+def test_get_environment_is_shared(template_cache_dir):
+    assert template_env.get_environment() is template_env.get_environment()
+    assert template_env.get_alert_environment() is template_env.get_alert_environment()
+
+
+def test_get_environment_caches_compiled_templates(template_cache_dir):
+    template_env.get_environment().get_template("input.template")
+    template_env.get_alert_environment().get_template("alert_actions.conf.template")
+
+    assert len(os.listdir(template_cache_dir)) == 2
+
+    # A new environment loads the template from the cache, compiling it
+    # again would save it to the cache.
+    template_env.get_environment.cache_clear()
+    environment = template_env.get_environment()
+    environment.bytecode_cache.dump_bytecode = None
+    environment.get_template("input.template")
+
+
+def test_get_alert_environment_finds_html_theme(template_cache_dir):
+    environment = template_env.get_alert_environment()
+
+    assert environment.get_template("mod_alert.html.template")
+    assert environment.get_template("default.html")
+
+
+def test_get_environment_without_cache_dir(tmp_path, monkeypatch):
+    cache_home = tmp_path / "cache"
+    cache_home.write_text("not a folder")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    template_env.get_environment.cache_clear()
+    try:
+        environment = template_env.get_environment()
+        assert environment.bytecode_cache is None
+        assert environment.get_template("input.template")
+    finally:
+        template_env.get_environment.cache_clear()
@@ -89,3 +89,16 @@ def test_dump_yaml_config(tmp_path):
         content = f.read()
 
     assert expected_content == content
+
+
+def test_get_cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+    assert utils.get_cache_dir() == str(tmp_path / "ucc-gen")
+
+
+def test_get_cache_dir_when_xdg_cache_home_is_not_set(monkeypatch, tmp_path):
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    assert utils.get_cache_dir() == str(tmp_path / ".cache" / "ucc-gen")